@@ -0,0 +1,80 @@
+"""
+This file contains all routes for the /admin API
+"""
+from sanic import Blueprint
+
+from dp4py_sanic.api.response.json_response import json
+
+from dp_conceptual_search.log import logger
+from dp_conceptual_search.api.request import ONSRequest
+from dp_conceptual_search.app.search_app import SearchApp
+
+admin_blueprint = Blueprint('admin', url_prefix='/admin')
+
+
+def cache_stats(app: SearchApp) -> dict:
+    """
+    Returns stats for all app scoped caches (None for disabled caches)
+    :param app:
+    :return:
+    """
+    search_result_cache = app.search_result_cache
+    conceptual_search_params_cache = app.conceptual_search_params_cache
+    embedding_vector_cache = app.embedding_vector_cache
+    spelling_correction_cache = app.spell_checker.cache if app.spell_checker is not None else None
+
+    return {
+        "search_results": search_result_cache.to_dict() if search_result_cache is not None else None,
+        "conceptual_search_params": conceptual_search_params_cache.to_dict()
+        if conceptual_search_params_cache is not None else None,
+        "embedding_vectors": embedding_vector_cache.to_dict() if embedding_vector_cache is not None else None,
+        "spelling_corrections": spelling_correction_cache.to_dict() if spelling_correction_cache is not None else None
+    }
+
+
+@admin_blueprint.route('/cache', methods=['GET'], strict_slashes=False)
+async def get_cache_stats(request: ONSRequest):
+    """
+    API for cache stats (for this worker)
+    :param request:
+    :return:
+    """
+    app: SearchApp = request.app
+
+    return json(request, cache_stats(app), 200)
+
+
+@admin_blueprint.route('/cache/search', methods=['DELETE'], strict_slashes=False)
+async def purge_search_result_cache(request: ONSRequest):
+    """
+    API to purge the search result cache (for all workers on the host, if a generation file is configured)
+    :param request:
+    :return:
+    """
+    app: SearchApp = request.app
+
+    if app.search_result_cache is not None:
+        logger.info(request.request_id, "Purging search result cache", extra={
+            "cache": app.search_result_cache.to_dict()
+        })
+        app.search_result_cache.clear()
+
+    return json(request, cache_stats(app), 200)
+
+
+@admin_blueprint.route('/cache/vectors', methods=['DELETE'], strict_slashes=False)
+async def purge_embedding_vector_cache(request: ONSRequest):
+    """
+    API to purge the embedding vector cache (for this worker, and the shared store if enabled)
+    :param request:
+    :return:
+    """
+    app: SearchApp = request.app
+
+    if app.embedding_vector_cache is not None:
+        logger.info(request.request_id, "Purging embedding vector cache", extra={
+            "cache": app.embedding_vector_cache.to_dict()
+        })
+        app.embedding_vector_cache.clear()
+
+    return json(request, cache_stats(app), 200)
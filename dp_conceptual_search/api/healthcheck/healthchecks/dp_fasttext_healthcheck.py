@@ -9,11 +9,13 @@ from dp_fasttext.client import Client
 
 from dp_conceptual_search.log import logger
 from dp_conceptual_search.api.request import ONSRequest
-from dp_conceptual_search.ons.conceptual.client import FastTextClientService
+from dp_conceptual_search.app.search_app import SearchApp
+from dp_conceptual_search.ons.conceptual.client.fasttext_service import FastTextInferenceMode
 
 
 class DpFastTextHealthCheck(HealthCheck):
 
+    LOCAL = "local"
     AVAILABLE = "available"
     UNREACHABLE = "unreachable"
     UNAVAILABLE = "unavailable"
@@ -24,8 +26,14 @@ class DpFastTextHealthCheck(HealthCheck):
         :param request:
         :return:
         """
+        app: SearchApp = request.app
+
+        if app.fasttext.mode is FastTextInferenceMode.LOCAL:
+            # Inference is performed in-process, so dp-fasttext isn't required
+            return self.LOCAL, 200
+
         client: Client
-        async with FastTextClientService.get_fasttext_client() as client:
+        async with app.fasttext.acquire() as client:
             headers = {
                 Client.REQUEST_ID_HEADER: request.request_id
             }
@@ -35,6 +43,9 @@ class DpFastTextHealthCheck(HealthCheck):
 
                 if response is not None and \
                     Client.REQUEST_ID_HEADER in headers and headers[Client.REQUEST_ID_HEADER] == request.request_id:
+                    logger.debug(request.request_id, "dp-fasttext client pool metrics", extra={
+                        "metrics": app.fasttext.metrics
+                    })
                     return self.AVAILABLE, 200
             except Exception as e:
                 logger.error(request.request_id, "Caught exception checking health of dp-fasttext", exc_info=e)
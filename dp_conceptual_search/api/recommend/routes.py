@@ -1,6 +1,8 @@
 """
 Defines the recommendation routes
 """
+from typing import List, Union
+
 from sanic.blueprints import Blueprint
 
 from dp4py_logging.time import timeit
@@ -9,6 +11,8 @@ from dp4py_sanic.api.response.json_response import json
 from dp_conceptual_search.log import logger
 from dp_conceptual_search.api.request import ONSRequest
 from dp_conceptual_search.app.search_app import SearchApp
+from dp_conceptual_search.search.client import MultiSearchClient
+from dp_conceptual_search.search.client.exceptions import DocumentNotFoundException
 
 from dp_conceptual_search.ons.search import SortField
 from dp_conceptual_search.ons.search.index import Index
@@ -32,7 +36,10 @@ async def recommend_content_by_uri(request: ONSRequest):
     app: SearchApp = request.app
 
     # Init engine
-    s: RecommendationSearchEngine = RecommendationSearchEngine(using=app.elasticsearch.client, index=Index.ONS.value)
+    s: RecommendationSearchEngine = RecommendationSearchEngine(using=app.elasticsearch.client, index=Index.ONS.value,
+                                                               fasttext=app.fasttext, ann_index=app.ann_index,
+                                                               executor=app.model_executor,
+                                                               embedding_vector_cache=app.embedding_vector_cache)
 
     # Get uri from POST params
     uri = request.get_uri()
@@ -61,3 +68,74 @@ async def recommend_content_by_uri(request: ONSRequest):
     except Exception as e:
         logger.error(request.request_id, "Caught exception executing 'similar_to_uri' query", exc_info=e)
         return json(request, "Caught exception executing 'similar_to_uri' query", 500)
+
+
+@recommend_blueprint.route('/similar/batch', methods=['POST'])
+@timeit
+async def recommend_content_by_uris(request: ONSRequest):
+    """
+    Returns content similar to each of the input uris. All similarity queries are executed in a single _msearch
+    request, and results (or errors) are returned for each uri.
+    :param request:
+    :return:
+    """
+    app: SearchApp = request.app
+
+    # Init engine
+    s: RecommendationSearchEngine = RecommendationSearchEngine(using=app.elasticsearch.client, index=Index.ONS.value,
+                                                               fasttext=app.fasttext, ann_index=app.ann_index,
+                                                               executor=app.model_executor,
+                                                               embedding_vector_cache=app.embedding_vector_cache)
+
+    # Get uris from POST params
+    uris: List[str] = request.get_uris()
+
+    # Get pagination params
+    page = request.get_current_page()
+    page_size = request.get_page_size()
+    sort_by: SortField = request.get_sort_by()
+
+    # Get num_labels param
+    num_labels: int = request.get_num_labels()
+
+    # Build the queries
+    queries: List[Union[RecommendationSearchEngine, Exception]] = await s.similar_by_uris_queries(
+        uris, num_labels, page, page_size, sort_by=sort_by, highlight=True, context=request.request_id
+    )
+
+    # Execute all queries in a single request
+    searches: List[RecommendationSearchEngine] = [query for query in queries if not isinstance(query, Exception)]
+
+    try:
+        responses = []
+        if len(searches) > 0:
+            ms: MultiSearchClient = MultiSearchClient(using=app.elasticsearch.client)
+            for search in searches:
+                ms = ms.add(search)
+
+            responses = await ms.execute()
+        responses = iter(responses)
+    except Exception as e:
+        logger.error(request.request_id, "Caught exception executing 'similar_to_uri' queries", exc_info=e)
+        return json(request, "Caught exception executing 'similar_to_uri' queries", 500)
+
+    # Demultiplex the responses
+    results = []
+    for uri, query in zip(uris, queries):
+        response: Union[ONSResponse, Exception] = query if isinstance(query, Exception) else next(responses)
+
+        if isinstance(response, Exception):
+            status = 404 if isinstance(response, DocumentNotFoundException) else 500
+            logger.error(request.request_id, "Unable to recommend content for uri", exc_info=response, extra={
+                "uri": uri,
+                "status": status
+            })
+            results.append({"uri": uri, "status": status, "error": str(response)})
+        else:
+            results.append({
+                "uri": uri,
+                "status": 200,
+                "results": response.to_content_query_search_result(page, page_size, sort_by).to_dict()
+            })
+
+    return json(request, {"results": results}, 200)
@@ -5,7 +5,7 @@ from sanic.exceptions import InvalidUsage
 from dp4py_sanic.api.request import Request
 
 from dp_conceptual_search.log import logger
-from dp_conceptual_search.config import SEARCH_CONFIG, FASTTEXT_CONFIG
+from dp_conceptual_search.config import SEARCH_CONFIG, FASTTEXT_CONFIG, ML_CONFIG
 
 from dp_conceptual_search.ons.search.sort_fields import SortField
 from dp_conceptual_search.ons.search.content_type import AvailableContentTypes, ContentType
@@ -46,6 +46,63 @@ class ONSRequest(Request):
         })
         raise InvalidUsage(message)
 
+    def get_uris(self) -> List[str]:
+        """
+        Returns the (non-empty) list of uris from the POST data
+        :return:
+        """
+        if hasattr(self, "json") and isinstance(self.json, dict):
+            uris = self.json.get("uris")
+            if not isinstance(uris, list) or len(uris) == 0 or not all(isinstance(uri, str) for uri in uris):
+                message = "uris parameter must be a non-empty list of strings in POST data"
+                logger.error(self.request_id, message, extra={
+                    "status": 400
+                })
+                raise InvalidUsage(message)
+
+            if len(uris) > SEARCH_CONFIG.recommend_max_batch_size:
+                message = "Too many uris [uris={uris}, max={max}]".format(uris=len(uris),
+                                                                         max=SEARCH_CONFIG.recommend_max_batch_size)
+                logger.error(self.request_id, message, extra={
+                    "status": 400
+                })
+                raise InvalidUsage(message)
+            return uris
+        message = "Invalid request body whilst trying to parse body for uris"
+        logger.error(self.request_id, message, extra={
+            "status": 400
+        })
+        raise InvalidUsage(message)
+
+    def get_queries(self) -> List[str]:
+        """
+        Returns the (non-empty) list of queries from the POST data
+        :return:
+        """
+        if hasattr(self, "json") and isinstance(self.json, dict):
+            queries = self.json.get("queries")
+            if not isinstance(queries, list) or len(queries) == 0 or \
+                    not all(isinstance(query, str) for query in queries):
+                message = "queries parameter must be a non-empty list of strings in POST data"
+                logger.error(self.request_id, message, extra={
+                    "status": 400
+                })
+                raise InvalidUsage(message)
+
+            if len(queries) > ML_CONFIG.spellcheck_max_batch_size:
+                message = "Too many queries [queries={queries}, max={max}]".format(
+                    queries=len(queries), max=ML_CONFIG.spellcheck_max_batch_size)
+                logger.error(self.request_id, message, extra={
+                    "status": 400
+                })
+                raise InvalidUsage(message)
+            return queries
+        message = "Invalid request body whilst trying to parse body for queries"
+        logger.error(self.request_id, message, extra={
+            "status": 400
+        })
+        raise InvalidUsage(message)
+
     def get_current_page(self) -> int:
         """
         Returns the requested page number. Defaults to the first page.
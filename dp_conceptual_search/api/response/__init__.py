@@ -0,0 +1 @@
+from dp_conceptual_search.api.response.streaming_json_response import stream_json, search_json
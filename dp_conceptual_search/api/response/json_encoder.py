@@ -0,0 +1,56 @@
+"""
+Incremental JSON encoding of (large) response bodies
+"""
+import json
+from functools import partial
+from typing import Callable, Iterator
+
+compact_dumps = partial(json.dumps, separators=(",", ":"))
+
+
+def iter_json(obj, dumps: Callable[[object], str]=compact_dumps) -> Iterator[str]:
+    """
+    Encodes obj as JSON, yielding the encoding in pieces. Dicts are encoded key by key (recursively), and the items of
+    lists are encoded one at a time, so that only a single list item (i.e search hit) is encoded at once.
+    :param obj:
+    :param dumps: Function used to encode keys, list items and scalar values
+    :return:
+    """
+    if isinstance(obj, dict):
+        yield "{"
+        for i, (key, value) in enumerate(obj.items()):
+            yield "{sep}{key}:".format(sep="," if i > 0 else "", key=dumps(str(key)))
+            yield from iter_json(value, dumps=dumps)
+        yield "}"
+    elif isinstance(obj, (list, tuple)):
+        yield "["
+        for i, item in enumerate(obj):
+            if i > 0:
+                yield ","
+            yield dumps(item)
+        yield "]"
+    else:
+        yield dumps(obj)
+
+
+def iter_json_chunks(obj, chunk_size: int, dumps: Callable[[object], str]=compact_dumps) -> Iterator[str]:
+    """
+    Encodes obj as JSON, yielding the encoding in chunks of (at least) chunk_size characters, except the last
+    :param obj:
+    :param chunk_size:
+    :param dumps:
+    :return:
+    """
+    buffer = []
+    size = 0
+    for part in iter_json(obj, dumps=dumps):
+        buffer.append(part)
+        size += len(part)
+
+        if size >= chunk_size:
+            yield "".join(buffer)
+            buffer = []
+            size = 0
+
+    if len(buffer) > 0:
+        yield "".join(buffer)
@@ -0,0 +1,52 @@
+"""
+Streaming JSON responses, for large SERPs
+"""
+from inspect import isawaitable
+
+from sanic.response import stream, json_dumps, StreamingHTTPResponse, HTTPResponse
+
+from dp4py_sanic.api.response import json
+
+from dp_conceptual_search.config import SEARCH_CONFIG
+from dp_conceptual_search.api.request import ONSRequest
+from dp_conceptual_search.api.response.json_encoder import iter_json_chunks
+
+
+def stream_json(request: ONSRequest, body, status: int=200,
+                chunk_size: int=SEARCH_CONFIG.streaming_response_chunk_size) -> StreamingHTTPResponse:
+    """
+    Returns a chunked JSON response, which encodes and writes the body incrementally rather than serialising it to a
+    single string up front
+    :param request:
+    :param body:
+    :param status:
+    :param chunk_size: Approximate size (characters) of each chunk written to the response stream
+    :return:
+    """
+    async def streaming_fn(response: StreamingHTTPResponse):
+        for chunk in iter_json_chunks(body, chunk_size, dumps=json_dumps):
+            result = response.write(chunk)
+            if isawaitable(result):
+                await result
+
+    headers = {
+        "X-Request-Id": request.request_id
+    }
+
+    return stream(streaming_fn, status=status, headers=headers, content_type="application/json")
+
+
+def search_json(request: ONSRequest, body, status: int=200) -> HTTPResponse:
+    """
+    Returns a JSON response for search results, which is streamed if the requested page size is at least
+    SEARCH_STREAMING_RESPONSE_MIN_PAGE_SIZE
+    :param request:
+    :param body:
+    :param status:
+    :return:
+    """
+    min_page_size = SEARCH_CONFIG.streaming_response_min_page_size
+    if 0 < min_page_size <= request.get_page_size():
+        return stream_json(request, body, status)
+
+    return json(request, body, status)
@@ -7,6 +7,7 @@ from sanic.response import HTTPResponse
 from dp4py_sanic.api.response import json
 
 from dp_conceptual_search.api.request import ONSRequest
+from dp_conceptual_search.api.response import search_json
 from dp_conceptual_search.ons.search.index import Index
 from dp_conceptual_search.ons.conceptual.client import ConceptualSearchEngine
 from dp_conceptual_search.ons.search.response.search_result import SearchResult
@@ -28,7 +29,7 @@ async def search(request: ONSRequest) -> HTTPResponse:
 
     result = await sanic_search_engine.search(request)
 
-    return json(request, result, 200)
+    return search_json(request, result, 200)
 
 
 @conceptual_search_blueprint.route('/content', methods=['GET', 'POST'], strict_slashes=True)
@@ -45,7 +46,7 @@ async def conceptual_content_query(request: ONSRequest) -> HTTPResponse:
     # Perform the request
     search_result: SearchResult = await sanic_search_engine.content_query(request)
 
-    return json(request, search_result.to_dict(), 200)
+    return search_json(request, search_result.to_dict(), 200)
 
 
 @conceptual_search_blueprint.route('/counts', methods=['GET', 'POST'], strict_slashes=True)
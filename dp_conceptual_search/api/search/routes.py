@@ -8,6 +8,7 @@ from dp4py_sanic.api.response.json_response import json
 
 from dp_conceptual_search.config import CONFIG
 from dp_conceptual_search.api.request import ONSRequest
+from dp_conceptual_search.api.response import search_json
 from dp_conceptual_search.ons.search.index import Index
 from dp_conceptual_search.ons.search.client.search_engine import SearchEngine
 from dp_conceptual_search.ons.search.response.search_result import SearchResult
@@ -30,7 +31,7 @@ async def ons_departments_query(request: ONSRequest) -> HTTPResponse:
     # Perform the request
     search_result: SearchResult = await sanic_search_engine.departments_query(request)
 
-    return json(request, search_result.to_dict(), 200)
+    return search_json(request, search_result.to_dict(), 200)
 
 
 @search_blueprint.route('/', methods=['GET', 'POST'], strict_slashes=False)
@@ -44,11 +45,11 @@ async def search(request: ONSRequest) -> HTTPResponse:
         return await conceptual_routes.search(request)
 
     # Initialise the search engine
-    sanic_search_engine = SanicSearchEngine(request.app, search_engine_cls, Index.ONS)
+    sanic_search_engine = SanicSearchEngine(request.app, SearchEngine, Index.ONS)
 
     result = await sanic_search_engine.search(request)
 
-    return json(request, result, 200)
+    return search_json(request, result, 200)
 
 
 @search_blueprint.route('/content', methods=['GET', 'POST'], strict_slashes=True)
@@ -67,7 +68,7 @@ async def ons_content_query(request: ONSRequest) -> HTTPResponse:
     # Perform the request
     search_result: SearchResult = await sanic_search_engine.content_query(request)
 
-    return json(request, search_result.to_dict(), 200)
+    return search_json(request, search_result.to_dict(), 200)
 
 
 @search_blueprint.route('/counts', methods=['GET', 'POST'], strict_slashes=True)
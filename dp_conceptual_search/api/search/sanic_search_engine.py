@@ -1,7 +1,11 @@
 """
 This file contains utility methods for performing search queries using abstract search engines and clients
 """
-from typing import ClassVar, List, Dict
+import json
+import asyncio
+import hashlib
+from numpy import ndarray
+from typing import ClassVar, List, Dict, Awaitable, Callable, NamedTuple, Optional, Tuple, Union
 
 from elasticsearch.exceptions import ConnectionError
 
@@ -9,44 +13,104 @@ from sanic.exceptions import ServerError, InvalidUsage
 
 from dp4py_logging.time import timeit
 
-from dp_conceptual_search.config.config import FASTTEXT_CONFIG
+from dp_conceptual_search.config.config import FASTTEXT_CONFIG, SEARCH_CONFIG
 
 from dp_conceptual_search.log import logger
 from dp_conceptual_search.app.search_app import SearchApp
 from dp_conceptual_search.api.request import ONSRequest
+from dp_conceptual_search.search.query_helper import normalise_search_term
+from dp_conceptual_search.search.client import MultiSearchClient
 from dp_conceptual_search.search.client.exceptions import RequestSizeExceededException
 
 from dp_conceptual_search.ons.search.index import Index
 from dp_conceptual_search.ons.search.sort_fields import SortField
 from dp_conceptual_search.ons.search.content_type import ContentType
 from dp_conceptual_search.ons.search.client.search_engine import SearchEngine
+from dp_conceptual_search.ons.search.paginator import Paginator
 from dp_conceptual_search.ons.search.response.search_result import SearchResult
+from dp_conceptual_search.ons.search.response.content_query_result import ContentQueryResult
+from dp_conceptual_search.ons.search.response.type_counts_query_result import TypeCountsQueryResult
 from dp_conceptual_search.ons.search.response.client.ons_response import ONSResponse
 from dp_conceptual_search.ons.search.client.abstract_search_engine import AbstractSearchEngine
-from dp_conceptual_search.ons.conceptual.client import ConceptualSearchEngine, FastTextClientService
+from dp_conceptual_search.ons.conceptual.client import ConceptualSearchEngine
 
 
-async def execute(request: ONSRequest, engine: AbstractSearchEngine) -> ONSResponse:
+class SubQuery(NamedTuple):
     """
-    Executes a search query and logs known exceptions
+    A sub-query of the combined search: builds the query for a request, and converts the response into search results
+    (cached under the given keys)
+    """
+    name: str
+    keys: Dict[str, str]
+    build: Callable[[ONSRequest], Awaitable[AbstractSearchEngine]]
+    convert: Callable[[ONSRequest, ONSResponse], Union[SearchResult, Dict[str, SearchResult]]]
+    required: bool
+    timeout: float
+
+
+async def execute(request: ONSRequest, engine: AbstractSearchEngine, message: str=None) -> ONSResponse:
+    """
+    Executes a search query and logs known exceptions. The query is serialised exactly once, and shared between the
+    (trace) log message and the Elasticsearch request.
     :param request:
     :param engine:
+    :param message: Optional message to trace log the query with
     :return:
     """
+    body = engine.to_dict()
+
+    if message is not None:
+        logger.trace(request.request_id, message, extra={
+            "query": body
+        })
+
     try:
-        return await engine.execute()
+        return await engine.execute(body=body)
     except ConnectionError as e:
         message = "Unable to connect to Elasticsearch cluster to perform content query request"
         logger.error(request.request_id, message, exc_info=e)
         raise ServerError(message)
 
 
+async def execute_multi_search(request: ONSRequest, ms: MultiSearchClient, timeout: float,
+                               message: str=None) -> List[Union[ONSResponse, Exception]]:
+    """
+    Executes a multi search request with a timeout, and logs known exceptions. Failed searches are returned as
+    exceptions in place of their response.
+    :param request:
+    :param ms:
+    :param timeout: Timeout (in seconds) for the whole request (0 to disable)
+    :param message: Optional message to trace log the queries with
+    :return:
+    """
+    body = ms.to_dict()
+
+    if message is not None:
+        logger.trace(request.request_id, message, extra={
+            "query": body
+        })
+
+    try:
+        return await asyncio.wait_for(ms.execute(body=body), timeout=timeout if timeout > 0 else None)
+    except asyncio.TimeoutError as e:
+        message = "Timed out executing multi search request after {timeout}s".format(timeout=timeout)
+        logger.error(request.request_id, message, exc_info=e)
+        raise ServerError(message)
+    except ConnectionError as e:
+        message = "Unable to connect to Elasticsearch cluster to perform multi search request"
+        logger.error(request.request_id, message, exc_info=e)
+        raise ServerError(message)
+
+
 class SanicSearchEngine(object):
 
     CONTENT = "content"
     TYPE_COUNTS = "counts"
     FEATURED = "featured"
 
+    # Key under which conceptual search params are stored on the request
+    CONCEPTUAL_SEARCH_PARAMS = "conceptual_search_params"
+
     def __init__(self, app: SearchApp, search_engine_cls: ClassVar[AbstractSearchEngine], index: Index):
         """
         Helper class for working with abstract search engine instances
@@ -63,31 +127,314 @@ class SanicSearchEngine(object):
         Returns an instance of the desired SearchEngine class
         :return:
         """
-        return self._search_engine_cls(using=self.app.elasticsearch.client, index=self.index.value)
+        kwargs = {}
+        if issubclass(self._search_engine_cls, ConceptualSearchEngine):
+            # Share the app scoped dp-fasttext client pool and conceptual search params cache
+            kwargs['fasttext'] = self.app.fasttext
+            kwargs['cache'] = self.app.conceptual_search_params_cache
 
-    @timeit
-    async def search(self, request: ONSRequest) -> Dict[str, dict]:
+        return self._search_engine_cls(using=self.app.elasticsearch.client, index=self.index.value, **kwargs)
+
+    async def conceptual_search_params(self, request: ONSRequest, engine: ConceptualSearchEngine) -> \
+            Tuple[List[str], ndarray]:
         """
-        Combines content, type counts and featured results queries
+        Returns the labels and search vector for the requested search term. These are resolved (via dp-fasttext) once
+        per request and stored on the request, so that all sub-queries (including those running concurrently) share
+        the same result.
         :param request:
+        :param engine:
         :return:
         """
+        if self.CONCEPTUAL_SEARCH_PARAMS not in request:
+            request[self.CONCEPTUAL_SEARCH_PARAMS] = asyncio.ensure_future(
+                engine.conceptual_search_params(request.get_search_term(),
+                                                FASTTEXT_CONFIG.num_labels,
+                                                FASTTEXT_CONFIG.threshold,
+                                                context=request.request_id))
 
-        # Build the individual responses
-        content_response: SearchResult = await self.content_query(request)
-        type_counts_response: SearchResult = await self.type_counts_query(request)
-        featured_result_response: SearchResult = await self.featured_result_query(request)
+        # Shield the shared future, so that a cancelled (i.e timed out) sub-query doesn't cancel it for the others
+        return await asyncio.shield(request[self.CONCEPTUAL_SEARCH_PARAMS])
+
+    def search_result_cache_key(self, kind: str, engine_cls: ClassVar[AbstractSearchEngine]=None, **params) -> str:
+        """
+        Builds a canonical hash of the query kind, search engine, index and (normalised) request params
+        :param kind:
+        :param engine_cls: Search engine class used to execute the query (defaults to the configured class)
+        :param params:
+        :return:
+        """
+        engine_cls = engine_cls if engine_cls is not None else self._search_engine_cls
 
-        # Add to result
-        result_dict = {
-            self.CONTENT: content_response.to_dict(),
-            self.TYPE_COUNTS: type_counts_response.to_dict(),
-            self.FEATURED: featured_result_response.to_dict()
+        key = {
+            "kind": kind,
+            "engine": engine_cls.__name__,
+            "index": self.index.value,
+            "params": params
         }
 
+        if issubclass(engine_cls, ConceptualSearchEngine):
+            # Conceptual queries also depend on the fastText model
+            key["model_version"] = self.app.fasttext.model_version
+
+        return hashlib.sha256(json.dumps(key, sort_keys=True).encode("utf-8")).hexdigest()
+
+    @staticmethod
+    def normalise_search_term(search_term: str) -> str:
+        return normalise_search_term(search_term)
+
+    def cached(self, request: ONSRequest, key: str) -> Optional[SearchResult]:
+        """
+        Returns the cached search result for the given key (or None), recording the cache status on the request
+        :param request:
+        :param key:
+        :return:
+        """
+        cache = self.app.search_result_cache
+        if cache is None:
+            return None
+
+        search_result: SearchResult = cache.get(key)
+        if search_result is not None:
+            request.setdefault(SearchApp.CACHE_STATUS, SearchApp.CACHE_HIT)
+        else:
+            request[SearchApp.CACHE_STATUS] = SearchApp.CACHE_MISS
+
+        return search_result
+
+    def cache(self, key: str, search_result: SearchResult):
+        """
+        Caches the search result for the given key (if the cache is enabled)
+        :param key:
+        :param search_result:
+        :return:
+        """
+        cache = self.app.search_result_cache
+        if cache is not None:
+            cache.set(key, search_result)
+
+    async def cached_search_result(self, request: ONSRequest, key: str,
+                                   query: Callable[[], Awaitable[SearchResult]]) -> SearchResult:
+        """
+        Returns the cached search result for the given key, or executes (and caches) the query on a miss. The cache
+        status is recorded on the request, and returned in the X-Cache header (MISS if any sub-query missed).
+        :param request:
+        :param key:
+        :param query:
+        :return:
+        """
+        search_result: SearchResult = self.cached(request, key)
+        if search_result is not None:
+            return search_result
+
+        search_result: SearchResult = await query()
+        self.cache(key, search_result)
+
+        return search_result
+
+    @timeit
+    async def search(self, request: ONSRequest) -> Dict[str, dict]:
+        """
+        Combines content, type counts and featured results queries. Failure of the content query fails the request,
+        while failures of the type counts or featured result queries are logged and replaced with empty results (unless
+        partial results are disabled).
+        :param request:
+        :return:
+        """
+        if SEARCH_CONFIG.multi_search_enabled:
+            results: Dict[str, SearchResult] = await self.multi_search(request)
+        else:
+            results: Dict[str, SearchResult] = await self.fan_out_search(request)
+
+        # Add to result, substituting empty results for failed (optional) sub-queries
+        result_dict = {}
+        for name in [self.CONTENT, self.TYPE_COUNTS, self.FEATURED]:
+            search_result = results.get(name)
+            if search_result is None:
+                search_result = self.empty_search_result(name)
+            result_dict[name] = search_result.to_dict()
+
         # Return
         return result_dict
 
+    async def fan_out_search(self, request: ONSRequest) -> Dict[str, SearchResult]:
+        """
+        Executes the sub-queries of the combined search as concurrent requests, each with its own timeout
+        :param request:
+        :return:
+        """
+        required = not SEARCH_CONFIG.allow_partial_results
+
+        if self.fold_type_counts(request):
+            sub_queries = [
+                (self.CONTENT, self.content_and_type_counts_query(request), SEARCH_CONFIG.content_query_timeout, True)
+            ]
+        else:
+            sub_queries = [
+                (self.CONTENT, self._named(self.CONTENT, self.content_query(request)),
+                 SEARCH_CONFIG.content_query_timeout, True),
+                (self.TYPE_COUNTS, self._named(self.TYPE_COUNTS, self.type_counts_query(request)),
+                 SEARCH_CONFIG.type_counts_query_timeout, required)
+            ]
+
+        sub_queries.append((self.FEATURED, self._named(self.FEATURED, self.featured_result_query(request)),
+                            SEARCH_CONFIG.featured_result_query_timeout, required))
+
+        # Fan out all sub-queries at once
+        tasks = [asyncio.ensure_future(self._execute_sub_query(request, name, coro, timeout, required))
+                 for name, coro, timeout, required in sub_queries]
+
+        try:
+            results: List[Dict[str, SearchResult]] = await asyncio.gather(*tasks)
+        except Exception:
+            # Don't leave the remaining sub-queries running once the request has failed
+            for task in tasks:
+                task.cancel()
+            raise
+
+        return {name: search_result for result in results for name, search_result in result.items()}
+
+    async def multi_search(self, request: ONSRequest) -> Dict[str, SearchResult]:
+        """
+        Executes the (uncached) sub-queries of the combined search in a single _msearch request, and demultiplexes the
+        responses into search results. The request is bounded by the content query timeout, and optional sub-queries
+        send their own timeout to Elasticsearch (in the search body) so they return partial results rather than
+        delaying the content query.
+        :param request:
+        :return:
+        """
+        required = not SEARCH_CONFIG.allow_partial_results
+
+        sub_queries = [
+            SubQuery(self.CONTENT, {self.CONTENT: self.content_cache_key(request)}, self._build_content_query,
+                     self._content_search_result, True, SEARCH_CONFIG.content_query_timeout),
+            SubQuery(self.TYPE_COUNTS, {self.TYPE_COUNTS: self.type_counts_cache_key(request)},
+                     self._build_type_counts_query, self._type_counts_search_result, required,
+                     SEARCH_CONFIG.type_counts_query_timeout),
+            SubQuery(self.FEATURED, {self.FEATURED: self.featured_result_cache_key(request)},
+                     self._build_featured_result_query, self._featured_result_search_result, required,
+                     SEARCH_CONFIG.featured_result_query_timeout)
+        ]
+
+        results: Dict[str, SearchResult] = {}
+
+        # Serve what we can from the cache
+        pending: List[SubQuery] = []
+        for sub_query in sub_queries:
+            search_result: SearchResult = self.cached(request, sub_query.keys[sub_query.name])
+            if search_result is not None:
+                results[sub_query.name] = search_result
+            else:
+                pending.append(sub_query)
+
+        # If neither are cached, fold the type counts query into the content query
+        if self.fold_type_counts(request) and self.CONTENT not in results and self.TYPE_COUNTS not in results:
+            pending = [SubQuery(self.CONTENT, {self.CONTENT: self.content_cache_key(request),
+                                               self.TYPE_COUNTS: self.type_counts_cache_key(request)},
+                                self._build_content_and_type_counts_query,
+                                self._content_and_type_counts_search_results, True,
+                                SEARCH_CONFIG.content_query_timeout)] + \
+                      [sub_query for sub_query in pending if sub_query.name == self.FEATURED]
+
+        if len(pending) == 0:
+            return results
+
+        # Build the remaining queries (concurrently, as conceptual queries may need to call dp-fasttext)
+        engines = await asyncio.gather(*[sub_query.build(request) for sub_query in pending], return_exceptions=True)
+
+        searches = []
+        for sub_query, engine in zip(pending, engines):
+            if isinstance(engine, Exception):
+                if isinstance(engine, InvalidUsage) or sub_query.required:
+                    raise engine
+                logger.error(request.request_id, "Caught exception building '{0}' query".format(sub_query.name),
+                             exc_info=engine)
+            else:
+                if not sub_query.required and sub_query.timeout > 0:
+                    # Optional sub-queries return partial results once their own timeout has elapsed, rather than
+                    # holding up (and failing) the whole request
+                    engine = engine.extra(timeout="{0}ms".format(int(sub_query.timeout * 1000)))
+                searches.append((sub_query, engine))
+
+        if len(searches) == 0:
+            return results
+
+        # Execute all queries in a single request, bounded by the timeout of the (required) content query
+        ms: MultiSearchClient = MultiSearchClient(using=self.app.elasticsearch.client)
+        for _, engine in searches:
+            ms = ms.add(engine)
+
+        responses: List[Union[ONSResponse, Exception]] = await execute_multi_search(
+            request, ms, SEARCH_CONFIG.content_query_timeout, message="Executing combined search queries")
+
+        # Demultiplex the responses
+        for (sub_query, engine), response in zip(searches, responses):
+            if isinstance(response, Exception):
+                message = "Caught exception executing '{0}' query".format(sub_query.name)
+                logger.error(request.request_id, message, exc_info=response)
+                if sub_query.required:
+                    raise ServerError(message)
+                continue
+
+            # Partial results of timed out queries are returned, but never cached
+            timed_out = getattr(response, "timed_out", False)
+            if timed_out:
+                logger.warning(request.request_id, "'{0}' query timed out, returning partial results"
+                               .format(sub_query.name))
+
+            search_results = sub_query.convert(request, response)
+            if isinstance(search_results, SearchResult):
+                search_results = {sub_query.name: search_results}
+
+            for name, search_result in search_results.items():
+                if not timed_out:
+                    self.cache(sub_query.keys[name], search_result)
+                results[name] = search_result
+
+        return results
+
+    @staticmethod
+    async def _named(name: str, coro: Awaitable[SearchResult]) -> Dict[str, SearchResult]:
+        return {name: await coro}
+
+    @staticmethod
+    async def _execute_sub_query(request: ONSRequest, name: str, coro: Awaitable[Dict[str, SearchResult]],
+                                 timeout: float, required: bool) -> Dict[str, SearchResult]:
+        """
+        Awaits a single sub-query of the combined search with a timeout. Client errors are always raised. Any other
+        error is raised if the sub-query is required, otherwise it is logged and no results are returned.
+        :param request:
+        :param name:
+        :param coro:
+        :param timeout:
+        :param required:
+        :return:
+        """
+        try:
+            return await asyncio.wait_for(coro, timeout=timeout if timeout > 0 else None)
+        except InvalidUsage:
+            raise
+        except asyncio.TimeoutError as e:
+            message = "Timed out executing '{name}' query after {timeout}s".format(name=name, timeout=timeout)
+            logger.error(request.request_id, message, exc_info=e)
+            if required:
+                raise ServerError(message)
+        except Exception as e:
+            logger.error(request.request_id, "Caught exception executing '{0}' query".format(name), exc_info=e)
+            if required:
+                raise
+
+        return {}
+
+    def empty_search_result(self, name: str) -> SearchResult:
+        """
+        Returns an empty result for the named sub-query of the combined search
+        :param name:
+        :return:
+        """
+        if name == self.TYPE_COUNTS:
+            return TypeCountsQueryResult(None)
+        return ContentQueryResult(0, 0, [], Paginator(0, 1, result_per_page=1), SortField.relevance)
+
     @timeit
     async def departments_query(self, request: ONSRequest) -> SearchResult:
         """
@@ -105,26 +452,78 @@ class SanicSearchEngine(object):
 
         engine: AbstractSearchEngine = engine.departments_query(search_term, page, page_size)
 
-        logger.trace(request.request_id, "Executing departments query", extra={
-            "query": engine.to_dict()
-        })
-        response: ONSResponse = await execute(request, engine)
+        response: ONSResponse = await execute(request, engine, message="Executing departments query")
 
         search_result: SearchResult = response.to_departments_query_search_result(page, page_size)
 
         return search_result
 
+    def content_cache_key(self, request: ONSRequest) -> str:
+        """
+        Returns the search result cache key for the ONS content query
+        :param request:
+        :return:
+        """
+        return self.search_result_cache_key(self.CONTENT,
+                                            search_term=self.normalise_search_term(request.get_search_term()),
+                                            page=request.get_current_page(),
+                                            page_size=request.get_page_size(),
+                                            sort_by=request.get_sort_by().name,
+                                            type_filters=sorted(t.name for t in request.get_type_filters()))
+
+    def type_counts_cache_key(self, request: ONSRequest) -> str:
+        """
+        Returns the search result cache key for the ONS type counts query
+        :param request:
+        :return:
+        """
+        return self.search_result_cache_key(self.TYPE_COUNTS,
+                                            search_term=self.normalise_search_term(request.get_search_term()),
+                                            type_filters=sorted(t.name for t in request.get_type_filters()))
+
+    def featured_result_cache_key(self, request: ONSRequest) -> str:
+        """
+        Returns the search result cache key for the ONS featured result query
+        :param request:
+        :return:
+        """
+        return self.search_result_cache_key(self.FEATURED, engine_cls=SearchEngine,
+                                            search_term=self.normalise_search_term(request.get_search_term()))
+
     @timeit
     async def content_query(self, request: ONSRequest) -> SearchResult:
+        """
+        Returns the (cached) result of the ONS content query
+        :param request:
+        :return:
+        """
+        key = self.content_cache_key(request)
+
+        return await self.cached_search_result(request, key, lambda: self._content_query(request))
+
+    async def _content_query(self, request: ONSRequest) -> SearchResult:
         """
         Executes the ONS content query using the given SearchEngine class
         :param request:
         :return:
         """
+        engine: AbstractSearchEngine = await self._build_content_query(request)
+
+        response: ONSResponse = await execute(request, engine, message="Executing content query")
+
+        return self._content_search_result(request, response)
+
+    async def _build_content_query(self, request: ONSRequest, type_counts: bool=False) -> AbstractSearchEngine:
+        """
+        Builds the ONS content query using the given SearchEngine class
+        :param request:
+        :param type_counts: Attach the type counts aggregation to the query
+        :return:
+        """
         # Initialise the search engine
         engine: AbstractSearchEngine = self.get_search_engine_instance()
 
-        # Perform the query
+        # Build the query
         search_term = request.get_search_term()
         page = request.get_current_page()
         page_size = request.get_page_size()
@@ -134,9 +533,7 @@ class SanicSearchEngine(object):
         try:
             kwargs = {}
             if isinstance(engine, ConceptualSearchEngine):
-                labels, search_vector = await engine.conceptual_search_params(search_term,
-                                                                              FASTTEXT_CONFIG.num_labels,
-                                                                              FASTTEXT_CONFIG.threshold)
+                labels, search_vector = await self.conceptual_search_params(request, engine)
                 kwargs['labels'] = labels
                 kwargs['search_vector'] = search_vector
 
@@ -153,10 +550,11 @@ class SanicSearchEngine(object):
 
             # NB: We pass the same content types as both filters and filter boosts (type_filters and filter_functions,
             # respectively).
-            engine: AbstractSearchEngine = engine.content_query(search_term, page, page_size, sort_by=sort_by,
-                                                                filter_functions=type_filters,
-                                                                type_filters=type_filters,
-                                                                **kwargs)
+            query = engine.content_and_type_counts_query if type_counts else engine.content_query
+            engine: AbstractSearchEngine = query(search_term, page, page_size, sort_by=sort_by,
+                                                 filter_functions=type_filters,
+                                                 type_filters=type_filters,
+                                                 **kwargs)
 
         except RequestSizeExceededException as e:
             # Log and raise a 400 BAD_REQUEST
@@ -164,25 +562,46 @@ class SanicSearchEngine(object):
             logger.error(request.request_id, message, exc_info=e)
             raise InvalidUsage(message)
 
-        logger.trace(request.request_id, "Executing content query", extra={
-            "query": engine.to_dict()
-        })
-        response: ONSResponse = await execute(request, engine)
-
-        search_result: SearchResult = response.to_content_query_search_result(page, page_size, sort_by)
+        return engine
 
-        return search_result
+    @staticmethod
+    def _content_search_result(request: ONSRequest, response: ONSResponse) -> SearchResult:
+        return response.to_content_query_search_result(request.get_current_page(), request.get_page_size(),
+                                                       request.get_sort_by())
 
     @timeit
     async def type_counts_query(self, request: ONSRequest) -> SearchResult:
+        """
+        Returns the (cached) result of the ONS type counts query
+        :param request:
+        :return:
+        """
+        key = self.type_counts_cache_key(request)
+
+        return await self.cached_search_result(request, key, lambda: self._type_counts_query(request))
+
+    async def _type_counts_query(self, request: ONSRequest) -> SearchResult:
         """
         Executes the ONS type counts query using the given SearchEngine class
         :param request:
         :return:
         """
+        engine: AbstractSearchEngine = await self._build_type_counts_query(request)
+
+        # Execute
+        response: ONSResponse = await execute(request, engine, message="Executing type counts query")
+
+        return self._type_counts_search_result(request, response)
+
+    async def _build_type_counts_query(self, request: ONSRequest) -> AbstractSearchEngine:
+        """
+        Builds the ONS type counts query using the given SearchEngine class
+        :param request:
+        :return:
+        """
         engine: AbstractSearchEngine = self.get_search_engine_instance()
 
-        # Perform the query
+        # Build the query
         search_term = request.get_search_term()
         type_filters: List[ContentType] = request.get_type_filters()
 
@@ -190,9 +609,7 @@ class SanicSearchEngine(object):
         try:
             kwargs = {}
             if isinstance(engine, ConceptualSearchEngine):
-                labels, search_vector = await engine.conceptual_search_params(search_term,
-                                                                              FASTTEXT_CONFIG.num_labels,
-                                                                              FASTTEXT_CONFIG.threshold)
+                labels, search_vector = await self.conceptual_search_params(request, engine)
                 kwargs['labels'] = labels
                 kwargs['search_vector'] = search_vector
 
@@ -211,26 +628,110 @@ class SanicSearchEngine(object):
             logger.error(request.request_id, message, exc_info=e)
             raise InvalidUsage(message)
 
-        # Execute
-        logger.trace(request.request_id, "Executing type counts query", extra={
-            "query": engine.to_dict()
-        })
-        response: ONSResponse = await execute(request, engine)
+        return engine
 
-        search_result: SearchResult = response.to_type_counts_query_search_result()
+    @staticmethod
+    def _type_counts_search_result(request: ONSRequest, response: ONSResponse) -> SearchResult:
+        return response.to_type_counts_query_search_result()
 
-        return search_result
+    def fold_type_counts(self, request: ONSRequest) -> bool:
+        """
+        Returns True if the type counts can be computed by an aggregation on the content query. This is only the case
+        if the content query matches the same documents as the type counts query: conceptual content queries which
+        aren't sorted by relevance fall back to the keyword query, so match fewer documents than the conceptual type
+        counts query (whose result would be cached with the wrong counts).
+        :param request:
+        :return:
+        """
+        if not SEARCH_CONFIG.combined_type_counts_enabled:
+            return False
+
+        return not issubclass(self._search_engine_cls, ConceptualSearchEngine) \
+            or request.get_sort_by() is SortField.relevance
+
+    async def content_and_type_counts_query(self, request: ONSRequest) -> Dict[str, SearchResult]:
+        """
+        Returns the (cached) results of the ONS content and type counts queries. If neither are cached (and the type
+        counts can be folded into the content query), both are computed by a single content query with the type counts
+        aggregation attached.
+        :param request:
+        :return:
+        """
+        if not self.fold_type_counts(request):
+            content, type_counts = await asyncio.gather(self.content_query(request), self.type_counts_query(request))
+            return {self.CONTENT: content, self.TYPE_COUNTS: type_counts}
+
+        keys = {
+            self.CONTENT: self.content_cache_key(request),
+            self.TYPE_COUNTS: self.type_counts_cache_key(request)
+        }
+        results = {name: self.cached(request, key) for name, key in keys.items()}
+
+        if results[self.CONTENT] is None and results[self.TYPE_COUNTS] is None:
+            engine: AbstractSearchEngine = await self._build_content_and_type_counts_query(request)
+
+            response: ONSResponse = await execute(request, engine, message="Executing content and type counts query")
+
+            results = self._content_and_type_counts_search_results(request, response)
+        elif results[self.CONTENT] is None:
+            results[self.CONTENT] = await self._content_query(request)
+        elif results[self.TYPE_COUNTS] is None:
+            results[self.TYPE_COUNTS] = await self._type_counts_query(request)
+        else:
+            return results
+
+        for name, search_result in results.items():
+            self.cache(keys[name], search_result)
+
+        return results
+
+    async def _build_content_and_type_counts_query(self, request: ONSRequest) -> AbstractSearchEngine:
+        """
+        Builds the ONS content query with the type counts aggregation attached
+        :param request:
+        :return:
+        """
+        return await self._build_content_query(request, type_counts=True)
+
+    def _content_and_type_counts_search_results(self, request: ONSRequest,
+                                                response: ONSResponse) -> Dict[str, SearchResult]:
+        return {
+            self.CONTENT: self._content_search_result(request, response),
+            self.TYPE_COUNTS: self._type_counts_search_result(request, response)
+        }
 
     @timeit
     async def featured_result_query(self, request: ONSRequest) -> SearchResult:
+        """
+        Returns the (cached) result of the ONS featured result query
+        :param request:
+        :return:
+        """
+        key = self.featured_result_cache_key(request)
+
+        return await self.cached_search_result(request, key, lambda: self._featured_result_query(request))
+
+    async def _featured_result_query(self, request: ONSRequest) -> SearchResult:
         """
         Executes the ONS featured result query using the default search engine class
         :param request:
         :return:
         """
+        engine: AbstractSearchEngine = await self._build_featured_result_query(request)
+
+        response: ONSResponse = await execute(request, engine, message="Executing featured result query")
+
+        return self._featured_result_search_result(request, response)
+
+    async def _build_featured_result_query(self, request: ONSRequest) -> AbstractSearchEngine:
+        """
+        Builds the ONS featured result query using the default search engine class
+        :param request:
+        :return:
+        """
         engine: AbstractSearchEngine = SearchEngine(using=self.app.elasticsearch.client, index=self.index.value)
 
-        # Perform the query
+        # Build the query
         search_term = request.get_search_term()
 
         logger.debug(request.request_id, "Received featured result query request", extra={
@@ -247,14 +748,11 @@ class SanicSearchEngine(object):
             logger.error(request.request_id, message, exc_info=e)
             raise InvalidUsage(message)
 
-        logger.trace(request.request_id, "Executing featured result query", extra={
-            "query": engine.to_dict()
-        })
-        response: ONSResponse = await execute(request, engine)
+        return engine
 
-        search_result: SearchResult = response.to_featured_result_query_search_result()
-
-        return search_result
+    @staticmethod
+    def _featured_result_search_result(request: ONSRequest, response: ONSResponse) -> SearchResult:
+        return response.to_featured_result_query_search_result()
 
     @timeit
     async def search_by_uri(self, request: ONSRequest, uri: str) -> SearchResult:
@@ -1,6 +1,8 @@
 """
 This file contains all routes for the /spellcheck API
 """
+from typing import Dict, List
+
 from sanic import Blueprint
 
 from dp4py_sanic.api.response.json_response import json
@@ -8,7 +10,8 @@ from dp4py_sanic.api.response.json_response import json
 from dp_conceptual_search.log import logger
 from dp_conceptual_search.api.request import ONSRequest
 from dp_conceptual_search.app.search_app import SearchApp
-from dp_conceptual_search.ml.spelling.spell_checker import SpellChecker
+from dp_conceptual_search.ml.spelling.spell_check_pool import SpellCheckPool
+from dp_conceptual_search.ml.spelling.spell_checker import SpellChecker, SpellCheckSuggestion
 
 spell_check_blueprint = Blueprint('spellcheck', url_prefix='/spellcheck')
 
@@ -29,8 +32,8 @@ async def spell_check(request: ONSRequest):
     # Generate the tokens
     tokens = search_term.split()
     if len(tokens) > 0:
-        # Get the result
-        result = spell_checker.correct_spelling(tokens)
+        # Get the result (off the ioloop, as double edit candidates are expensive to generate for long tokens)
+        result = await app.model_executor.run(spell_checker.correct_spelling, tokens)
 
         # Return the json response
         return json(request, result, 200)
@@ -39,3 +42,31 @@ async def spell_check(request: ONSRequest):
     message = "Found no input tokens in query: %s" % search_term
     logger.error(request.request_id, message)
     return json(request, message, 400)
+
+
+@spell_check_blueprint.route('/batch', methods=['POST'])
+async def spell_check_batch(request: ONSRequest):
+    """
+    API for spell checking many queries at once. Tokens are deduplicated across all queries, so each unique token is
+    only corrected once (in a process pool for large batches), and suggestions are returned for each query.
+    :param request:
+    :return:
+    """
+    queries: List[str] = request.get_queries()
+
+    # Get spell check pool
+    app: SearchApp = request.app
+    spell_check_pool: SpellCheckPool = app.spell_check_pool
+
+    # Generate the tokens for each query, and correct the unique tokens
+    tokens: List[List[str]] = [query.split() for query in queries]
+    corrections: Dict[str, SpellCheckSuggestion] = await spell_check_pool.correct_tokens(
+        token for query_tokens in tokens for token in query_tokens
+    )
+
+    results = []
+    for query, query_tokens in zip(queries, tokens):
+        suggestions = [corrections[token] for token in sorted(set(query_tokens)) if token in corrections]
+        results.append({"query": query, "results": suggestions})
+
+    return json(request, {"results": results}, 200)
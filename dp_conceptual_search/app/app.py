@@ -16,6 +16,7 @@ from dp_conceptual_search.api.search.conceptual.routes import conceptual_search_
 from dp_conceptual_search.api.recommend.routes import recommend_blueprint
 from dp_conceptual_search.api.spellcheck.routes import spell_check_blueprint
 from dp_conceptual_search.api.healthcheck.routes import healthcheck_blueprint
+from dp_conceptual_search.api.admin.routes import admin_blueprint
 
 
 def create_app() -> SearchApp:
@@ -46,6 +47,9 @@ def create_app() -> SearchApp:
     if CONFIG.API.recommended_search_enabled:
         app.blueprint(recommend_blueprint)
 
+    if CONFIG.API.admin_api_enabled:
+        app.blueprint(admin_blueprint)
+
     # Register error handlers
     ErrorHandlers.register(app)
 
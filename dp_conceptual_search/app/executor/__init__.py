@@ -0,0 +1 @@
+from .bounded_executor import BoundedExecutor, ExecutorRejectedException, ExecutorTimeoutException
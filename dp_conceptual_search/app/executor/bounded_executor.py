@@ -0,0 +1,99 @@
+"""
+Thread pool executor for CPU bound model calls, with a limit on the number of pending calls and a timeout, so that
+slow calls can't block the ioloop or queue up indefinitely
+"""
+import asyncio
+from concurrent.futures import ThreadPoolExecutor, Future
+
+from sanic.exceptions import ServiceUnavailable
+
+from dp_conceptual_search.config.config import ML_CONFIG
+
+
+class ExecutorRejectedException(ServiceUnavailable):
+    def __init__(self, name: str, max_pending: int):
+        super(ExecutorRejectedException, self).__init__("Too many pending {name} calls [max={max}]"
+                                                        .format(name=name, max=max_pending))
+
+
+class ExecutorTimeoutException(ServiceUnavailable):
+    def __init__(self, name: str, timeout: float):
+        super(ExecutorTimeoutException, self).__init__("Timed out waiting for {name} call after {timeout}s"
+                                                       .format(name=name, timeout=timeout))
+
+
+class BoundedExecutor(object):
+
+    def __init__(self, name: str, max_workers: int=ML_CONFIG.executor_max_workers,
+                 max_pending: int=ML_CONFIG.executor_max_pending, timeout: float=ML_CONFIG.executor_timeout):
+        """
+        Initialise the executor
+        :param name: Name used in errors and metrics
+        :param max_workers: Number of worker threads
+        :param max_pending: Max number of running and queued calls. Calls beyond this are rejected immediately.
+        :param timeout: Max time (seconds) to wait for a call, including time spent queued
+        """
+        self.name = name
+        self.max_workers = max_workers
+        self.max_pending = max_pending
+        self.timeout = timeout
+
+        self._executor = ThreadPoolExecutor(max_workers=max_workers)
+
+        self._pending = 0
+        self._completed = 0
+        self._rejected = 0
+        self._timeouts = 0
+
+    @property
+    def pending(self) -> int:
+        return self._pending
+
+    def _release(self, future: Future):
+        self._pending -= 1
+        if not future.cancelled():
+            self._completed += 1
+
+    async def run(self, fn, *args):
+        """
+        Runs fn(*args) in the thread pool, raising a ServiceUnavailable (503) exception if too many calls are pending
+        or the call times out. Calls are only counted as complete once their thread finishes (or they're cancelled
+        before starting), so calls which time out still count towards max_pending.
+        :param fn:
+        :param args:
+        :return:
+        """
+        if self._pending >= self.max_pending:
+            self._rejected += 1
+            raise ExecutorRejectedException(self.name, self.max_pending)
+
+        loop = asyncio.get_event_loop()
+
+        self._pending += 1
+        future: Future = self._executor.submit(fn, *args)
+        future.add_done_callback(lambda f: loop.call_soon_threadsafe(self._release, f))
+
+        try:
+            return await asyncio.wait_for(asyncio.wrap_future(future, loop=loop), timeout=self.timeout)
+        except asyncio.TimeoutError:
+            self._timeouts += 1
+            raise ExecutorTimeoutException(self.name, self.timeout)
+
+    def shutdown(self):
+        """
+        Shuts down the thread pool, without waiting for running calls
+        :return:
+        """
+        self._executor.shutdown(wait=False)
+
+    def to_dict(self) -> dict:
+        return {
+            "name": self.name,
+            "max_workers": self.max_workers,
+            "max_pending": self.max_pending,
+            "timeout": self.timeout,
+            "pending": self._pending,
+            "completed": self._completed,
+            "rejected": self._rejected,
+            "timeouts": self._timeouts
+        }
@@ -6,13 +6,31 @@ from dp4py_sanic.app.server import Server
 
 from dp_conceptual_search.config import CONFIG
 
+from dp_conceptual_search.cache import LRUCache, SharedGenerationLRUCache
+
 from dp_conceptual_search.api.request.ons_request import ONSRequest
+from dp_conceptual_search.ml.nearest_neighbours import IVFIndex
 from dp_conceptual_search.ml.spelling.spell_checker import SpellChecker
-from dp_conceptual_search.ml.word_embedding.fastText import UnsupervisedModel
+from dp_conceptual_search.ml.spelling.spell_check_pool import SpellCheckPool
+from dp_conceptual_search.ml.spelling.symmetric_delete_index import SymmetricDeleteIndex
+from dp_conceptual_search.ml.word_embedding.fastText import UnsupervisedModel, SupervisedModel
+from dp_conceptual_search.ons.conceptual.client.fasttext_service import FastTextService, FastTextInferenceMode
+from dp_conceptual_search.ons.conceptual.client.fasttext_client import FastTextClientService
+from dp_conceptual_search.ons.conceptual.client.local_fasttext_service import LocalFastTextService
+from dp_conceptual_search.ons.conceptual.client.conceptual_search_params_cache import ConceptualSearchParamsCache
+from dp_conceptual_search.ons.conceptual.client.embedding_vector_cache import EmbeddingVectorCache
+from dp_conceptual_search.app.executor import BoundedExecutor
 from dp_conceptual_search.app.elasticsearch.elasticsearch_client_service import ElasticsearchClientService
 
 
 class SearchApp(Server):
+
+    # Key under which the search result cache status is stored on the request, and the response header it's returned in
+    CACHE_STATUS = "search_result_cache_status"
+    CACHE_STATUS_HEADER = "X-Cache"
+    CACHE_HIT = "HIT"
+    CACHE_MISS = "MISS"
+
     def __init__(self, log_namespace: str, *args, **kwargs):
         # Initialise APP with custom ONSRequest class
         super(SearchApp, self).__init__(log_namespace, *args, request_class=ONSRequest, **kwargs)
@@ -20,12 +38,45 @@ class SearchApp(Server):
         # Attach an Elasticsearh client
         self._elasticsearch = None
 
+        # Attach a fastText inference service (pool of dp-fasttext clients, or local models)
+        self._fasttext = None
+
+        # Attach a cache of dp-fasttext labels and search vectors (disabled if the configured size is zero)
+        self._conceptual_search_params_cache = None
+        if CONFIG.FASTTEXT.cache_size > 0:
+            self._conceptual_search_params_cache = ConceptualSearchParamsCache()
+
+        # Attach a cache of document embedding vectors, for recommendations (disabled if the configured size is zero)
+        self._embedding_vector_cache = None
+        if CONFIG.SEARCH.embedding_vector_cache_size > 0:
+            self._embedding_vector_cache = EmbeddingVectorCache()
+
+        # Attach a cache of search results (disabled if the configured size is zero). Results are cached per worker, but
+        # if a generation file is configured, clearing the cache clears it for all workers on the host.
+        self._search_result_cache = None
+        if CONFIG.SEARCH.result_cache_size > 0:
+            if CONFIG.SEARCH.result_cache_generation_filename:
+                self._search_result_cache = SharedGenerationLRUCache(
+                    CONFIG.SEARCH.result_cache_size, CONFIG.SEARCH.result_cache_generation_filename,
+                    ttl=CONFIG.SEARCH.result_cache_ttl
+                )
+            else:
+                self._search_result_cache = LRUCache(CONFIG.SEARCH.result_cache_size,
+                                                     ttl=CONFIG.SEARCH.result_cache_ttl)
+
+        # Attach a bounded thread pool for CPU bound model calls (spell checking, local fastText and ANN search)
+        self._model_executor = BoundedExecutor("model")
+
         # Initialise unsupervised model member (used for spell check API)
         self._unsupervised_model = None
         self._supervised_model = None
 
-        # Initialise spell check member
+        # Initialise spell check members
         self._spell_checker = None
+        self._spell_check_pool = None
+
+        # Initialise approximate nearest neighbours index member (used for recommendations, if configured)
+        self._ann_index = None
 
         @self.listener("after_server_start")
         async def init(app: SearchApp, loop):
@@ -54,15 +105,55 @@ class SearchApp(Server):
             # Initialise spell checker
             self._initialise_spell_checker()
 
+            # Initialise the ANN index
+            if CONFIG.ML.ann_index_directory is not None:
+                self._initialise_ann_index()
+
+            # Initialise fastText inference
+            await self._initialise_fasttext()
+
+        @self.middleware("response")
+        async def add_cache_status_header(request, response):
+            """
+            Adds the X-Cache header to responses served using the search result cache
+            :param request:
+            :param response:
+            :return:
+            """
+            if request is not None and SearchApp.CACHE_STATUS in request:
+                response.headers[SearchApp.CACHE_STATUS_HEADER] = request[SearchApp.CACHE_STATUS]
+
         @self.listener("after_server_stop")
         async def shutdown(app: SearchApp, loop):
             """
-            Trigger clean shutdown of ES client
+            Trigger clean shutdown of ES and dp-fasttext clients
             :param app:
             :param loop:
             :return:
             """
             await app.elasticsearch.shutdown()
+            await app.fasttext.shutdown()
+
+            if app.spell_check_pool is not None:
+                logging.info("Spell check pool metrics", extra={
+                    "data": app.spell_check_pool.to_dict()
+                })
+                app.spell_check_pool.close()
+
+            logging.info("Model executor metrics", extra={
+                "data": app.model_executor.to_dict()
+            })
+            app.model_executor.shutdown()
+
+            if app.conceptual_search_params_cache is not None:
+                logging.info("Conceptual search params cache metrics", extra={
+                    "data": app.conceptual_search_params_cache.to_dict()
+                })
+
+            if app.embedding_vector_cache is not None:
+                logging.info("Embedding vector cache metrics", extra={
+                    "data": app.embedding_vector_cache.to_dict()
+                })
 
     def _initialise_unsupervised_model(self):
         """
@@ -87,6 +178,112 @@ class SearchApp(Server):
             }
         })
 
+    def _initialise_supervised_model(self):
+        """
+        Initialises the supervised fastText .bin model (used for local inference)
+        :return:
+        """
+        logging.debug("Initialising supervised fastText model", extra={
+            "model": {
+                "filename": CONFIG.ML.supervised_model_filename
+            }
+        })
+
+        try:
+            self._supervised_model = SupervisedModel(CONFIG.ML.supervised_model_filename)
+        except Exception as e:
+            logging.error("Error initialising supervised model", exc_info=e)
+            raise SystemExit()
+
+        logging.debug("Successfully initialised supervised fastText model", extra={
+            "model": {
+                "filename": CONFIG.ML.supervised_model_filename
+            }
+        })
+
+    async def _initialise_fasttext(self):
+        """
+        Initialises the fastText inference service, using either a pool of persistent dp-fasttext clients or local
+        models depending on the configured inference mode
+        :return:
+        """
+        mode = FastTextInferenceMode(CONFIG.FASTTEXT.inference_mode)
+
+        if mode is FastTextInferenceMode.LOCAL:
+            if CONFIG.ML.supervised_model_filename is not None:
+                self._initialise_supervised_model()
+
+            self._fasttext = LocalFastTextService(self.get_unsupervised_model(),
+                                                  supervised_model=self._supervised_model,
+                                                  executor=self._model_executor)
+        else:
+            self._fasttext = FastTextClientService()
+
+        await self._fasttext.initialise()
+
+        if self._conceptual_search_params_cache is not None:
+            # Invalidates cached params if the model version has changed
+            self._conceptual_search_params_cache.model_version = self._fasttext.model_version
+
+        logging.debug("Initialised fastText service", extra={
+            "data": {
+                "mode": mode.value,
+                "model_version": self._fasttext.model_version,
+                "metrics": self._fasttext.metrics
+            }
+        })
+
+    def _initialise_ann_index(self):
+        """
+        Memory maps the approximate nearest neighbours index of document embedding vectors
+        :return:
+        """
+        logging.debug("Initialising ANN index", extra={
+            "index": {
+                "directory": CONFIG.ML.ann_index_directory
+            }
+        })
+
+        try:
+            self._ann_index = IVFIndex.load(CONFIG.ML.ann_index_directory)
+        except Exception as e:
+            logging.error("Error initialising ANN index", exc_info=e)
+            raise SystemExit()
+
+        logging.debug("Successfully initialised ANN index", extra={
+            "index": {
+                "directory": CONFIG.ML.ann_index_directory,
+                "size": len(self._ann_index),
+                "num_lists": self._ann_index.num_lists
+            }
+        })
+
+    def _load_spellcheck_index(self) -> SymmetricDeleteIndex:
+        """
+        Memory maps the prebuilt spellcheck index, checking it was built over the unsupervised model vocabulary
+        :return:
+        """
+        try:
+            index = SymmetricDeleteIndex.load(CONFIG.ML.spellcheck_index_filename)
+        except Exception as e:
+            logging.error("Error loading spellcheck index", exc_info=e)
+            raise SystemExit()
+
+        if not index.matches_vocabulary(self._unsupervised_model.words):
+            logging.error("Spellcheck index doesn't match the unsupervised model vocabulary", extra={
+                "index": {
+                    "filename": CONFIG.ML.spellcheck_index_filename,
+                    "size": len(index)
+                },
+                "model": {
+                    "filename": self._unsupervised_model.filename,
+                    "size": len(self._unsupervised_model.words)
+                }
+            })
+            raise SystemExit()
+
+        return index
+
     def _initialise_spell_checker(self):
         """
         Initialises the SpellChecker using the unsupervised fastText model
@@ -99,11 +296,27 @@ class SearchApp(Server):
                 }
             })
 
-            self._spell_checker = SpellChecker(self._unsupervised_model)
+            index: SymmetricDeleteIndex = None
+            if CONFIG.ML.spellcheck_index_filename is not None:
+                index = self._load_spellcheck_index()
+
+            self._spell_checker = SpellChecker(self._unsupervised_model, index=index)
+            self._spell_check_pool = SpellCheckPool(self._spell_checker, processes=CONFIG.ML.spellcheck_pool_size,
+                                                    min_tokens=CONFIG.ML.spellcheck_pool_min_tokens,
+                                                    timeout=CONFIG.ML.spellcheck_pool_timeout,
+                                                    max_pending=CONFIG.ML.spellcheck_pool_max_pending,
+                                                    executor=self._model_executor)
+
+            # Fork the pool workers now, before any model executor threads exist
+            self._spell_check_pool.start()
 
             logging.debug("Successfully initialised SpellChecker", extra={
                 "model": {
                     "filename": self._unsupervised_model.filename
+                },
+                "index": {
+                    "filename": CONFIG.ML.spellcheck_index_filename,
+                    "size": len(self._spell_checker.index)
                 }
             })
         else:
@@ -118,6 +331,54 @@ class SearchApp(Server):
         """
         return self._elasticsearch
 
+    @property
+    def fasttext(self) -> FastTextService:
+        """
+        Return the fastText inference service
+        :return:
+        """
+        return self._fasttext
+
+    @property
+    def conceptual_search_params_cache(self) -> ConceptualSearchParamsCache:
+        """
+        Return the cache of dp-fasttext labels and search vectors (None if disabled)
+        :return:
+        """
+        return self._conceptual_search_params_cache
+
+    @property
+    def embedding_vector_cache(self) -> EmbeddingVectorCache:
+        """
+        Return the cache of document embedding vectors (None if disabled)
+        :return:
+        """
+        return self._embedding_vector_cache
+
+    @property
+    def search_result_cache(self) -> LRUCache:
+        """
+        Return the cache of search results (None if disabled)
+        :return:
+        """
+        return self._search_result_cache
+
+    @property
+    def ann_index(self) -> IVFIndex:
+        """
+        Return the approximate nearest neighbours index (None if not configured)
+        :return:
+        """
+        return self._ann_index
+
+    @property
+    def model_executor(self) -> BoundedExecutor:
+        """
+        Returns the bounded executor used to run CPU bound model calls off the ioloop
+        :return:
+        """
+        return self._model_executor
+
     @property
     def spell_checker(self) -> SpellChecker:
         """
@@ -126,6 +387,14 @@ class SearchApp(Server):
         """
         return self._spell_checker
 
+    @property
+    def spell_check_pool(self) -> SpellCheckPool:
+        """
+        Returns the pool used to correct batches of tokens
+        :return:
+        """
+        return self._spell_check_pool
+
     def get_unsupervised_model(self) -> UnsupervisedModel:
         """
         Returns the cached unsupervised model
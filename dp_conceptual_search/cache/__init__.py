@@ -0,0 +1,5 @@
+from .cache_stats import CacheStats
+from .cache_backend import CacheBackend
+from .lru_cache import LRUCache
+from .shared_memory_cache import SharedMemoryCache
+from .shared_generation_lru_cache import SharedGenerationLRUCache
@@ -0,0 +1,9 @@
+"""
+Enum of available cache backends
+"""
+from enum import Enum
+
+
+class CacheBackend(Enum):
+    MEMORY = "memory"  # In-process LRU cache
+    SHARED = "shared"  # Shared memory cache (shared between worker processes on the same host)
@@ -0,0 +1,108 @@
+"""
+Implementation of a bounded, in-process LRU cache with a time-to-live on entries
+"""
+import time
+from collections import OrderedDict
+from typing import Any, Callable, Hashable
+
+from dp_conceptual_search.cache.cache_stats import CacheStats
+
+
+class LRUCache(object):
+
+    def __init__(self, max_size: int, ttl: float=None, timer: Callable[[], float]=time.monotonic):
+        """
+        Initialise the cache
+        :param max_size: Maximum number of entries held before the least recently used entry is evicted
+        :param ttl: Time (in seconds) after which entries expire. Entries never expire if None or <= 0.
+        :param timer: Monotonic clock used to expire entries
+        """
+        if max_size <= 0:
+            raise ValueError("Cache size must be greater than zero, got {0}".format(max_size))
+
+        self.max_size = max_size
+        self.ttl = ttl if ttl is not None and ttl > 0 else None
+        self._timer = timer
+
+        # Maps key -> (expiry time, value), ordered from least to most recently used
+        self._entries: OrderedDict = OrderedDict()
+
+        self.stats = CacheStats()
+
+    def get(self, key: Hashable, default: Any=None) -> Any:
+        """
+        Returns the cached value for the given key (marking it as most recently used), or default if the key is
+        missing or has expired
+        :param key:
+        :param default:
+        :return:
+        """
+        entry = self._entries.get(key)
+
+        if entry is None:
+            self.stats.misses += 1
+            return default
+
+        expires, value = entry
+        if expires is not None and expires <= self._timer():
+            del self._entries[key]
+            self.stats.expirations += 1
+            self.stats.misses += 1
+            return default
+
+        self._entries.move_to_end(key)
+        self.stats.hits += 1
+        return value
+
+    def set(self, key: Hashable, value: Any):
+        """
+        Caches the given value, evicting the least recently used entry if the cache is full
+        :param key:
+        :param value:
+        :return:
+        """
+        expires = self._timer() + self.ttl if self.ttl is not None else None
+
+        if key in self._entries:
+            self._entries.move_to_end(key)
+        self._entries[key] = (expires, value)
+
+        while len(self._entries) > self.max_size:
+            self._entries.popitem(last=False)
+            self.stats.evictions += 1
+
+    def invalidate(self, key: Hashable) -> bool:
+        """
+        Removes a single entry from the cache
+        :param key:
+        :return: True if the entry existed
+        """
+        return self._entries.pop(key, None) is not None
+
+    def clear(self):
+        """
+        Removes all entries from the cache
+        :return:
+        """
+        self._entries.clear()
+
+    def __contains__(self, key: Hashable) -> bool:
+        entry = self._entries.get(key)
+        return entry is not None and (entry[0] is None or entry[0] > self._timer())
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def to_dict(self) -> dict:
+        """
+        Returns cache metrics
+        :return:
+        """
+        metrics = {
+            "size": len(self),
+            "max_size": self.max_size,
+            "ttl": self.ttl
+        }
+        metrics.update(self.stats.to_dict())
+
+        return metrics
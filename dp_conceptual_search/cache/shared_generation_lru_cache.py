@@ -0,0 +1,147 @@
+"""
+Implementation of a per-process LRU cache which can be cleared for all worker processes on the same host, using a
+generation counter stored in a shared memory mapped file
+"""
+import os
+import mmap
+import time
+import struct
+from typing import Any, Callable, Hashable
+
+from dp_conceptual_search.cache.lru_cache import LRUCache
+
+
+class SharedGeneration(object):
+    """
+    Counter stored in an mmap'd file, shared by all processes which map the same file
+    """
+
+    MAGIC = b"DPCSG001"
+
+    # magic, generation
+    FILE_HEADER = struct.Struct("<8sQ")
+
+    def __init__(self, filename: str):
+        """
+        Initialise the counter. The backing file is created (or reset, if its layout differs) on first use.
+        :param filename: Path of the backing file (should be on tmpfs, e.g. /dev/shm)
+        """
+        self.filename = filename
+        self._mmap: mmap.mmap = None
+
+    def _get_mmap(self) -> mmap.mmap:
+        """
+        Lazily maps the backing file, so that each worker process opens its own mapping
+        :return:
+        """
+        if self._mmap is None:
+            fd = os.open(self.filename, os.O_RDWR | os.O_CREAT, 0o600)
+            try:
+                if os.fstat(fd).st_size != self.FILE_HEADER.size:
+                    os.ftruncate(fd, self.FILE_HEADER.size)
+                m = mmap.mmap(fd, self.FILE_HEADER.size, mmap.MAP_SHARED, mmap.PROT_READ | mmap.PROT_WRITE)
+            finally:
+                os.close(fd)
+
+            magic, _ = self.FILE_HEADER.unpack_from(m)
+            if magic != self.MAGIC:
+                self.FILE_HEADER.pack_into(m, 0, self.MAGIC, 0)
+
+            self._mmap = m
+        return self._mmap
+
+    @property
+    def value(self) -> int:
+        _, generation = self.FILE_HEADER.unpack_from(self._get_mmap())
+        return generation
+
+    def increment(self) -> int:
+        """
+        Increments the generation. Concurrent increments may be lost, but the generation still changes, which is all
+        readers check for.
+        :return: The new generation
+        """
+        m = self._get_mmap()
+        _, generation = self.FILE_HEADER.unpack_from(m)
+
+        generation += 1
+        self.FILE_HEADER.pack_into(m, 0, self.MAGIC, generation)
+        return generation
+
+    def close(self):
+        if self._mmap is not None:
+            self._mmap.close()
+            self._mmap = None
+
+
+class SharedGenerationLRUCache(LRUCache):
+    """
+    LRU cache whose entries are held per process, but which is cleared in every process sharing the generation file.
+    Each lookup compares the shared generation with the one the local entries were cached under, and drops them if it
+    has changed.
+    """
+
+    def __init__(self, max_size: int, filename: str, ttl: float=None, timer: Callable[[], float]=time.monotonic):
+        """
+        Initialise the cache
+        :param max_size: Maximum number of entries held before the least recently used entry is evicted
+        :param filename: Path of the shared generation file (should be on tmpfs, e.g. /dev/shm)
+        :param ttl: Time (in seconds) after which entries expire. Entries never expire if None or <= 0.
+        :param timer: Monotonic clock used to expire entries
+        """
+        super(SharedGenerationLRUCache, self).__init__(max_size, ttl=ttl, timer=timer)
+
+        self._generation = SharedGeneration(filename)
+        self._local_generation: int = None
+
+    @property
+    def filename(self) -> str:
+        return self._generation.filename
+
+    def _check_generation(self):
+        """
+        Drops local entries if the cache has been cleared by any process
+        :return:
+        """
+        generation = self._generation.value
+        if generation != self._local_generation:
+            super(SharedGenerationLRUCache, self).clear()
+            self._local_generation = generation
+
+    def get(self, key: Hashable, default: Any=None) -> Any:
+        self._check_generation()
+        return super(SharedGenerationLRUCache, self).get(key, default=default)
+
+    def set(self, key: Hashable, value: Any):
+        self._check_generation()
+        super(SharedGenerationLRUCache, self).set(key, value)
+
+    def clear(self):
+        """
+        Removes all entries from the cache (for all processes)
+        :return:
+        """
+        super(SharedGenerationLRUCache, self).clear()
+        self._local_generation = self._generation.increment()
+
+    def close(self):
+        self._generation.close()
+
+    def __contains__(self, key: Hashable) -> bool:
+        self._check_generation()
+        return super(SharedGenerationLRUCache, self).__contains__(key)
+
+    def __len__(self) -> int:
+        self._check_generation()
+        return super(SharedGenerationLRUCache, self).__len__()
+
+    def to_dict(self) -> dict:
+        """
+        Returns cache metrics
+        :return:
+        """
+        metrics = super(SharedGenerationLRUCache, self).to_dict()
+        metrics["generation"] = self._local_generation
+        metrics["filename"] = self.filename
+
+        return metrics
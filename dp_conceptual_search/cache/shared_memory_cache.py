@@ -0,0 +1,249 @@
+"""
+Implementation of a fixed size cache backed by a shared memory mapped file, allowing cached values to be shared between
+worker processes on the same host
+"""
+import os
+import json
+import mmap
+import time
+import zlib
+import struct
+import hashlib
+from typing import Any, Callable, Hashable, Optional, Tuple
+
+from dp_conceptual_search.cache.cache_stats import CacheStats
+
+
+def encode_key(key: Hashable) -> bytes:
+    """
+    Encodes a cache key as bytes. Keys must be JSON serialisable (tuples of str/int/float), so that every process
+    derives the same bytes for the same key.
+    :param key:
+    :return:
+    """
+    return json.dumps(key, separators=(",", ":")).encode("utf-8")
+
+
+class SharedMemoryCache(object):
+    """
+    Direct mapped cache stored in an mmap'd file. Each key hashes to exactly one fixed size slot, and a write to an
+    occupied slot replaces the existing entry. Slots carry a checksum, so a read racing a write in another process
+    (a torn write) is detected and treated as a miss.
+    """
+
+    MAGIC = b"DPCSC001"
+
+    # magic, number of slots, slot size
+    FILE_HEADER = struct.Struct("<8sII")
+
+    # key hash, expiry time, key length, value length, crc32 of key + value
+    SLOT_HEADER = struct.Struct("<QdIII")
+
+    def __init__(self, filename: str, num_slots: int, slot_size: int=4096, ttl: float=None,
+                 encoder: Callable[[Any], bytes]=None, decoder: Callable[[bytes], Any]=None,
+                 timer: Callable[[], float]=time.time):
+        """
+        Initialise the cache. The backing file is created (or reset, if its layout differs) on first use.
+        :param filename: Path of the backing file (should be on tmpfs, e.g. /dev/shm)
+        :param num_slots: Number of cache slots
+        :param slot_size: Size of each slot in bytes (entries which don't fit are not cached)
+        :param ttl: Time (in seconds) after which entries expire. Entries never expire if None or <= 0.
+        :param encoder: Encodes values as bytes (defaults to UTF-8 JSON)
+        :param decoder: Decodes bytes to values (defaults to UTF-8 JSON)
+        :param timer: Wall clock used to expire entries (must be consistent between processes)
+        """
+        if num_slots <= 0:
+            raise ValueError("Cache size must be greater than zero, got {0}".format(num_slots))
+        if slot_size <= self.SLOT_HEADER.size:
+            raise ValueError("Slot size must be greater than {0} bytes, got {1}".format(self.SLOT_HEADER.size,
+                                                                                       slot_size))
+
+        self.filename = filename
+        self.max_size = num_slots
+        self.slot_size = slot_size
+        self.ttl = ttl if ttl is not None and ttl > 0 else None
+
+        self._encoder = encoder if encoder is not None else lambda value: json.dumps(value).encode("utf-8")
+        self._decoder = decoder if decoder is not None else lambda data: json.loads(data.decode("utf-8"))
+        self._timer = timer
+
+        self._mmap: mmap.mmap = None
+
+        # Stats are tracked per process
+        self.stats = CacheStats()
+
+    @property
+    def file_size(self) -> int:
+        return self.FILE_HEADER.size + self.max_size * self.slot_size
+
+    def _get_mmap(self) -> mmap.mmap:
+        """
+        Lazily maps the backing file, so that each worker process opens its own mapping
+        :return:
+        """
+        if self._mmap is None:
+            fd = os.open(self.filename, os.O_RDWR | os.O_CREAT, 0o600)
+            try:
+                if os.fstat(fd).st_size != self.file_size:
+                    os.ftruncate(fd, self.file_size)
+                m = mmap.mmap(fd, self.file_size, mmap.MAP_SHARED, mmap.PROT_READ | mmap.PROT_WRITE)
+            finally:
+                os.close(fd)
+
+            header = self.FILE_HEADER.pack(self.MAGIC, self.max_size, self.slot_size)
+            if m[:self.FILE_HEADER.size] != header:
+                # New file, or one written with a different layout
+                m[:] = bytes(self.file_size)
+                m[:self.FILE_HEADER.size] = header
+
+            self._mmap = m
+        return self._mmap
+
+    @staticmethod
+    def _hash(key_bytes: bytes) -> int:
+        # Python's hash() is randomised per process, so use a stable digest
+        return int.from_bytes(hashlib.blake2b(key_bytes, digest_size=8).digest(), "little")
+
+    def _offset(self, key_hash: int) -> int:
+        return self.FILE_HEADER.size + (key_hash % self.max_size) * self.slot_size
+
+    def _read(self, key: Hashable) -> Tuple[Optional[bytes], bool]:
+        """
+        Reads the encoded value for the given key
+        :param key:
+        :return: Tuple of (encoded value or None, whether a matching entry had expired)
+        """
+        key_bytes = encode_key(key)
+        key_hash = self._hash(key_bytes)
+
+        m = self._get_mmap()
+        offset = self._offset(key_hash)
+
+        slot_hash, expires, key_length, value_length, crc = self.SLOT_HEADER.unpack_from(m, offset)
+        if slot_hash != key_hash or key_length + value_length > self.slot_size - self.SLOT_HEADER.size:
+            return None, False
+
+        start = offset + self.SLOT_HEADER.size
+        data = m[start:start + key_length + value_length]
+
+        if zlib.crc32(data) != crc or data[:key_length] != key_bytes:
+            # Torn write, or a hash collision
+            return None, False
+
+        if expires > 0 and expires <= self._timer():
+            return None, True
+
+        return data[key_length:], False
+
+    def get(self, key: Hashable, default: Any=None) -> Any:
+        """
+        Returns the cached value for the given key, or default if the key is missing, has expired or is corrupt
+        :param key:
+        :param default:
+        :return:
+        """
+        data, expired = self._read(key)
+
+        if data is None:
+            if expired:
+                self.stats.expirations += 1
+            self.stats.misses += 1
+            return default
+
+        self.stats.hits += 1
+        return self._decoder(data)
+
+    def set(self, key: Hashable, value: Any) -> bool:
+        """
+        Caches the given value, replacing any entry in the same slot
+        :param key:
+        :param value:
+        :return: False if the encoded entry is too large for a slot
+        """
+        key_bytes = encode_key(key)
+        key_hash = self._hash(key_bytes)
+
+        data = key_bytes + self._encoder(value)
+        if len(data) > self.slot_size - self.SLOT_HEADER.size:
+            return False
+
+        m = self._get_mmap()
+        offset = self._offset(key_hash)
+
+        slot_hash, expires, _, _, _ = self.SLOT_HEADER.unpack_from(m, offset)
+        if slot_hash not in (0, key_hash) and (expires <= 0 or expires > self._timer()):
+            self.stats.evictions += 1
+
+        expires = self._timer() + self.ttl if self.ttl is not None else 0.0
+
+        start = offset + self.SLOT_HEADER.size
+        m[start:start + len(data)] = data
+        self.SLOT_HEADER.pack_into(m, offset, key_hash, expires, len(key_bytes), len(data) - len(key_bytes),
+                                   zlib.crc32(data))
+        return True
+
+    def invalidate(self, key: Hashable) -> bool:
+        """
+        Removes a single entry from the cache
+        :param key:
+        :return: True if the entry existed
+        """
+        key_bytes = encode_key(key)
+        key_hash = self._hash(key_bytes)
+
+        m = self._get_mmap()
+        offset = self._offset(key_hash)
+
+        data, expired = self._read(key)
+        if data is None and not expired:
+            return False
+
+        m[offset:offset + self.SLOT_HEADER.size] = bytes(self.SLOT_HEADER.size)
+        return True
+
+    def clear(self):
+        """
+        Removes all entries from the cache (for all processes)
+        :return:
+        """
+        m = self._get_mmap()
+        m[self.FILE_HEADER.size:] = bytes(self.file_size - self.FILE_HEADER.size)
+
+    def close(self):
+        if self._mmap is not None:
+            self._mmap.close()
+            self._mmap = None
+
+    def __contains__(self, key: Hashable) -> bool:
+        data, _ = self._read(key)
+        return data is not None
+
+    def __len__(self) -> int:
+        """
+        Returns the number of occupied, unexpired slots (requires a scan of the cache)
+        :return:
+        """
+        m = self._get_mmap()
+        now = self._timer()
+
+        count = 0
+        for i in range(self.max_size):
+            slot_hash, expires, _, _, _ = self.SLOT_HEADER.unpack_from(m, self.FILE_HEADER.size + i * self.slot_size)
+            if slot_hash != 0 and (expires <= 0 or expires > now):
+                count += 1
+        return count
+
+    def to_dict(self) -> dict:
+        """
+        Returns cache metrics
+        :return:
+        """
+        metrics = {
+            "size": len(self),
+            "max_size": self.max_size,
+            "ttl": self.ttl,
+            "filename": self.filename
+        }
+        metrics.update(self.stats.to_dict())
+
+        return metrics
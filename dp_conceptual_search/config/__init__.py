@@ -4,5 +4,6 @@ CONFIG = Section("Global App Config")
 CONFIG.APP = APP_CONFIG
 CONFIG.API = API_CONFIG
 CONFIG.ML = ML_CONFIG
+CONFIG.FASTTEXT = FASTTEXT_CONFIG
 CONFIG.ELASTIC_SEARCH = ELASTIC_SEARCH_CONFIG
 CONFIG.SEARCH = SEARCH_CONFIG
@@ -44,18 +44,43 @@ API_CONFIG.testing = bool_env("TESTING", False)
 API_CONFIG.conceptual_search_enabled = bool_env("CONCEPTUAL_SEARCH_ENABLED", False)
 API_CONFIG.redirect_conceptual_search = bool_env("REDIRECT_CONCEPTUAL_SEARCH", False)
 API_CONFIG.recommended_search_enabled = bool_env("RECOMMENDED_SEARCH_ENABLED", False)
+API_CONFIG.admin_api_enabled = bool_env("ADMIN_API_ENABLED", False)
 
 # ML
 
 ML_CONFIG = Section("Machine Learning config")
 ML_CONFIG.unsupervised_model_filename = os.environ.get("UNSUPERVISED_MODEL_FILENAME",
                                                        "./dp_conceptual_search/ml/data/word2vec/ons_supervised.vec")
+ML_CONFIG.supervised_model_filename = os.environ.get("SUPERVISED_MODEL_FILENAME", None)
+ML_CONFIG.ann_index_directory = os.environ.get("ANN_INDEX_DIRECTORY", None)
+ML_CONFIG.ann_num_probes = int(os.environ.get("ANN_NUM_PROBES", 8))
+ML_CONFIG.ann_max_results = int(os.environ.get("ANN_MAX_RESULTS", 500))
+ML_CONFIG.spellcheck_index_filename = os.environ.get("SPELLCHECK_INDEX_FILENAME", None)
+ML_CONFIG.spellcheck_max_batch_size = int(os.environ.get("SPELLCHECK_MAX_BATCH_SIZE", 1000))
+ML_CONFIG.spellcheck_pool_size = int(os.environ.get("SPELLCHECK_POOL_SIZE", 2))
+ML_CONFIG.spellcheck_pool_min_tokens = int(os.environ.get("SPELLCHECK_POOL_MIN_TOKENS", 200))
+ML_CONFIG.spellcheck_pool_timeout = float(os.environ.get("SPELLCHECK_POOL_TIMEOUT", 10.0))
+ML_CONFIG.spellcheck_pool_max_pending = int(os.environ.get("SPELLCHECK_POOL_MAX_PENDING", 8))
+ML_CONFIG.spellcheck_cache_size = int(os.environ.get("SPELLCHECK_CACHE_SIZE", 10000))
+ML_CONFIG.executor_max_workers = int(os.environ.get("MODEL_EXECUTOR_MAX_WORKERS", 4))
+ML_CONFIG.executor_max_pending = int(os.environ.get("MODEL_EXECUTOR_MAX_PENDING", 32))
+ML_CONFIG.executor_timeout = float(os.environ.get("MODEL_EXECUTOR_TIMEOUT", 5.0))
 
 FASTTEXT_CONFIG = Section("FastText config")
 FASTTEXT_CONFIG.fasttext_host = os.environ.get("DP_FASTTEXT_HOST", "localhost")
 FASTTEXT_CONFIG.fasttext_port = int(os.environ.get("DP_FASTTEXT_PORT", 5100))
+FASTTEXT_CONFIG.inference_mode = os.environ.get("FASTTEXT_INFERENCE_MODE", "remote")
 FASTTEXT_CONFIG.num_labels = int(os.environ.get("FASTTEXT_NUM_LABELS", 5))
 FASTTEXT_CONFIG.threshold = float(os.environ.get("FASTTEXT_THRESHOLD", 0.0))
+FASTTEXT_CONFIG.pool_size = int(os.environ.get("FASTTEXT_POOL_SIZE", 8))
+FASTTEXT_CONFIG.pool_timeout = float(os.environ.get("FASTTEXT_POOL_TIMEOUT", 5.0))
+FASTTEXT_CONFIG.model_version = os.environ.get("FASTTEXT_MODEL_VERSION", "")
+FASTTEXT_CONFIG.cache_size = int(os.environ.get("FASTTEXT_CACHE_SIZE", 10000))
+FASTTEXT_CONFIG.cache_ttl = float(os.environ.get("FASTTEXT_CACHE_TTL", 3600.0))
+FASTTEXT_CONFIG.cache_backend = os.environ.get("FASTTEXT_CACHE_BACKEND", "memory")
+FASTTEXT_CONFIG.shared_cache_filename = os.environ.get("FASTTEXT_SHARED_CACHE_FILENAME",
+                                                       "/dev/shm/dp-conceptual-search-fasttext.cache")
+FASTTEXT_CONFIG.shared_cache_slot_size = int(os.environ.get("FASTTEXT_SHARED_CACHE_SLOT_SIZE", 4096))
 
 
 # Elasticsearch
@@ -75,3 +100,34 @@ SEARCH_CONFIG.departments_search_index = "departments"
 SEARCH_CONFIG.results_per_page = int(os.getenv("RESULTS_PER_PAGE", 10))
 SEARCH_CONFIG.max_visible_paginator_link = int(os.getenv("MAX_VISIBLE_PAGINATOR_LINK", 5))
 SEARCH_CONFIG.max_request_size = int(os.getenv("SEARCH_MAX_REQUEST_SIZE", 200))
+SEARCH_CONFIG.recommend_max_batch_size = int(os.getenv("RECOMMEND_MAX_BATCH_SIZE", 50))
+SEARCH_CONFIG.content_query_timeout = float(os.getenv("SEARCH_CONTENT_QUERY_TIMEOUT", 10.0))
+SEARCH_CONFIG.type_counts_query_timeout = float(os.getenv("SEARCH_TYPE_COUNTS_QUERY_TIMEOUT", 5.0))
+SEARCH_CONFIG.featured_result_query_timeout = float(os.getenv("SEARCH_FEATURED_RESULT_QUERY_TIMEOUT", 2.0))
+SEARCH_CONFIG.allow_partial_results = bool_env("SEARCH_ALLOW_PARTIAL_RESULTS", True)
+SEARCH_CONFIG.multi_search_enabled = bool_env("SEARCH_MULTI_SEARCH_ENABLED", True)
+SEARCH_CONFIG.combined_type_counts_enabled = bool_env("SEARCH_COMBINED_TYPE_COUNTS_ENABLED", True)
+SEARCH_CONFIG.content_search_type = os.getenv("SEARCH_CONTENT_SEARCH_TYPE", "dfs_query_then_fetch")
+SEARCH_CONFIG.type_counts_search_type = os.getenv("SEARCH_TYPE_COUNTS_SEARCH_TYPE", "query_then_fetch")
+SEARCH_CONFIG.featured_search_type = os.getenv("SEARCH_FEATURED_SEARCH_TYPE", "query_then_fetch")
+SEARCH_CONFIG.departments_search_type = os.getenv("SEARCH_DEPARTMENTS_SEARCH_TYPE", "dfs_query_then_fetch")
+SEARCH_CONFIG.recommend_search_type = os.getenv("SEARCH_RECOMMEND_SEARCH_TYPE", "dfs_query_then_fetch")
+SEARCH_CONFIG.content_request_cache = bool_env("SEARCH_CONTENT_REQUEST_CACHE", False)
+SEARCH_CONFIG.type_counts_request_cache = bool_env("SEARCH_TYPE_COUNTS_REQUEST_CACHE", True)
+SEARCH_CONFIG.featured_request_cache = bool_env("SEARCH_FEATURED_REQUEST_CACHE", True)
+SEARCH_CONFIG.sticky_preference_enabled = bool_env("SEARCH_STICKY_PREFERENCE_ENABLED", True)
+SEARCH_CONFIG.streaming_response_min_page_size = int(os.getenv("SEARCH_STREAMING_RESPONSE_MIN_PAGE_SIZE", 50))
+SEARCH_CONFIG.streaming_response_chunk_size = int(os.getenv("SEARCH_STREAMING_RESPONSE_CHUNK_SIZE", 16384))
+SEARCH_CONFIG.result_cache_size = int(os.getenv("SEARCH_RESULT_CACHE_SIZE", 1000))
+SEARCH_CONFIG.result_cache_ttl = float(os.getenv("SEARCH_RESULT_CACHE_TTL", 60.0))
+SEARCH_CONFIG.result_cache_generation_filename = os.getenv("SEARCH_RESULT_CACHE_GENERATION_FILENAME",
+                                                           "/dev/shm/dp-conceptual-search-results.generation")
+SEARCH_CONFIG.embedding_vector_dtype = os.getenv("EMBEDDING_VECTOR_DTYPE", ">f8")
+SEARCH_CONFIG.encoded_query_vectors = bool_env("ENCODED_QUERY_VECTORS_ENABLED", False)
+SEARCH_CONFIG.embedding_vector_cache_size = int(os.getenv("EMBEDDING_VECTOR_CACHE_SIZE", 10000))
+SEARCH_CONFIG.embedding_vector_cache_revalidate_after = float(os.getenv("EMBEDDING_VECTOR_CACHE_REVALIDATE_AFTER",
+                                                                        300.0))
+SEARCH_CONFIG.embedding_vector_shared_cache_size = int(os.getenv("EMBEDDING_VECTOR_SHARED_CACHE_SIZE", 0))
+SEARCH_CONFIG.embedding_vector_shared_cache_filename = os.getenv("EMBEDDING_VECTOR_SHARED_CACHE_FILENAME",
+                                                                 "/dev/shm/dp-conceptual-search-vectors.cache")
+SEARCH_CONFIG.embedding_vector_shared_cache_slot_size = int(os.getenv("EMBEDDING_VECTOR_SHARED_CACHE_SLOT_SIZE", 4096))
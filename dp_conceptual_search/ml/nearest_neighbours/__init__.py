@@ -0,0 +1 @@
+from dp_conceptual_search.ml.nearest_neighbours.ivf_index import IVFIndex
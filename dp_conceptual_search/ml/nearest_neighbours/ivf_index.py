@@ -0,0 +1,230 @@
+"""
+Implementation of an inverted file (IVF) approximate nearest neighbours index over document embedding vectors
+"""
+import os
+import numpy as np
+from numpy import ndarray
+from typing import Iterable, List, Tuple
+
+
+def normalise(vectors: ndarray) -> ndarray:
+    """
+    Returns float32 unit length copies of the given (row) vectors, so that dot products are cosine similarities. Zero
+    vectors are left as zero.
+    :param vectors:
+    :return:
+    """
+    vectors = np.array(vectors, dtype=np.float32, ndmin=2)
+    norms = np.linalg.norm(vectors, axis=1, keepdims=True)
+    norms[norms == 0.0] = 1.0
+
+    return vectors / norms
+
+
+def assign(vectors: ndarray, centroids: ndarray, batch_size: int=65536) -> ndarray:
+    """
+    Assigns each (normalised) vector to its most similar centroid. Vectors are processed in batches to bound memory.
+    :param vectors:
+    :param centroids:
+    :param batch_size:
+    :return:
+    """
+    assignments = np.empty(len(vectors), dtype=np.int64)
+    for start in range(0, len(vectors), batch_size):
+        batch = vectors[start:start + batch_size]
+        assignments[start:start + len(batch)] = np.argmax(batch @ centroids.T, axis=1)
+
+    return assignments
+
+
+def spherical_kmeans(vectors: ndarray, num_clusters: int, num_iterations: int=20, seed: int=None) -> ndarray:
+    """
+    Clusters (normalised) vectors by cosine similarity, returning normalised centroids
+    :param vectors:
+    :param num_clusters:
+    :param num_iterations:
+    :param seed:
+    :return:
+    """
+    if num_clusters <= 0 or num_clusters > len(vectors):
+        raise ValueError("Number of clusters must be between 1 and {0}, got {1}".format(len(vectors), num_clusters))
+
+    random_state = np.random.RandomState(seed)
+    centroids = vectors[random_state.choice(len(vectors), num_clusters, replace=False)]
+
+    for _ in range(num_iterations):
+        assignments = assign(vectors, centroids)
+
+        # Sum the vectors in each cluster
+        order = np.argsort(assignments, kind="mergesort")
+        counts = np.bincount(assignments, minlength=num_clusters)
+        starts = np.concatenate(([0], np.cumsum(counts)[:-1]))
+        non_empty = counts > 0
+
+        sums = np.zeros_like(centroids)
+        sums[non_empty] = np.add.reduceat(vectors[order], starts[non_empty], axis=0)
+
+        # Re-seed empty clusters with random vectors
+        num_empty = num_clusters - np.count_nonzero(non_empty)
+        if num_empty > 0:
+            sums[~non_empty] = vectors[random_state.choice(len(vectors), num_empty, replace=False)]
+
+        centroids = normalise(sums)
+
+    return centroids
+
+
+class IVFIndex(object):
+    """
+    Vectors are partitioned into lists by their nearest k-means centroid, and stored contiguously (normalised float32)
+    ordered by list. A query only scores the vectors in the lists of its num_probes nearest centroids. The index is
+    saved as .npy files, which are memory mapped on load so that the vectors are shared by all worker processes.
+    """
+
+    CENTROIDS = "centroids.npy"
+    VECTORS = "vectors.npy"
+    OFFSETS = "offsets.npy"
+    IDS = "ids.npy"
+
+    def __init__(self, centroids: ndarray, vectors: ndarray, offsets: ndarray, ids: ndarray):
+        """
+        Initialise the index
+        :param centroids: Normalised list centroids
+        :param vectors: Normalised vectors, ordered by list
+        :param offsets: Start of each list in vectors (with the total number of vectors appended)
+        :param ids: Document ids, in the same order as vectors
+        """
+        if len(offsets) != len(centroids) + 1 or len(ids) != len(vectors) or offsets[-1] != len(vectors):
+            raise ValueError("Inconsistent IVF index: {0} centroids, {1} offsets, {2} vectors and {3} ids".format(
+                len(centroids), len(offsets), len(vectors), len(ids)
+            ))
+
+        self.centroids = centroids
+        self.vectors = vectors
+        self.offsets = offsets
+        self.ids = ids
+
+    @property
+    def num_lists(self) -> int:
+        return len(self.centroids)
+
+    @property
+    def dimension(self) -> int:
+        return self.vectors.shape[1]
+
+    def __len__(self) -> int:
+        return len(self.vectors)
+
+    @classmethod
+    def build(cls, vectors: ndarray, ids: Iterable[str], num_lists: int, num_iterations: int=20,
+              sample_size: int=None, seed: int=None) -> 'IVFIndex':
+        """
+        Builds an index over the given vectors
+        :param vectors: 2D array of vectors
+        :param ids: Document id of each vector
+        :param num_lists: Number of k-means clusters (inverted lists)
+        :param num_iterations: Number of k-means iterations
+        :param sample_size: Max number of vectors to train the k-means centroids on (defaults to all vectors)
+        :param seed: Random seed
+        :return:
+        """
+        vectors = normalise(vectors)
+        ids = np.asarray(list(ids), dtype=str)
+
+        training_vectors = vectors
+        if sample_size is not None and sample_size < len(vectors):
+            sample = np.random.RandomState(seed).choice(len(vectors), sample_size, replace=False)
+            training_vectors = vectors[sample]
+
+        centroids = spherical_kmeans(training_vectors, num_lists, num_iterations=num_iterations, seed=seed)
+
+        # Partition the vectors into lists
+        assignments = assign(vectors, centroids)
+        order = np.argsort(assignments, kind="mergesort")
+        offsets = np.concatenate(([0], np.cumsum(np.bincount(assignments, minlength=num_lists)))).astype(np.int64)
+
+        return cls(centroids, vectors[order], offsets, ids[order])
+
+    def save(self, directory: str):
+        """
+        Saves the index to the given directory
+        :param directory:
+        :return:
+        """
+        os.makedirs(directory, exist_ok=True)
+
+        np.save(os.path.join(directory, self.CENTROIDS), self.centroids)
+        np.save(os.path.join(directory, self.VECTORS), self.vectors)
+        np.save(os.path.join(directory, self.OFFSETS), self.offsets)
+        np.save(os.path.join(directory, self.IDS), self.ids)
+
+    @classmethod
+    def load(cls, directory: str, mmap: bool=True) -> 'IVFIndex':
+        """
+        Loads an index from the given directory
+        :param directory:
+        :param mmap: Memory map the vectors and ids (read-only), rather than reading them into memory
+        :return:
+        """
+        mmap_mode = "r" if mmap else None
+
+        return cls(
+            np.load(os.path.join(directory, cls.CENTROIDS)),
+            np.load(os.path.join(directory, cls.VECTORS), mmap_mode=mmap_mode),
+            np.load(os.path.join(directory, cls.OFFSETS)),
+            np.load(os.path.join(directory, cls.IDS), mmap_mode=mmap_mode)
+        )
+
+    def search(self, vector: ndarray, k: int, num_probes: int=8, exclude: Iterable[str]=()) -> List[Tuple[str, float]]:
+        """
+        Returns the ids and cosine similarities of (approximately) the k vectors most similar to the given vector
+        :param vector:
+        :param k:
+        :param num_probes: Number of inverted lists to search (more probes improve recall, at the expense of latency)
+        :param exclude: Ids to exclude from the results
+        :return:
+        """
+        if k <= 0 or len(self) == 0:
+            return []
+
+        query = normalise(vector)[0]
+        if len(query) != self.dimension:
+            raise ValueError("Expected vector of dimension {0}, got {1}".format(self.dimension, len(query)))
+
+        # Find the nearest lists
+        centroid_similarities = self.centroids @ query
+        if 0 < num_probes < self.num_lists:
+            probes = np.argpartition(-centroid_similarities, num_probes - 1)[:num_probes]
+        else:
+            probes = np.arange(self.num_lists)
+
+        # Score the vectors in each probed list
+        indices = []
+        similarities = []
+        for probe in probes:
+            start, end = self.offsets[probe], self.offsets[probe + 1]
+            if end > start:
+                indices.append(np.arange(start, end))
+                similarities.append(self.vectors[start:end] @ query)
+
+        if len(indices) == 0:
+            return []
+
+        indices = np.concatenate(indices)
+        similarities = np.concatenate(similarities)
+
+        # Select the top k (plus any we might exclude)
+        exclude = set(exclude)
+        num_candidates = min(k + len(exclude), len(indices))
+        top = np.argpartition(-similarities, num_candidates - 1)[:num_candidates]
+        top = top[np.argsort(-similarities[top], kind="mergesort")]
+
+        results = []
+        for i in top:
+            doc_id = str(self.ids[indices[i]])
+            if doc_id not in exclude:
+                results.append((doc_id, float(similarities[i])))
+            if len(results) == k:
+                break
+
+        return results
@@ -0,0 +1,193 @@
+"""
+Corrects large batches of tokens in a pool of worker processes, so that batch spellcheck requests don't block the
+event loop. The pool forks its workers, so must be started before the app starts any threads: a lock held by another
+thread at the time of the fork (e.g a logging lock, or the spell checker cache lock) would never be released in the
+worker. Daemonic processes (such as the workers started by Sanic when SANIC_WORKERS > 1) are not allowed to have
+children, so the pool is disabled in them and batches are corrected in-process instead.
+"""
+import asyncio
+import logging
+import multiprocessing
+from multiprocessing.pool import Pool
+from typing import Callable, Dict, Iterable, List
+
+from dp_conceptual_search.config.config import ML_CONFIG
+from dp_conceptual_search.app.executor.bounded_executor import BoundedExecutor, ExecutorRejectedException, \
+    ExecutorTimeoutException
+from dp_conceptual_search.ml.spelling.spell_checker import SpellChecker, SpellCheckSuggestion
+
+# Spell checker of the current worker process (set by the pool initializer)
+_spell_checker: SpellChecker = None
+
+
+def _initialise_worker(spell_checker: SpellChecker):
+    """
+    Pool initializer. Worker processes are forked, so the spell checker (and its memory mapped index) is inherited
+    rather than pickled.
+    :param spell_checker:
+    :return:
+    """
+    global _spell_checker
+    _spell_checker = spell_checker
+
+
+def _correct_tokens(tokens: List[str]) -> Dict[str, SpellCheckSuggestion]:
+    return _spell_checker.correct_tokens(tokens)
+
+
+class SpellCheckPool(object):
+
+    def __init__(self, spell_checker: SpellChecker, processes: int=ML_CONFIG.spellcheck_pool_size,
+                 min_tokens: int=ML_CONFIG.spellcheck_pool_min_tokens, timeout: float=ML_CONFIG.spellcheck_pool_timeout,
+                 max_pending: int=ML_CONFIG.spellcheck_pool_max_pending, executor: BoundedExecutor=None):
+        """
+        Initialise the pool. Worker processes are started by start(), or for the first batch which needs them if the
+        pool hasn't been started.
+        :param spell_checker:
+        :param processes: Number of worker processes (batches are corrected in-process if zero)
+        :param min_tokens: Min number of unique tokens for a batch to be corrected in the pool. Smaller batches are
+        corrected in-process, as they're faster than the round trip to the pool.
+        :param timeout: Max time (seconds) to wait for a batch to be corrected in the pool
+        :param max_pending: Max number of batches being corrected in the pool. Further batches are rejected immediately.
+        :param executor: Optional executor used to correct smaller batches off the ioloop
+        """
+        self.spell_checker = spell_checker
+        self.processes = processes
+        self.min_tokens = min_tokens
+        self.timeout = timeout
+        self.max_pending = max_pending
+        self.executor = executor
+
+        self._pool: Pool = None
+
+        self._pending = 0
+        self._completed = 0
+        self._rejected = 0
+        self._timeouts = 0
+
+    @property
+    def pending(self) -> int:
+        return self._pending
+
+    def start(self):
+        """
+        Forks the worker processes (if the pool is enabled). Must be called before any threads are started. The pool is
+        disabled if the current process is daemonic, as it can't fork children of its own.
+        :return:
+        """
+        if self.processes > 0 and multiprocessing.current_process().daemon:
+            logging.warning("Spell check pool disabled in daemonic process, correcting batches in-process", extra={
+                "spellcheck_pool": {
+                    "processes": self.processes
+                }
+            })
+            self.processes = 0
+
+        if self.processes > 0:
+            self._get_pool()
+
+    def _get_pool(self) -> Pool:
+        if self._pool is None:
+            context = multiprocessing.get_context("fork")
+            self._pool = context.Pool(self.processes, initializer=_initialise_worker, initargs=(self.spell_checker,))
+        return self._pool
+
+    def _release(self):
+        self._pending -= 1
+        self._completed += 1
+
+    @staticmethod
+    def _apply(pool: Pool, tokens: List[str], on_done: Callable[[], None]) -> asyncio.Future:
+        """
+        Corrects the tokens in the pool, returning a future which is resolved on the event loop
+        :param pool:
+        :param tokens:
+        :param on_done: Called on the event loop once the worker process has finished, even if the future has been
+        cancelled (i.e timed out)
+        :return:
+        """
+        loop = asyncio.get_event_loop()
+        future = loop.create_future()
+
+        def set_result(result):
+            on_done()
+            if not future.done():
+                future.set_result(result)
+
+        def set_exception(exception):
+            on_done()
+            if not future.done():
+                future.set_exception(exception)
+
+        pool.apply_async(_correct_tokens, (tokens,),
+                         callback=lambda result: loop.call_soon_threadsafe(set_result, result),
+                         error_callback=lambda exception: loop.call_soon_threadsafe(set_exception, exception))
+
+        return future
+
+    async def correct_tokens(self, tokens: Iterable[str]) -> Dict[str, SpellCheckSuggestion]:
+        """
+        Returns the suggested corrections for the unique tokens, keyed on token. Tokens without a suggestion are
+        omitted.
+        :param tokens:
+        :return:
+        """
+        tokens = sorted(set(tokens))
+
+        if self.processes <= 0 or len(tokens) < self.min_tokens:
+            if self.executor is not None:
+                return await self.executor.run(self.spell_checker.correct_tokens, tokens)
+            return self.spell_checker.correct_tokens(tokens)
+
+        # Batches count as pending until every worker process has finished with them, so batches which time out still
+        # count towards max_pending
+        if self._pending >= self.max_pending:
+            self._rejected += 1
+            raise ExecutorRejectedException("spellcheck pool", self.max_pending)
+
+        # Split the tokens evenly between the worker processes
+        pool = self._get_pool()
+        chunks = [chunk for chunk in (tokens[i::self.processes] for i in range(self.processes)) if len(chunk) > 0]
+
+        remaining = len(chunks)
+
+        def on_chunk_done():
+            nonlocal remaining
+            remaining -= 1
+            if remaining == 0:
+                self._release()
+
+        self._pending += 1
+        futures = [self._apply(pool, chunk, on_chunk_done) for chunk in chunks]
+        try:
+            chunk_corrections = await asyncio.wait_for(asyncio.gather(*futures), timeout=self.timeout)
+        except asyncio.TimeoutError:
+            self._timeouts += 1
+            raise ExecutorTimeoutException("spellcheck pool", self.timeout)
+
+        result = {}
+        for corrections in chunk_corrections:
+            result.update(corrections)
+        return result
+
+    def to_dict(self) -> dict:
+        return {
+            "processes": self.processes,
+            "min_tokens": self.min_tokens,
+            "max_pending": self.max_pending,
+            "timeout": self.timeout,
+            "pending": self._pending,
+            "completed": self._completed,
+            "rejected": self._rejected,
+            "timeouts": self._timeouts
+        }
+
+    def close(self):
+        """
+        Terminates the worker processes
+        :return:
+        """
+        if self._pool is not None:
+            self._pool.terminate()
+            self._pool.join()
+            self._pool = None
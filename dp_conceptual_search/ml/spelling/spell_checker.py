@@ -1,9 +1,13 @@
 """
 Implementation of a spellchecker using word embedding models
 """
-from typing import Generator, List
+from threading import Lock
+from typing import Dict, Generator, Iterable, List, Optional
 from sortedcontainers import SortedSet
 
+from dp_conceptual_search.config.config import ML_CONFIG
+from dp_conceptual_search.cache.lru_cache import LRUCache
+from dp_conceptual_search.ml.spelling.symmetric_delete_index import SymmetricDeleteIndex
 from dp_conceptual_search.ml.word_embedding.fastText.unsupervised import UnsupervisedModel
 
 # Constant
@@ -32,13 +36,52 @@ class SpellChecker(object):
     Uses word embedding models to check the spelling of words and suggested corrections.
     """
 
-    def __init__(self, model: UnsupervisedModel):
+    def __init__(self, model: UnsupervisedModel, index: SymmetricDeleteIndex=None, use_index: bool=True,
+                 cache_size: int=ML_CONFIG.spellcheck_cache_size):
+        """
+        Initialise the spell checker
+        :param model:
+        :param index: Prebuilt symmetric delete index over the model vocabulary
+        :param use_index: Build a symmetric delete index (if none is given) to look up correction candidates, rather
+        than generating every single and double edit of each word
+        :param cache_size: Max number of token corrections to cache (disabled if zero)
+        """
+        self.use_index = use_index
+
+        # Corrections are looked up from executor threads, so the cache is guarded by a lock
+        self.cache: LRUCache = LRUCache(cache_size) if cache_size > 0 else None
+        self._cache_lock = Lock()
+
+        self.reload(model, index=index)
+
+    def reload(self, model: UnsupervisedModel, index: SymmetricDeleteIndex=None):
+        """
+        Replaces the model (and index), invalidating all cached corrections
+        :param model:
+        :param index: Prebuilt symmetric delete index over the new model vocabulary
+        :return:
+        """
         self.model: UnsupervisedModel = model
 
+        if index is None and self.use_index:
+            index = SymmetricDeleteIndex.build(self.vocabulary())
+        self.index: SymmetricDeleteIndex = index
+
+        if self.cache is not None:
+            with self._cache_lock:
+                self.cache.clear()
+
     @property
     def words(self) -> dict:
         return self.model.words
 
+    def vocabulary(self) -> List[str]:
+        """
+        Returns the model vocabulary, in rank order
+        :return:
+        """
+        return sorted(self.words, key=self.words.get)
+
     def correct_spelling(self, terms: List[str]) -> List[SpellCheckSuggestion]:
         """
         Returns a list of potential (best candidate) corrections, with their probabilities.
@@ -48,13 +91,39 @@ class SpellChecker(object):
         result = []
 
         for term in SortedSet(terms):
-            correction = self.correction(term)
-            if correction.lower() != term.lower():
-                probability = self.probability(correction)
-                if probability != 0:
-                    result.append(SpellCheckSuggestion(term, correction, probability))
+            suggestion = self.suggestion(term)
+            if suggestion is not None:
+                result.append(suggestion)
         return result
 
+    def correct_tokens(self, tokens: Iterable[str]) -> Dict[str, SpellCheckSuggestion]:
+        """
+        Returns the suggested corrections for (unique) tokens, keyed on token. Tokens without a suggestion are omitted.
+        :param tokens:
+        :return:
+        """
+        result = {}
+
+        for token in set(tokens):
+            suggestion = self.suggestion(token)
+            if suggestion is not None:
+                result[token] = suggestion
+        return result
+
+    def suggestion(self, term: str) -> Optional[SpellCheckSuggestion]:
+        """
+        Returns the best candidate correction for a single term, or None if the term is correct or the correction
+        isn't in the dictionary
+        :param term:
+        :return:
+        """
+        correction = self.correction(term)
+        if correction.lower() != term.lower():
+            probability = self.probability(correction)
+            if probability != 0:
+                return SpellCheckSuggestion(term, correction, probability)
+        return None
+
     def probability(self, word) -> float:
         """
         Probability of `word` being the correct substitution.
@@ -67,7 +136,25 @@ class SpellChecker(object):
         return num_words / (word_idx + num_words)
 
     def correction(self, word) -> str:
-        """ Most probable spelling correction for word. """
+        """
+        Most probable spelling correction for word. Corrections are cached, including words which are returned
+        unchanged (no correction).
+        """
+        if self.cache is None:
+            return self._correction(word)
+
+        with self._cache_lock:
+            correction = self.cache.get(word)
+
+        if correction is None:
+            correction = self._correction(word)
+            with self._cache_lock:
+                self.cache.set(word, correction)
+        return correction
+
+    def _correction(self, word) -> str:
+        if self.index is not None:
+            return self.index.correction(word)
         return max(self.candidates(word), key=self.probability)
 
     def candidates(self, word) -> set:
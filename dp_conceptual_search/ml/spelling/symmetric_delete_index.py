@@ -0,0 +1,275 @@
+"""
+Implementation of a symmetric delete (SymSpell) index for fast spelling correction candidate lookup
+"""
+import mmap
+import zlib
+import struct
+import numpy as np
+from numpy import ndarray
+from typing import Iterable, List, Sequence, Set, Tuple
+
+# Binary file format: header, then word offsets (uint32), UTF-8 encoded words, deletion keys (uint32) and word ids
+# (int32), each aligned to 8 bytes
+MAGIC = b"DPSPELL1"
+HEADER = struct.Struct("<8sIIQQQ")
+
+
+def deletes(word: str, max_distance: int) -> Set[str]:
+    """
+    Returns the word and all strings formed by deleting up to max_distance characters from it
+    :param word:
+    :param max_distance:
+    :return:
+    """
+    result = {word}
+    edits = {word}
+    for _ in range(max_distance):
+        edits = {edit[:i] + edit[i + 1:] for edit in edits for i in range(len(edit))}
+        result.update(edits)
+
+    return result
+
+
+def delete_key(delete: str) -> int:
+    """
+    Stable 32 bit hash of a deletion key (the same in every process, unlike hash())
+    :param delete:
+    :return:
+    """
+    return zlib.crc32(delete.encode("utf-8"))
+
+
+def osa_distance(a: str, b: str, max_distance: int) -> int:
+    """
+    Optimal string alignment (Damerau-Levenshtein with adjacent transpositions) distance between two strings, or
+    max_distance + 1 if the distance exceeds max_distance
+    :param a:
+    :param b:
+    :param max_distance:
+    :return:
+    """
+    if abs(len(a) - len(b)) > max_distance:
+        return max_distance + 1
+
+    previous_previous = None
+    previous = list(range(len(b) + 1))
+    for i in range(1, len(a) + 1):
+        current = [i] + [0] * len(b)
+        for j in range(1, len(b) + 1):
+            cost = 0 if a[i - 1] == b[j - 1] else 1
+            current[j] = min(previous[j] + 1, current[j - 1] + 1, previous[j - 1] + cost)
+            if i > 1 and j > 1 and a[i - 1] == b[j - 2] and a[i - 2] == b[j - 1]:
+                current[j] = min(current[j], previous_previous[j - 2] + 1)
+
+        if min(current) > max_distance:
+            return max_distance + 1
+        previous_previous, previous = previous, current
+
+    return min(previous[-1], max_distance + 1)
+
+
+def _aligned(offset: int) -> int:
+    return (offset + 7) & ~7
+
+
+class MappedWords(Sequence):
+    """
+    Read-only sequence of words, decoded on access from a buffer of UTF-8 encoded words and their offsets
+    """
+
+    def __init__(self, offsets: ndarray, data: ndarray):
+        self._offsets = offsets
+        self._data = data
+
+    def __len__(self) -> int:
+        return len(self._offsets) - 1
+
+    def __getitem__(self, i):
+        if isinstance(i, slice):
+            return [self[j] for j in range(*i.indices(len(self)))]
+        if i < 0:
+            i += len(self)
+        if i < 0 or i >= len(self):
+            raise IndexError("word index out of range")
+
+        return self._data[self._offsets[i]:self._offsets[i + 1]].tobytes().decode("utf-8")
+
+
+class SymmetricDeleteIndex(object):
+    """
+    Maps every string formed by deleting up to max_distance characters from (the prefix of) each vocabulary word to
+    the word. Candidates within max_distance of a query word share at least one deletion key with it, so lookups only
+    generate the deletions of the query word instead of every possible edit.
+    Deletion keys are stored as sorted 32 bit hashes with a parallel array of word ids, which is compact enough to
+    build over the whole vocabulary (hash collisions only add candidates, which are removed by the distance check).
+    """
+
+    def __init__(self, words: List[str], keys: ndarray, word_ids: ndarray, max_distance: int=2,
+                 prefix_length: int=7):
+        """
+        Initialise the index
+        :param words: Vocabulary, in rank order (most frequent first)
+        :param keys: Sorted deletion key hashes
+        :param word_ids: Index (in words) of the word for each deletion key
+        :param max_distance: Max edit distance of candidates
+        :param prefix_length: Number of leading characters of each word which are indexed
+        """
+        if len(keys) != len(word_ids):
+            raise ValueError("Inconsistent index: {0} keys and {1} word ids".format(len(keys), len(word_ids)))
+        if prefix_length <= max_distance:
+            raise ValueError("Prefix length must be greater than max distance")
+
+        self.words = words
+        self.keys = keys
+        self.word_ids = word_ids
+        self.max_distance = max_distance
+        self.prefix_length = prefix_length
+
+        # Memory map backing the index (if loaded from file)
+        self._mmap = None
+
+    def __len__(self) -> int:
+        return len(self.words)
+
+    def save(self, filename: str):
+        """
+        Writes the index (vocabulary in rank order and deletion keys) to a single binary file
+        :param filename:
+        :return:
+        """
+        encoded = [word.encode("utf-8") for word in self.words]
+        offsets = np.zeros(len(encoded) + 1, dtype=np.uint32)
+        offsets[1:] = np.cumsum([len(word) for word in encoded])
+        data = b"".join(encoded)
+
+        header = HEADER.pack(MAGIC, self.max_distance, self.prefix_length, len(encoded), len(data), len(self.keys))
+
+        with open(filename, "wb") as f:
+            for chunk in [header, offsets.tobytes(), data, self.keys.astype(np.uint32).tobytes(),
+                          self.word_ids.astype(np.int32).tobytes()]:
+                f.write(chunk)
+                f.write(b"\0" * (_aligned(f.tell()) - f.tell()))
+
+    @classmethod
+    def load(cls, filename: str) -> 'SymmetricDeleteIndex':
+        """
+        Memory maps (read-only) an index written by save. The pages are shared by all processes mapping the file.
+        :param filename:
+        :return:
+        """
+        with open(filename, "rb") as f:
+            buffer = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+
+        magic, max_distance, prefix_length, num_words, data_size, num_keys = HEADER.unpack_from(buffer)
+        if magic != MAGIC:
+            buffer.close()
+            raise ValueError("'{0}' is not a spellcheck index".format(filename))
+
+        offset = _aligned(HEADER.size)
+        offsets = np.frombuffer(buffer, dtype=np.uint32, count=num_words + 1, offset=offset)
+        offset = _aligned(offset + offsets.nbytes)
+        data = np.frombuffer(buffer, dtype=np.uint8, count=data_size, offset=offset)
+        offset = _aligned(offset + data.nbytes)
+        keys = np.frombuffer(buffer, dtype=np.uint32, count=num_keys, offset=offset)
+        offset = _aligned(offset + keys.nbytes)
+        word_ids = np.frombuffer(buffer, dtype=np.int32, count=num_keys, offset=offset)
+
+        index = cls(MappedWords(offsets, data), keys, word_ids, max_distance=max_distance,
+                    prefix_length=prefix_length)
+        index._mmap = buffer
+
+        return index
+
+    def matches_vocabulary(self, words: dict, num_samples: int=100) -> bool:
+        """
+        Checks that the index was built over the given (ranked) vocabulary, by comparing its size and the rank of a
+        sample of words
+        :param words: Mapping of word to rank
+        :param num_samples:
+        :return:
+        """
+        if len(self) != len(words):
+            return False
+
+        for word_id in np.linspace(0, len(self) - 1, min(num_samples, len(self)), dtype=np.int64):
+            if words.get(self.words[word_id]) != word_id:
+                return False
+
+        return True
+
+    @classmethod
+    def build(cls, words: Iterable[str], max_distance: int=2, prefix_length: int=7) -> 'SymmetricDeleteIndex':
+        """
+        Builds the index over the given vocabulary
+        :param words: Vocabulary, in rank order (most frequent first)
+        :param max_distance:
+        :param prefix_length:
+        :return:
+        """
+        words = list(words)
+
+        keys = []
+        word_ids = []
+        for word_id, word in enumerate(words):
+            word_keys = {delete_key(delete) for delete in deletes(word[:prefix_length], max_distance)}
+            keys.extend(word_keys)
+            word_ids.extend([word_id] * len(word_keys))
+
+        keys = np.asarray(keys, dtype=np.uint32)
+        word_ids = np.asarray(word_ids, dtype=np.int32)
+
+        order = np.argsort(keys, kind="mergesort")
+
+        return cls(words, keys[order], word_ids[order], max_distance=max_distance, prefix_length=prefix_length)
+
+    def candidate_ids(self, word: str) -> ndarray:
+        """
+        Returns the (unique) ids of words sharing a deletion key with the given word
+        :param word:
+        :return:
+        """
+        keys = np.fromiter((delete_key(delete) for delete in deletes(word[:self.prefix_length], self.max_distance)),
+                           dtype=np.uint32)
+
+        starts = np.searchsorted(self.keys, keys, side="left")
+        ends = np.searchsorted(self.keys, keys, side="right")
+
+        ranges = [self.word_ids[start:end] for start, end in zip(starts, ends) if end > start]
+        if len(ranges) == 0:
+            return np.empty(0, dtype=np.int32)
+
+        return np.unique(np.concatenate(ranges))
+
+    def lookup(self, word: str) -> List[Tuple[str, int]]:
+        """
+        Returns all vocabulary words within max_distance of the given word, with their distances, ordered by distance
+        and then rank
+        :param word:
+        :return:
+        """
+        results = []
+        for word_id in self.candidate_ids(word):
+            candidate = self.words[word_id]
+            distance = osa_distance(word, candidate, self.max_distance)
+            if distance <= self.max_distance:
+                results.append((distance, word_id, candidate))
+
+        results.sort()
+
+        return [(candidate, distance) for distance, _, candidate in results]
+
+    def correction(self, word: str) -> str:
+        """
+        Returns the closest, most frequent vocabulary word within max_distance of the given word, or the word itself if
+        there is no such word
+        :param word:
+        :return:
+        """
+        best = None
+        for word_id in self.candidate_ids(word):
+            candidate = self.words[word_id]
+            distance = osa_distance(word, candidate, self.max_distance)
+            if distance <= self.max_distance and (best is None or (distance, word_id) < best[:2]):
+                best = (distance, word_id, candidate)
+
+        return best[2] if best is not None else word
@@ -1 +1,2 @@
 from dp_conceptual_search.ml.word_embedding.fastText.unsupervised import UnsupervisedModel
+from dp_conceptual_search.ml.word_embedding.fastText.supervised import SupervisedModel
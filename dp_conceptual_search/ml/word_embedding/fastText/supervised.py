@@ -0,0 +1,49 @@
+"""
+This file defines classes and methods for working with supervised fastText models.
+Loading supervised (.bin) models requires the (optional) fastText python bindings.
+"""
+from numpy import ndarray
+from typing import List, Tuple
+
+try:
+    import fastText as fasttext
+except ImportError:
+    try:
+        import fasttext
+    except ImportError:
+        fasttext = None
+
+
+class SupervisedModel(object):
+
+    LABEL_PREFIX = "__label__"
+
+    def __init__(self, filename: str):
+        if fasttext is None:
+            raise ImportError("The fastText python bindings are required to load supervised models")
+
+        self.filename = filename
+        self.model = fasttext.load_model(filename)
+
+    def get_sentence_vector(self, text: str) -> ndarray:
+        """
+        Returns the sentence vector for the given text
+        :param text:
+        :return:
+        """
+        return self.model.get_sentence_vector(text)
+
+    def predict(self, text: str, k: int=1, threshold: float=0.0) -> Tuple[List[str], List[float]]:
+        """
+        Predicts the top k labels (and their probabilities) for the given text
+        :param text:
+        :param k: Max number of labels to return
+        :param threshold: Min probability of returned labels
+        :return:
+        """
+        labels, probabilities = self.model.predict(text, k=k, threshold=threshold)
+
+        # Strip the label prefix, to match labels returned by dp-fasttext
+        labels = [label[len(self.LABEL_PREFIX):] if label.startswith(self.LABEL_PREFIX) else label
+                  for label in labels]
+        return labels, list(probabilities)
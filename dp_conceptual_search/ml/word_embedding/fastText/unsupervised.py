@@ -2,7 +2,9 @@
 This file defines classes and methods for working with unsupervised fastText models.
 We use the excellent gensim package for working with such models.
 """
+import numpy as np
 from numpy import ndarray
+from typing import Optional
 from gensim.models.keyedvectors import Word2VecKeyedVectors
 
 
@@ -28,6 +30,19 @@ class UnsupervisedModel(object):
         """
         return self.model.word_vec(word, use_norm=use_norm)
 
+    def sentence_vector(self, sentence: str) -> Optional[ndarray]:
+        """
+        Returns the average of the word vectors of all in-vocabulary words in the given (cleaned) sentence, or None if
+        no words are in the vocabulary
+        :param sentence:
+        :return:
+        """
+        vectors = [self.word_vec(word) for word in sentence.split() if word in self.words]
+
+        if len(vectors) == 0:
+            return None
+        return np.mean(vectors, axis=0)
+
     def similar_by_word(self, word: str, top_n: int=10, return_similarity=False, **kwargs) -> list:
         """
         Returns similar terms (and optionally, their similarity) to the given word.
@@ -1,2 +1,4 @@
+from .fasttext_service import FastTextService, FastTextInferenceMode
 from .fasttext_client import FastTextClientService
+from .local_fasttext_service import LocalFastTextService
 from .conceptual_search_engine import ConceptualSearchEngine
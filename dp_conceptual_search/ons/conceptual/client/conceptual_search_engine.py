@@ -4,35 +4,66 @@ Implementation of conceptual search client
 import logging
 from uuid import uuid4
 from numpy import ndarray
-from typing import List, Tuple
+from typing import List, Optional, Tuple
 
-from elasticsearch_dsl.response.hit import Hit
-
-from dp_fasttext.client import Client
-from dp_fasttext.ml.utils import clean_string, replace_nouns_with_singulars, decode_float_list, encode_float_list
+from dp_fasttext.ml.utils import clean_string, replace_nouns_with_singulars
 
 from dp_conceptual_search.log import logger
+from dp_conceptual_search.config.config import SEARCH_CONFIG
 
 from dp_conceptual_search.search.search_type import SearchType
+from dp_conceptual_search.search.query_helper import normalise_uri
+from dp_conceptual_search.search.vector_encoding import decode_vector
+from dp_conceptual_search.search.client.exceptions import DocumentNotFoundException
 from dp_conceptual_search.search.dsl.vector_script_score import VectorScriptScore
 
 from dp_conceptual_search.ons.search import SortField, ContentType
 from dp_conceptual_search.ons.search.exceptions import InvalidUsage
 from dp_conceptual_search.ons.search.fields import AvailableFields, Field
 from dp_conceptual_search.ons.search.client.search_engine import SearchEngine
-from dp_conceptual_search.ons.search.response.client.ons_response import ONSResponse
 from dp_conceptual_search.ons.search.queries.ons_query_builders import build_type_counts_query
 from dp_conceptual_search.ons.search.exceptions import MalformedSearchTerm, UnknownSearchVector
 
+from dp_conceptual_search.ons.conceptual.client.fasttext_service import FastTextService
 from dp_conceptual_search.ons.conceptual.client.fasttext_client import FastTextClientService
+from dp_conceptual_search.ons.conceptual.client.conceptual_search_params_cache import ConceptualSearchParamsCache
+from dp_conceptual_search.ons.conceptual.client.embedding_vector_cache import (
+    EmbeddingVectorCache, CachedEmbeddingVector
+)
 from dp_conceptual_search.ons.conceptual.queries.ons_query_builders import build_content_query
 
 
 class ConceptualSearchEngine(SearchEngine):
 
-    CONNECTION_HEADER = "Connection"
-    CONNECTION_CLOSE = "close"
     EMBEDDING_VECTOR: Field = AvailableFields.EMBEDDING_VECTOR.value
+    LAST_REVISED: Field = AvailableFields.LAST_REVISED.value
+
+    def __init__(self, fasttext: FastTextService=None, cache: ConceptualSearchParamsCache=None,
+                 embedding_vector_cache: EmbeddingVectorCache=None, **kwargs):
+        """
+        Initialise the conceptual search engine
+        :param fasttext: Service providing fastText inference (defaults to un-pooled dp-fasttext clients)
+        :param cache: Optional cache of conceptual search params (labels and search vectors)
+        :param embedding_vector_cache: Optional cache of document embedding vectors (by uri)
+        :param kwargs: Additional arguments for the SearchEngine
+        """
+        super(ConceptualSearchEngine, self).__init__(**kwargs)
+
+        self._fasttext = fasttext if fasttext is not None else FastTextClientService()
+        self._cache = cache
+        self._embedding_vector_cache = embedding_vector_cache
+
+    def _clone(self):
+        """
+        Clones the search engine, preserving the fastText service and caches
+        :return:
+        """
+        s: ConceptualSearchEngine = super(ConceptualSearchEngine, self)._clone()
+        s._fasttext = self._fasttext
+        s._cache = self._cache
+        s._embedding_vector_cache = self._embedding_vector_cache
+
+        return s
 
     def vector_script_score(self, vector: ndarray) -> VectorScriptScore:
         """
@@ -40,13 +71,16 @@ class ConceptualSearchEngine(SearchEngine):
         :param vector:
         :return:
         """
-        return VectorScriptScore(self.EMBEDDING_VECTOR.name, vector, cosine=True)
+        return VectorScriptScore(self.EMBEDDING_VECTOR.name, vector, cosine=True,
+                                 encoded=SEARCH_CONFIG.encoded_query_vectors)
 
     def content_query(self, search_term: str, current_page: int, size: int,
                       sort_by: SortField = SortField.relevance,
                       highlight: bool = True,
                       filter_functions: List[ContentType] = None,
                       type_filters: List[ContentType] = None,
+                      search_type: SearchType = None,
+                      request_cache: bool = None,
                       **kwargs):
         """
         Builds the ONS conceptual search content query, responsible for populating the SERP
@@ -57,6 +91,8 @@ class ConceptualSearchEngine(SearchEngine):
         :param highlight:
         :param filter_functions: content types to generate filter scores for (content type boosting)
         :param type_filters: content types to filter in query
+        :param search_type: Elasticsearch search_type (defaults to SEARCH_CONTENT_SEARCH_TYPE)
+        :param request_cache: Use the shard request cache (defaults to SEARCH_CONTENT_REQUEST_CACHE)
         :param kwargs:
         :return:
         """
@@ -72,6 +108,8 @@ class ConceptualSearchEngine(SearchEngine):
                                                                      highlight=highlight,
                                                                      filter_functions=filter_functions,
                                                                      type_filters=type_filters,
+                                                                     search_type=search_type,
+                                                                     request_cache=request_cache,
                                                                      **kwargs)
 
         labels: List[str] = kwargs.get("labels", None)
@@ -87,20 +125,27 @@ class ConceptualSearchEngine(SearchEngine):
         # Build the query
         query = build_content_query(search_term, labels, vector_script_score)
 
-        # Build the content query
-        s: ConceptualSearchEngine = self._clone() \
+        if search_type is None:
+            search_type = SearchType(SEARCH_CONFIG.content_search_type)
+        if request_cache is None:
+            request_cache = SEARCH_CONFIG.content_request_cache
+
+        # Build the content query (on a single copy of the search engine)
+        s: ConceptualSearchEngine = self.builder() \
             .query(query) \
             .paginate(current_page, size) \
-            .search_type(SearchType.DFS_QUERY_THEN_FETCH) \
+            .search_type(search_type) \
             .exclude_fields_from_source(self.EMBEDDING_VECTOR)
 
         if type_filters is not None:
             s: ConceptualSearchEngine = s.type_filter(type_filters)
 
+        s: ConceptualSearchEngine = self.apply_cache_hints(s, search_term, request_cache)
+
         if highlight:
             s: SearchEngine = s.apply_highlight_fields()
 
-        return s
+        return s.build()
 
     def type_counts_query(self, search_term, type_filters: List[ContentType] = None, **kwargs):
         """
@@ -120,7 +165,9 @@ class ConceptualSearchEngine(SearchEngine):
                                                        type_filters=type_filters,
                                                        highlight=False,
                                                        labels=labels,
-                                                       search_vector=search_vector)
+                                                       search_vector=search_vector,
+                                                       search_type=SearchType(SEARCH_CONFIG.type_counts_search_type),
+                                                       request_cache=SEARCH_CONFIG.type_counts_request_cache)
 
         # Build the aggregations
         aggregations = build_type_counts_query()
@@ -130,54 +177,105 @@ class ConceptualSearchEngine(SearchEngine):
 
         return s
 
-    async def embedding_vector_for_uri(self, uri: str) -> ndarray:
+    async def _source_for_uri(self, uri: str, fields: List[Field]) -> dict:
         """
-        Returns the embedding vector for the page at the given uri
+        Fetches the given fields of the page at the given uri, using a document GET
         :param uri:
+        :param fields:
         :return:
         """
-        # First, build the query
-        s: ConceptualSearchEngine = self.match_by_uri(uri)
+        source: dict = await self.get_source(normalise_uri(uri), source_include=[field.name for field in fields])
 
-        # Execute the query
-        response: ONSResponse = await s.execute()
+        if source is None:
+            raise DocumentNotFoundException(normalise_uri(uri), self._get_document_index())
+        return source
 
-        # Check we got back exactly 1 hit
-        if len(response) != 1:
-            raise Exception("Expected exactly one hit for uri '{0}', got {1}".format(uri, len(response)))
+    @classmethod
+    def _last_revised(cls, source: dict) -> Optional[str]:
+        """
+        Returns the lastRevised date from a document _source (None if not set)
+        :param source:
+        :return:
+        """
+        value = source
+        for key in cls.LAST_REVISED.name.split("."):
+            if not isinstance(value, dict):
+                return None
+            value = value.get(key)
 
-        # Get the hit
-        hit: Hit = response[0]
-        # Convert to dict
-        hit_dict: dict = hit.to_dict()
+        return value
 
-        # Get the embedding vector
-        if self.EMBEDDING_VECTOR.name not in hit_dict:
+    @classmethod
+    def _embedding_vector(cls, uri: str, source: dict) -> ndarray:
+        """
+        Decodes the embedding vector from a document _source
+        :param uri:
+        :param source:
+        :return:
+        """
+        if cls.EMBEDDING_VECTOR.name not in source:
             raise IndexError("Embedding vector field '{0}' not found in hit for uri '{1}'".format(
-                self.EMBEDDING_VECTOR.name, uri
+                cls.EMBEDDING_VECTOR.name, uri
             ))
 
-        encoded_embedding_vector: str = hit_dict.get(self.EMBEDDING_VECTOR.name)
+        encoded_embedding_vector: str = source.get(cls.EMBEDDING_VECTOR.name)
         if not isinstance(encoded_embedding_vector, str):
             raise Exception("Expected string embedding vector, got '{0}'".format(type(encoded_embedding_vector)))
 
-        # Decode the string
-        return decode_float_list(encoded_embedding_vector)
+        # Decode the string (zero-copy)
+        return decode_vector(encoded_embedding_vector)
 
-    def get_fasttext_headers(self, context: str):
+    async def last_revised_for_uri(self, uri: str) -> Optional[str]:
         """
-        Build and return headers for fasttext client
-        :param context:
+        Returns the lastRevised date of the page at the given uri
+        :param uri:
         :return:
         """
-        return {
-            Client.REQUEST_ID_HEADER: context,
-            self.CONNECTION_HEADER: self.CONNECTION_CLOSE
-        }
+        source: dict = await self._source_for_uri(uri, [self.LAST_REVISED])
+
+        return self._last_revised(source)
+
+    async def _fetch_embedding_vector_for_uri(self, uri: str) -> Tuple[ndarray, Optional[str]]:
+        """
+        Fetches the embedding vector and lastRevised date of the page at the given uri
+        :param uri:
+        :return:
+        """
+        source: dict = await self._source_for_uri(uri, [self.EMBEDDING_VECTOR, self.LAST_REVISED])
+
+        return self._embedding_vector(uri, source), self._last_revised(source)
+
+    async def embedding_vector_for_uri(self, uri: str) -> ndarray:
+        """
+        Returns the embedding vector for the page at the given uri. If a cache is configured, only cache misses and
+        revalidation of stale entries (fetching just the lastRevised date) require a request to Elasticsearch.
+        :param uri:
+        :return:
+        """
+        uri = normalise_uri(uri)
+
+        if self._embedding_vector_cache is not None:
+            entry: CachedEmbeddingVector = self._embedding_vector_cache.get(uri)
+
+            if entry is not None:
+                if self._embedding_vector_cache.is_fresh(entry):
+                    return entry.vector
+
+                # Check the page hasn't changed since the vector was cached
+                last_revised = await self.last_revised_for_uri(uri)
+                if self._embedding_vector_cache.revalidate(uri, entry, last_revised):
+                    return entry.vector
+
+        embedding_vector, last_revised = await self._fetch_embedding_vector_for_uri(uri)
+
+        if self._embedding_vector_cache is not None:
+            self._embedding_vector_cache.set(uri, embedding_vector, last_revised)
+
+        return embedding_vector
 
     async def similar_by_vector(self, vector: ndarray, num_labels: int, **kwargs) -> list:
         """
-        Initialises a fasttext client and makes a HTTP request to get words similar by vector
+        Gets words similar by vector from dp-fasttext (or the local fastText model)
         :param vector:
         :param num_labels:
         :return:
@@ -185,22 +283,12 @@ class ConceptualSearchEngine(SearchEngine):
         # Get request context
         context: str = kwargs.get("context", str(uuid4()))
 
-        client: Client
-        async with FastTextClientService.get_fasttext_client() as client:
-            # Encode vector
-            encoded_vector = encode_float_list(vector)
-
-            # Build request context header
-            headers = self.get_fasttext_headers(context)
-
-            similar_words = await client.unsupervised.similar_by_vector(encoded_vector, num_labels, headers=headers)
-
-            return similar_words
+        return await self._fasttext.similar_by_vector(vector, num_labels, context)
 
     async def conceptual_search_params(self, search_term: str, num_labels: int, threshold: float, **kwargs) -> \
             Tuple[List[str], ndarray]:
         """
-        Queries external fasttext server for labels and search vector
+        Queries fastText for labels and search vector
         :param search_term:
         :param num_labels:
         :param threshold:
@@ -209,27 +297,31 @@ class ConceptualSearchEngine(SearchEngine):
         # Get/generate request context
         context = kwargs.get("context", str(uuid4()))
 
-        # Initialise dp-fasttext client
-        client: Client
-        async with FastTextClientService.get_fasttext_client() as client:
-            # Build request context header
-            headers = self.get_fasttext_headers(context)
+        # First, clean the search term and replace all nouns with singulars
+        clean_search_term = replace_nouns_with_singulars(clean_string(search_term))
 
-            # First, clean the search term and replace all nouns with singulars
-            clean_search_term = replace_nouns_with_singulars(clean_string(search_term))
+        if len(clean_search_term) == 0:
+            logger.error(context, "cleaned search term is empty")
+            raise MalformedSearchTerm(search_term)
 
-            if len(clean_search_term) == 0:
-                logger.error(context, "cleaned search term is empty")
-                raise MalformedSearchTerm(search_term)
+        # Check the cache before querying dp-fasttext
+        if self._cache is not None:
+            params = self._cache.get(clean_search_term, num_labels, threshold)
+            if params is not None:
+                logger.debug(context, "Conceptual search params cache hit", extra={
+                    "query": search_term
+                })
+                return params
 
-            # Get search vector from dp-fasttext
-            search_vector: ndarray = await client.supervised.get_sentence_vector(clean_search_term, headers=headers)
+        # Get the search vector and keyword labels from dp-fasttext (or the local fastText model)
+        search_vector, labels = await self._fasttext.sentence_vector_and_labels(clean_search_term, search_term,
+                                                                                num_labels, threshold, context)
 
-            if search_vector is None:
-                logger.error(context, "Unable to retrieve search vector for query '{0}'".format(search_term))
-                raise UnknownSearchVector(search_term)
+        if search_vector is None:
+            logger.error(context, "Unable to retrieve search vector for query '{0}'".format(search_term))
+            raise UnknownSearchVector(search_term)
 
-            # Get keyword labels and their probabilities from dp-fasttext
-            labels, probabilities = await client.supervised.predict(search_term, num_labels, threshold, headers=headers)
+        if self._cache is not None:
+            self._cache.set(clean_search_term, num_labels, threshold, labels, search_vector)
 
-            return labels, search_vector
\ No newline at end of file
+        return labels, search_vector
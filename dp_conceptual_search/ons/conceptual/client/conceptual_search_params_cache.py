@@ -0,0 +1,147 @@
+"""
+Caches the keyword labels and search vector returned by dp-fasttext for (cleaned) search terms
+"""
+import json
+import struct
+import numpy as np
+from numpy import ndarray
+from typing import List, Optional, Tuple
+
+from dp_conceptual_search.cache import CacheBackend, LRUCache, SharedMemoryCache
+from dp_conceptual_search.config.config import FASTTEXT_CONFIG
+
+# Byte order and type of search vectors stored in the shared memory cache
+VECTOR_DTYPE = np.dtype("<f8")
+LABELS_LENGTH = struct.Struct("<I")
+
+
+def encode_params(params: Tuple[Tuple[str], ndarray]) -> bytes:
+    """
+    Encodes (labels, search vector) as bytes for the shared memory cache
+    :param params:
+    :return:
+    """
+    labels, search_vector = params
+    labels_bytes = json.dumps(list(labels)).encode("utf-8")
+
+    return LABELS_LENGTH.pack(len(labels_bytes)) + labels_bytes + search_vector.astype(VECTOR_DTYPE).tobytes()
+
+
+def decode_params(data: bytes) -> Tuple[Tuple[str], ndarray]:
+    """
+    Decodes (labels, search vector) from the shared memory cache
+    :param data:
+    :return:
+    """
+    labels_length, = LABELS_LENGTH.unpack_from(data)
+    start = LABELS_LENGTH.size
+
+    labels = json.loads(data[start:start + labels_length].decode("utf-8"))
+    # np.frombuffer returns a read-only view of the bytes
+    search_vector = np.frombuffer(data, dtype=VECTOR_DTYPE, offset=start + labels_length)
+
+    return tuple(labels), search_vector
+
+
+class ConceptualSearchParamsCache(object):
+
+    def __init__(self, max_size: int=FASTTEXT_CONFIG.cache_size, ttl: float=FASTTEXT_CONFIG.cache_ttl,
+                 model_version: str=FASTTEXT_CONFIG.model_version, backend: str=FASTTEXT_CONFIG.cache_backend,
+                 **kwargs):
+        """
+        Bounded cache of conceptual search params. Entries are keyed on the fastText model version, so a change of
+        model invalidates the cache.
+        :param max_size: Maximum number of cached search terms
+        :param ttl: Time (in seconds) after which entries expire
+        :param model_version: Version of the fastText model being queried
+        :param backend: Cache backend - 'memory' (per process LRU) or 'shared' (shared memory, shared by all workers)
+        :param kwargs: Additional arguments for the backing cache
+        """
+        self.backend = CacheBackend(backend)
+
+        if self.backend is CacheBackend.SHARED:
+            kwargs.setdefault("filename", FASTTEXT_CONFIG.shared_cache_filename)
+            kwargs.setdefault("slot_size", FASTTEXT_CONFIG.shared_cache_slot_size)
+
+            self._cache = SharedMemoryCache(num_slots=max_size, ttl=ttl, encoder=encode_params,
+                                            decoder=decode_params, **kwargs)
+        else:
+            self._cache = LRUCache(max_size, ttl=ttl, **kwargs)
+        self._model_version = model_version
+
+    @property
+    def model_version(self) -> str:
+        return self._model_version
+
+    @model_version.setter
+    def model_version(self, model_version: str):
+        """
+        Sets the fastText model version. Keys include the model version, so entries for other versions are never
+        served. The per-process cache is cleared if a previously set version has changed, to free their memory, but
+        the shared cache never is, as other workers may already be filling it for the new version.
+        :param model_version:
+        :return:
+        """
+        if self.backend is CacheBackend.MEMORY and self._model_version and model_version != self._model_version:
+            self._cache.clear()
+        self._model_version = model_version
+
+    @property
+    def stats(self):
+        return self._cache.stats
+
+    def key(self, clean_search_term: str, num_labels: int, threshold: float) -> tuple:
+        """
+        Builds the cache key. Note the search term should already have been cleaned, so that trivially different
+        queries share a cache entry.
+        :param clean_search_term:
+        :param num_labels:
+        :param threshold:
+        :return:
+        """
+        return self.model_version, clean_search_term, num_labels, threshold
+
+    def get(self, clean_search_term: str, num_labels: int, threshold: float) -> Optional[Tuple[List[str], ndarray]]:
+        """
+        Returns the cached (labels, search vector) pair, or None
+        :param clean_search_term:
+        :param num_labels:
+        :param threshold:
+        :return:
+        """
+        params = self._cache.get(self.key(clean_search_term, num_labels, threshold))
+        if params is None:
+            return None
+
+        labels, search_vector = params
+        return list(labels), search_vector
+
+    def set(self, clean_search_term: str, num_labels: int, threshold: float, labels: List[str],
+            search_vector: ndarray):
+        """
+        Caches the (labels, search vector) pair. The vector is copied and marked read-only, as it is shared between
+        requests.
+        :param clean_search_term:
+        :param num_labels:
+        :param threshold:
+        :param labels:
+        :param search_vector:
+        :return:
+        """
+        search_vector = search_vector.copy()
+        search_vector.flags.writeable = False
+
+        self._cache.set(self.key(clean_search_term, num_labels, threshold), (tuple(labels), search_vector))
+
+    def clear(self):
+        self._cache.clear()
+
+    def __len__(self) -> int:
+        return len(self._cache)
+
+    def to_dict(self) -> dict:
+        metrics = self._cache.to_dict()
+        metrics["model_version"] = self.model_version
+        metrics["backend"] = self.backend.value
+
+        return metrics
@@ -0,0 +1,169 @@
+"""
+Caches document embedding vectors by uri, so that recommendation queries don't need to fetch them from Elasticsearch
+"""
+import json
+import time
+import struct
+import numpy as np
+from numpy import ndarray
+from typing import Callable, NamedTuple, Optional
+
+from dp_conceptual_search.cache import LRUCache, SharedMemoryCache
+from dp_conceptual_search.config.config import SEARCH_CONFIG
+
+HEADER_LENGTH = struct.Struct("<I")
+
+
+class CachedEmbeddingVector(NamedTuple):
+    vector: ndarray
+    last_revised: Optional[str]
+    validated: float
+
+
+def encode_entry(entry: CachedEmbeddingVector) -> bytes:
+    """
+    Encodes a cached embedding vector as bytes for the shared store
+    :param entry:
+    :return:
+    """
+    header = json.dumps([entry.last_revised, entry.validated]).encode("utf-8")
+    vector = np.ascontiguousarray(entry.vector, dtype=SEARCH_CONFIG.embedding_vector_dtype)
+
+    return HEADER_LENGTH.pack(len(header)) + header + vector.tobytes()
+
+
+def decode_entry(data: bytes) -> CachedEmbeddingVector:
+    """
+    Decodes a cached embedding vector from the shared store
+    :param data:
+    :return:
+    """
+    header_length, = HEADER_LENGTH.unpack_from(data)
+    start = HEADER_LENGTH.size
+
+    last_revised, validated = json.loads(data[start:start + header_length].decode("utf-8"))
+    # np.frombuffer returns a read-only view of the bytes
+    vector = np.frombuffer(data, dtype=SEARCH_CONFIG.embedding_vector_dtype, offset=start + header_length)
+
+    return CachedEmbeddingVector(vector, last_revised, validated)
+
+
+class EmbeddingVectorCache(object):
+
+    def __init__(self, max_size: int=SEARCH_CONFIG.embedding_vector_cache_size,
+                 revalidate_after: float=SEARCH_CONFIG.embedding_vector_cache_revalidate_after,
+                 shared_store_size: int=SEARCH_CONFIG.embedding_vector_shared_cache_size,
+                 timer: Callable[[], float]=time.time, **kwargs):
+        """
+        Bounded cache of document embedding vectors, keyed on uri. Each entry records the lastRevised date of the
+        document. Entries older than revalidate_after are revalidated against the current lastRevised date, and are
+        invalidated if the document has changed.
+        The per process LRU cache can be backed by a shared memory store, shared by all workers on the host, which
+        keeps vectors warm across worker restarts.
+        :param max_size: Maximum number of vectors in the LRU cache
+        :param revalidate_after: Time (in seconds) after which entries must be revalidated
+        :param shared_store_size: Number of slots in the shared memory store (disabled if zero)
+        :param timer: Wall clock used to revalidate entries (must be consistent between processes)
+        :param kwargs: Additional arguments for the shared memory store
+        """
+        self._cache = LRUCache(max_size)
+        self.revalidate_after = revalidate_after
+        self._timer = timer
+
+        self._shared_store = None
+        if shared_store_size > 0:
+            kwargs.setdefault("filename", SEARCH_CONFIG.embedding_vector_shared_cache_filename)
+            kwargs.setdefault("slot_size", SEARCH_CONFIG.embedding_vector_shared_cache_slot_size)
+
+            self._shared_store = SharedMemoryCache(num_slots=shared_store_size, encoder=encode_entry,
+                                                   decoder=decode_entry, timer=timer, **kwargs)
+
+        self.revalidations = 0
+        self.invalidations = 0
+
+    @property
+    def stats(self):
+        return self._cache.stats
+
+    def get(self, uri: str) -> Optional[CachedEmbeddingVector]:
+        """
+        Returns the cached embedding vector for the given uri, or None. Callers should check is_fresh before using the
+        returned entry.
+        :param uri:
+        :return:
+        """
+        entry: CachedEmbeddingVector = self._cache.get(uri)
+
+        if entry is None and self._shared_store is not None:
+            entry = self._shared_store.get(uri)
+            if entry is not None:
+                self._cache.set(uri, entry)
+
+        return entry
+
+    def is_fresh(self, entry: CachedEmbeddingVector) -> bool:
+        """
+        Returns True if the entry was validated less than revalidate_after seconds ago
+        :param entry:
+        :return:
+        """
+        return entry.validated + self.revalidate_after > self._timer()
+
+    def set(self, uri: str, vector: ndarray, last_revised: Optional[str]) -> CachedEmbeddingVector:
+        """
+        Caches the embedding vector for the given uri. The vector is marked read-only, as it is shared between requests.
+        :param uri:
+        :param vector:
+        :param last_revised:
+        :return:
+        """
+        if vector.flags.writeable:
+            vector = vector.copy()
+            vector.flags.writeable = False
+
+        entry = CachedEmbeddingVector(vector, last_revised, self._timer())
+
+        self._cache.set(uri, entry)
+        if self._shared_store is not None:
+            self._shared_store.set(uri, entry)
+
+        return entry
+
+    def revalidate(self, uri: str, entry: CachedEmbeddingVector, last_revised: Optional[str]) -> bool:
+        """
+        Revalidates the entry against the current lastRevised date of the document
+        :param uri:
+        :param entry:
+        :param last_revised:
+        :return: True if the entry is still valid, otherwise it's invalidated
+        """
+        if last_revised != entry.last_revised:
+            self.invalidations += 1
+            self.invalidate(uri)
+            return False
+
+        self.revalidations += 1
+        self.set(uri, entry.vector, last_revised)
+        return True
+
+    def invalidate(self, uri: str):
+        self._cache.invalidate(uri)
+        if self._shared_store is not None:
+            self._shared_store.invalidate(uri)
+
+    def clear(self):
+        self._cache.clear()
+        if self._shared_store is not None:
+            self._shared_store.clear()
+
+    def __len__(self) -> int:
+        return len(self._cache)
+
+    def to_dict(self) -> dict:
+        metrics = self._cache.to_dict()
+        metrics["revalidate_after"] = self.revalidate_after
+        metrics["revalidations"] = self.revalidations
+        metrics["invalidations"] = self.invalidations
+        metrics["shared_store"] = self._shared_store.to_dict() if self._shared_store is not None else None
+
+        return metrics
@@ -0,0 +1 @@
+from .fasttext_pool_timeout_exception import FastTextPoolTimeoutException
@@ -0,0 +1,8 @@
+from sanic.exceptions import ServiceUnavailable
+
+
+class FastTextPoolTimeoutException(ServiceUnavailable):
+    def __init__(self, pool_size, timeout):
+        super(FastTextPoolTimeoutException, self).__init__("Timed out waiting for a dp-fasttext client after {timeout}s "
+                                                           "[pool_size={pool_size}]"
+                                                           .format(timeout=timeout, pool_size=pool_size))
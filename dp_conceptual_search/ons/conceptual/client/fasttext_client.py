@@ -1,12 +1,206 @@
 """
-Provides methods for initialising dp-fasttext HTTP client
+Provides methods for initialising dp-fasttext HTTP clients, and an app scoped pool of persistent clients
 """
+import asyncio
+import logging
+from numpy import ndarray
+from typing import List, Optional, Tuple
+
 from dp_fasttext.client import Client
+from dp_fasttext.ml.utils import encode_float_list
 
 from dp_conceptual_search.config.config import FASTTEXT_CONFIG
+from dp_conceptual_search.ons.conceptual.client.exceptions import FastTextPoolTimeoutException
+from dp_conceptual_search.ons.conceptual.client.fasttext_service import FastTextService, FastTextInferenceMode
+
+
+class PooledClientContext(object):
+    """
+    Async context manager which checks a client out of the pool on enter, and returns it on exit
+    """
+    def __init__(self, service: 'FastTextClientService'):
+        self._service = service
+        self._client = None
+
+    async def __aenter__(self) -> Client:
+        self._client = await self._service.checkout()
+        return self._client
+
+    async def __aexit__(self, exc_type, exc_val, exc_tb):
+        self._service.checkin(self._client)
+        self._client = None
+
+
+class FastTextClientService(FastTextService):
+
+    def __init__(self, pool_size: int=FASTTEXT_CONFIG.pool_size, pool_timeout: float=FASTTEXT_CONFIG.pool_timeout):
+        """
+        Service providing dp-fasttext clients. Once initialised, clients are taken from a bounded pool of persistent
+        clients (which keep their connections alive between requests), otherwise a new client is created per use.
+        :param pool_size: Number of persistent clients in the pool
+        :param pool_timeout: Max time (in seconds) to wait for a client to become available
+        """
+        self.pool_size = pool_size
+        self.pool_timeout = pool_timeout
+
+        # Pairs of (client, entered client context)
+        self._clients: List[Tuple[Client, Client]] = []
+        self._available: asyncio.Queue = None
 
+        # Pool metrics
+        self._acquired = 0
+        self._waited = 0
+        self._timeouts = 0
+
+    @property
+    def mode(self) -> FastTextInferenceMode:
+        return FastTextInferenceMode.REMOTE
 
-class FastTextClientService(object):
     @staticmethod
     def get_fasttext_client() -> Client:
         return Client(FASTTEXT_CONFIG.fasttext_host, FASTTEXT_CONFIG.fasttext_port)
+
+    @staticmethod
+    def get_headers(context: str) -> dict:
+        """
+        Build and return headers for fasttext client
+        :param context:
+        :return:
+        """
+        return {
+            Client.REQUEST_ID_HEADER: context
+        }
+
+    @property
+    def initialised(self) -> bool:
+        """
+        Returns True if the client pool has been initialised
+        :return:
+        """
+        return self._available is not None
+
+    async def initialise(self):
+        """
+        Initialises the pool of persistent clients. Must be called once the ioloop exists.
+        :return:
+        """
+        available = asyncio.Queue(maxsize=self.pool_size)
+
+        for i in range(self.pool_size):
+            client = FastTextClientService.get_fasttext_client()
+            # Enter the client context once, and keep it open for the lifetime of the pool
+            entered = await client.__aenter__()
+
+            self._clients.append((client, entered))
+            available.put_nowait(entered)
+
+        self._available = available
+
+    def acquire(self):
+        """
+        Returns an async context manager yielding a dp-fasttext client, taken from the pool if initialised
+        :return:
+        """
+        if not self.initialised:
+            return FastTextClientService.get_fasttext_client()
+        return PooledClientContext(self)
+
+    async def checkout(self) -> Client:
+        """
+        Takes a client from the pool, waiting (up to the pool timeout) for one to become available
+        :return:
+        """
+        self._acquired += 1
+
+        if self._available.empty():
+            self._waited += 1
+
+            try:
+                return await asyncio.wait_for(self._available.get(), timeout=self.pool_timeout)
+            except asyncio.TimeoutError:
+                self._timeouts += 1
+                raise FastTextPoolTimeoutException(self.pool_size, self.pool_timeout)
+
+        return self._available.get_nowait()
+
+    def checkin(self, client: Client):
+        """
+        Returns a client to the pool
+        :param client:
+        :return:
+        """
+        # Clients returned after shutdown are simply dropped
+        if client is not None and self.initialised:
+            self._available.put_nowait(client)
+
+    @property
+    def metrics(self) -> dict:
+        """
+        Returns usage metrics for the client pool
+        :return:
+        """
+        available = self._available.qsize() if self.initialised else 0
+
+        return {
+            "pool_size": self.pool_size,
+            "available": available,
+            "in_use": self.pool_size - available if self.initialised else 0,
+            "acquired": self._acquired,
+            "waited": self._waited,
+            "timeouts": self._timeouts
+        }
+
+    async def sentence_vector_and_labels(self, clean_search_term: str, search_term: str, num_labels: int,
+                                         threshold: float, context: str) -> Tuple[Optional[ndarray], List[str]]:
+        """
+        Queries dp-fasttext for the search vector and keyword labels
+        :param clean_search_term:
+        :param search_term:
+        :param num_labels:
+        :param threshold:
+        :param context:
+        :return:
+        """
+        headers = self.get_headers(context)
+
+        client: Client
+        async with self.acquire() as client:
+            # Neither request depends on the other, so issue them concurrently
+            search_vector, (labels, probabilities) = await asyncio.gather(
+                client.supervised.get_sentence_vector(clean_search_term, headers=headers),
+                client.supervised.predict(search_term, num_labels, threshold, headers=headers)
+            )
+
+        return search_vector, labels
+
+    async def similar_by_vector(self, vector: ndarray, num_labels: int, context: str) -> List[str]:
+        """
+        Makes a HTTP request to dp-fasttext to get words similar by vector
+        :param vector:
+        :param num_labels:
+        :param context:
+        :return:
+        """
+        headers = self.get_headers(context)
+
+        client: Client
+        async with self.acquire() as client:
+            return await client.unsupervised.similar_by_vector(encode_float_list(vector), num_labels, headers=headers)
+
+    async def shutdown(self):
+        """
+        Triggers clean shutdown of all pooled clients
+        :return:
+        """
+        logging.info("Triggering clean shutdown of dp-fasttext client pool", extra={
+            "metrics": self.metrics
+        })
+
+        clients = self._clients
+        self._clients = []
+        self._available = None
+
+        for client, entered in clients:
+            await client.__aexit__(None, None, None)
+
+        logging.info("Shutdown complete")
@@ -0,0 +1,90 @@
+"""
+Defines the interface for services which provide fastText inference (sentence vectors, labels and similar words)
+"""
+import abc
+import asyncio
+from enum import Enum
+from numpy import ndarray
+from typing import List, Optional, Tuple
+
+from dp_conceptual_search.config.config import FASTTEXT_CONFIG
+
+
+class FastTextInferenceMode(Enum):
+    REMOTE = "remote"  # Inference via HTTP requests to dp-fasttext
+    LOCAL = "local"  # In-process inference using locally loaded models
+
+
+class FastTextService(abc.ABC):
+
+    @property
+    @abc.abstractmethod
+    def mode(self) -> FastTextInferenceMode:
+        pass
+
+    @property
+    def model_version(self) -> str:
+        """
+        Returns the version of the fastText model(s) used for inference. Cached conceptual search params and search
+        results are keyed on this value. By default this is the deploy-time FASTTEXT_MODEL_VERSION.
+        :return:
+        """
+        return FASTTEXT_CONFIG.model_version
+
+    async def initialise(self):
+        """
+        Initialises the service. Called once the ioloop exists.
+        :return:
+        """
+        pass
+
+    async def shutdown(self):
+        """
+        Triggers clean shutdown of the service
+        :return:
+        """
+        pass
+
+    @property
+    def metrics(self) -> dict:
+        """
+        Returns usage metrics for the service
+        :return:
+        """
+        return {}
+
+    @abc.abstractmethod
+    async def sentence_vector_and_labels(self, clean_search_term: str, search_term: str, num_labels: int,
+                                         threshold: float, context: str) -> Tuple[Optional[ndarray], List[str]]:
+        """
+        Returns the sentence vector (or None, if one couldn't be computed) and keyword labels for a search term
+        :param clean_search_term: Cleaned search term, used to compute the sentence vector
+        :param search_term: Raw search term, used to predict labels
+        :param num_labels: Max number of labels to return
+        :param threshold: Min probability of returned labels
+        :param context: Request context
+        :return:
+        """
+        pass
+
+    @abc.abstractmethod
+    async def similar_by_vector(self, vector: ndarray, num_labels: int, context: str) -> List[str]:
+        """
+        Returns words similar to the given vector
+        :param vector:
+        :param num_labels: Number of similar words to return
+        :param context: Request context
+        :return:
+        """
+        pass
+
+    async def similar_by_vectors(self, vectors: List[ndarray], num_labels: int, context: str) -> List[List[str]]:
+        """
+        Returns words similar to each of the given vectors. By default a request is issued for each vector
+        concurrently, services which support batch inference should override this.
+        :param vectors:
+        :param num_labels: Number of similar words to return (per vector)
+        :param context: Request context
+        :return:
+        """
+        return list(await asyncio.gather(*[self.similar_by_vector(vector, num_labels, context) for vector in vectors]))
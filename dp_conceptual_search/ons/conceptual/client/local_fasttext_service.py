@@ -0,0 +1,148 @@
+"""
+Provides in-process fastText inference, avoiding HTTP requests to dp-fasttext
+"""
+import os
+import asyncio
+import hashlib
+from numpy import ndarray
+from typing import List, Optional, Tuple
+
+from dp_conceptual_search.app.executor.bounded_executor import BoundedExecutor
+from dp_conceptual_search.ml.word_embedding.fastText import UnsupervisedModel, SupervisedModel
+from dp_conceptual_search.ons.conceptual.client.fasttext_service import FastTextService, FastTextInferenceMode
+
+
+class LocalFastTextService(FastTextService):
+
+    def __init__(self, unsupervised_model: UnsupervisedModel, supervised_model: SupervisedModel=None,
+                 executor: BoundedExecutor=None):
+        """
+        Service providing fastText inference using locally loaded models. If a supervised model is supplied it is
+        used for sentence vectors and label prediction, otherwise sentence vectors are computed by averaging word
+        vectors of the unsupervised model, and the most similar words are used as labels.
+        :param unsupervised_model:
+        :param supervised_model:
+        :param executor: Optional bounded executor to run inference in (the default ioloop executor is used if None)
+        """
+        self.unsupervised_model = unsupervised_model
+        self.supervised_model = supervised_model
+        self.executor = executor
+
+        self._model_version: str = None
+
+    @property
+    def mode(self) -> FastTextInferenceMode:
+        return FastTextInferenceMode.LOCAL
+
+    @property
+    def model_version(self) -> str:
+        """
+        Returns a fingerprint of the loaded model files (computed on initialise), so that a change of model invalidates
+        cached search params and results
+        :return:
+        """
+        return self._model_version
+
+    def _model_files_fingerprint(self) -> str:
+        """
+        Hashes the path, size and modification time of each model file. Models are multi-GB, so reading their contents
+        on every worker start would be too slow.
+        :return:
+        """
+        digest = hashlib.sha1()
+
+        models = [self.unsupervised_model, self.supervised_model]
+        for model in models:
+            if model is None:
+                continue
+
+            stat = os.stat(model.filename)
+            fingerprint = "{path}:{size}:{mtime}\n".format(path=os.path.abspath(model.filename), size=stat.st_size,
+                                                           mtime=stat.st_mtime_ns)
+            digest.update(fingerprint.encode("utf-8"))
+
+        return digest.hexdigest()
+
+    async def initialise(self):
+        """
+        Fingerprints the model files to derive the model version
+        :return:
+        """
+        self._model_version = self._model_files_fingerprint()
+
+    @property
+    def metrics(self) -> dict:
+        return {
+            "mode": self.mode.value,
+            "model_version": self.model_version,
+            "unsupervised_model": self.unsupervised_model.filename,
+            "supervised_model": self.supervised_model.filename if self.supervised_model is not None else None
+        }
+
+    async def run_in_executor(self, fn, *args):
+        """
+        Runs the (CPU bound) inference function off the ioloop
+        :param fn:
+        :param args:
+        :return:
+        """
+        if self.executor is not None:
+            return await self.executor.run(fn, *args)
+
+        loop = asyncio.get_event_loop()
+        return await loop.run_in_executor(None, fn, *args)
+
+    def _sentence_vector_and_labels(self, clean_search_term: str, search_term: str, num_labels: int,
+                                    threshold: float) -> Tuple[Optional[ndarray], List[str]]:
+        if self.supervised_model is not None:
+            search_vector = self.supervised_model.get_sentence_vector(clean_search_term)
+            labels, probabilities = self.supervised_model.predict(search_term, k=num_labels, threshold=threshold)
+
+            return search_vector, labels
+
+        search_vector = self.unsupervised_model.sentence_vector(clean_search_term)
+        if search_vector is None:
+            return None, []
+
+        similar_words = self.unsupervised_model.similar_by_vector(search_vector, top_n=num_labels,
+                                                                  return_similarity=True)
+        labels = [word for word, similarity in similar_words if similarity >= threshold]
+
+        return search_vector, labels
+
+    async def sentence_vector_and_labels(self, clean_search_term: str, search_term: str, num_labels: int,
+                                         threshold: float, context: str) -> Tuple[Optional[ndarray], List[str]]:
+        """
+        Computes the search vector and keyword labels in-process
+        :param clean_search_term:
+        :param search_term:
+        :param num_labels:
+        :param threshold:
+        :param context:
+        :return:
+        """
+        return await self.run_in_executor(self._sentence_vector_and_labels, clean_search_term, search_term,
+                                          num_labels, threshold)
+
+    async def similar_by_vector(self, vector: ndarray, num_labels: int, context: str) -> List[str]:
+        """
+        Returns words similar to the given vector using the unsupervised model
+        :param vector:
+        :param num_labels:
+        :param context:
+        :return:
+        """
+        return await self.run_in_executor(self.unsupervised_model.similar_by_vector, vector, num_labels)
+
+    def _similar_by_vectors(self, vectors: List[ndarray], num_labels: int) -> List[List[str]]:
+        return [self.unsupervised_model.similar_by_vector(vector, num_labels) for vector in vectors]
+
+    async def similar_by_vectors(self, vectors: List[ndarray], num_labels: int, context: str) -> List[List[str]]:
+        """
+        Returns words similar to each of the given vectors, in a single executor call
+        :param vectors:
+        :param num_labels:
+        :param context:
+        :return:
+        """
+        return await self.run_in_executor(self._similar_by_vectors, vectors, num_labels)
@@ -11,6 +11,8 @@ from dp_conceptual_search.search.dsl.function_score import FunctionScore
 from dp_conceptual_search.ons.search.fields import AvailableFields, Field
 from dp_conceptual_search.search.dsl.vector_script_score import VectorScriptScore
 from dp_conceptual_search.search.dsl.date_decay_function import date_decay_function
+from dp_conceptual_search.search.dsl.raw_query import RawQuery
+from dp_conceptual_search.search.dsl.query_template import QueryTemplate, Placeholder
 
 
 # Build a date decay function to promote recent releases
@@ -18,43 +20,36 @@ date_function = date_decay_function(AvailableFields.RELEASE_DATE.value.name,
                                     "exp", "365d", "30d", decay=0.95)
 
 
+# Precompile the keyword label match query
+keywords_query_template = QueryTemplate(Q.MultiMatch(**{
+    "query": Placeholder("label"),
+    "fields": [AvailableFields.KEYWORDS_RAW.value.name,
+               AvailableFields.SEARCH_BOOST.value.name,
+               AvailableFields.TITLE.value.name,
+               AvailableFields.SUMMARY.value.name]
+}).to_dict())
+
+
 def word_vector_keywords_query(labels: List[str]) -> Q.Query:
     """
     Build a bool query to match against generated keyword labels
     :param labels:
     :return:
     """
-    # Use the raw keywords field for matching
-    field: Field = AvailableFields.KEYWORDS_RAW.value
-
-    # Remove _ from labels
-    labels = [label.replace("_", " ") for label in labels]
-
-    # Build the individual match queries
-    match_queries = [Q.MultiMatch(**{
-        "query": label,
-        "fields": [field.name,
-                   AvailableFields.SEARCH_BOOST.value.name,
-                   AvailableFields.TITLE.value.name,
-                   AvailableFields.SUMMARY.value.name]
-    }) for label in labels]
+    # Remove _ from labels, and build the individual match queries
+    match_queries = [RawQuery(keywords_query_template.render(label=label.replace("_", " "))) for label in labels]
 
     return Q.Bool(should=match_queries)
 
 
-def build_content_query(search_term: str, labels: List[str], search_vector_script: VectorScriptScore) -> Q.Query:
+def _build_content_query(content_query: Q.Query, wv_keywords_query: Q.Query, script_score_dict) -> Q.Query:
     """
-    Defines the ONS conceptual search content query
-    :param search_term:
-    :param labels:
-    :param search_vector_script:
+    Builds the ONS conceptual search content query DSL
+    :param content_query:
+    :param wv_keywords_query:
+    :param script_score_dict:
     :return:
     """
-    wv_keywords_query = word_vector_keywords_query(labels)
-
-    # Build function scores
-    script_score_dict = search_vector_script.to_dict()
-
     # Generate additional word vector keywords query
     additional_keywords_query = FunctionScore(
         query=wv_keywords_query,
@@ -72,7 +67,7 @@ def build_content_query(search_term: str, labels: List[str], search_vector_scrip
 
     # Build the original content query
     dis_max_query = FunctionScore(
-        query=ons_query_builders.build_content_query(search_term),
+        query=content_query,
         functions=[boost_script.to_dict()],
         boost_mode=BoostMode.REPLACE.value
     )
@@ -88,3 +83,25 @@ def build_content_query(search_term: str, labels: List[str], search_vector_scrip
         functions=[date_function.to_dict()],
         boost_mode=BoostMode.MULTIPLY.value
     )
+
+
+# Precompile the conceptual content query (including the date decay function), so that only the original content
+# query, keywords query and search vector script are substituted per request
+content_query_template = QueryTemplate(_build_content_query(RawQuery(Placeholder("content_query")),
+                                                            RawQuery(Placeholder("keywords_query")),
+                                                            Placeholder("script_score")).to_dict())
+
+
+def build_content_query(search_term: str, labels: List[str], search_vector_script: VectorScriptScore) -> Q.Query:
+    """
+    Defines the ONS conceptual search content query
+    :param search_term:
+    :param labels:
+    :param search_vector_script:
+    :return:
+    """
+    return RawQuery(content_query_template.render(
+        content_query=ons_query_builders.content_query_template.render(search_term=search_term),
+        keywords_query=word_vector_keywords_query(labels).to_dict(),
+        script_score=search_vector_script.to_dict()
+    ))
@@ -1,20 +1,131 @@
 """
 Defines the search engine for recommendation queries
 """
+import asyncio
+from uuid import uuid4
 from numpy import ndarray
+from typing import List, Tuple, Union
 
 from elasticsearch_dsl import query as Q
 
+from dp_conceptual_search.config.config import ML_CONFIG, SEARCH_CONFIG
+
 from dp_conceptual_search.search.search_type import SearchType
+from dp_conceptual_search.search.query_helper import normalise_uri
 from dp_conceptual_search.search.dsl.vector_script_score import VectorScriptScore
+from dp_conceptual_search.search.client.exceptions import DocumentNotFoundException
+
+from dp_conceptual_search.ml.nearest_neighbours import IVFIndex
+from dp_conceptual_search.app.executor.bounded_executor import BoundedExecutor
 
 from dp_conceptual_search.ons.search.sort_fields import SortField
-from dp_conceptual_search.ons.recommend.queries.ons_query_builders import similar_to_uri
+from dp_conceptual_search.ons.recommend.queries.ons_query_builders import similar_to_uri, similar_by_ids
 from dp_conceptual_search.ons.conceptual.client.conceptual_search_engine import ConceptualSearchEngine
+from dp_conceptual_search.ons.conceptual.client.embedding_vector_cache import CachedEmbeddingVector
 
 
 class RecommendationSearchEngine(ConceptualSearchEngine):
 
+    def __init__(self, ann_index: IVFIndex=None, executor: BoundedExecutor=None, **kwargs):
+        """
+        Initialise the recommendation search engine
+        :param ann_index: Optional approximate nearest neighbours index of document embedding vectors. If supplied,
+        similar documents are found using the index rather than the binary_vector_score script.
+        :param executor: Optional bounded executor to search the ANN index in (the default ioloop executor is used if
+        None)
+        :param kwargs: Additional arguments for the ConceptualSearchEngine
+        """
+        super(RecommendationSearchEngine, self).__init__(**kwargs)
+
+        self._ann_index = ann_index
+        self._executor = executor
+
+    def _clone(self):
+        """
+        Clones the search engine, preserving the ANN index and executor
+        :return:
+        """
+        s: RecommendationSearchEngine = super(RecommendationSearchEngine, self)._clone()
+        s._ann_index = self._ann_index
+        s._executor = self._executor
+
+        return s
+
+    async def run_in_executor(self, fn, *args):
+        """
+        Runs fn(*args) in the bounded executor (or the default ioloop executor if None)
+        :param fn:
+        :param args:
+        :return:
+        """
+        if self._executor is not None:
+            return await self._executor.run(fn, *args)
+
+        loop = asyncio.get_event_loop()
+        return await loop.run_in_executor(None, fn, *args)
+
+    def _nearest_neighbours_batch(self, uris: List[str], vectors: List[ndarray],
+                                  k: int) -> List[List[Tuple[str, float]]]:
+        return [self._ann_index.search(vector, k, num_probes=ML_CONFIG.ann_num_probes, exclude=[normalise_uri(uri)])
+                for uri, vector in zip(uris, vectors)]
+
+    async def nearest_neighbours(self, uri: str, vector: ndarray, k: int) -> List[Tuple[str, float]]:
+        """
+        Returns the ids and similarities of the k documents nearest to the given vector, excluding the given uri
+        :param uri:
+        :param vector:
+        :param k:
+        :return:
+        """
+        similar_lists = await self.nearest_neighbours_batch([uri], [vector], k)
+        return similar_lists[0]
+
+    async def nearest_neighbours_batch(self, uris: List[str], vectors: List[ndarray],
+                                       k: int) -> List[List[Tuple[str, float]]]:
+        """
+        Returns the k nearest documents to each of the given vectors (excluding the corresponding uri), in a single
+        executor call
+        :param uris:
+        :param vectors:
+        :param k:
+        :return:
+        """
+        return await self.run_in_executor(self._nearest_neighbours_batch, uris, vectors, k)
+
+    @staticmethod
+    def num_nearest_neighbours(page: int, page_size: int) -> int:
+        """
+        Returns the number of nearest neighbours required to fill the requested page
+        :param page:
+        :param page_size:
+        :return:
+        """
+        return min(max(page, 1) * page_size, ML_CONFIG.ann_max_results)
+
+    def _similarity_search(self, query: Q.Query, page: int, page_size: int, sort_by: SortField,
+                           highlight: bool) -> 'RecommendationSearchEngine':
+        """
+        Builds the paginated search for the given similarity query
+        :param query:
+        :param page:
+        :param page_size:
+        :param sort_by:
+        :param highlight:
+        :return:
+        """
+        s: RecommendationSearchEngine = self.builder()
+
+        # Set query
+        s: RecommendationSearchEngine = s.query(query) \
+            .paginate(page, page_size) \
+            .search_type(SearchType(SEARCH_CONFIG.recommend_search_type)) \
+            .sort_by(sort_by)
+
+        if highlight:
+            s: RecommendationSearchEngine = s.apply_highlight_fields()
+
+        return s.build()
+
     async def similar_by_uri_query(self, uri: str, num_labels, page: int, page_size: int,
                                    sort_by: SortField = SortField.relevance,
                                    highlight: bool=True,
@@ -32,23 +143,127 @@ class RecommendationSearchEngine(ConceptualSearchEngine):
         # Get the page embedding vector
         embedding_vector: ndarray = await self.embedding_vector_for_uri(uri)
 
-        # Generate the keywords
-        keywords = await self.similar_by_vector(embedding_vector, num_labels, **kwargs)
+        if self._ann_index is not None:
+            # Fetch enough nearest neighbours to fill the requested page
+            k = self.num_nearest_neighbours(page, page_size)
+            similar: List[Tuple[str, float]] = await self.nearest_neighbours(uri, embedding_vector, k)
 
-        # Build the query
-        vector_script: VectorScriptScore = self.vector_script_score(embedding_vector)
-        query: Q.Query = similar_to_uri(uri, keywords, vector_script)
+            query: Q.Query = similar_by_ids(uri, similar)
+        else:
+            # Generate the keywords
+            keywords = await self.similar_by_vector(embedding_vector, num_labels, **kwargs)
 
-        s: RecommendationSearchEngine = self._clone()
+            # Build the query
+            vector_script: VectorScriptScore = self.vector_script_score(embedding_vector)
+            query: Q.Query = similar_to_uri(uri, keywords, vector_script)
 
-        # Set query
-        s: RecommendationSearchEngine = s.query(query) \
-            .paginate(page, page_size) \
-            .search_type(SearchType.DFS_QUERY_THEN_FETCH) \
-            .sort_by(sort_by)
+        # Build and return
+        return self._similarity_search(query, page, page_size, sort_by, highlight)
 
-        if highlight:
-            s: RecommendationSearchEngine = s.apply_highlight_fields()
+    async def embedding_vectors_for_uris(self, uris: List[str]) -> List[Union[ndarray, Exception]]:
+        """
+        Returns the embedding vectors for the pages at the given uris. Vectors which aren't cached (or need to be
+        revalidated) are fetched with a single multi-get. Uris which couldn't be resolved to a vector are returned as
+        an exception in place of the vector.
+        :param uris:
+        :return:
+        """
+        uris = [normalise_uri(uri) for uri in uris]
+        embedding_vectors: List[Union[ndarray, Exception]] = [None] * len(uris)
 
-        # Execute and return
-        return s
+        # Check the cache, noting stale entries to revalidate
+        stale = {}
+        to_fetch = []
+        for i, uri in enumerate(uris):
+            entry: CachedEmbeddingVector = None
+            if self._embedding_vector_cache is not None:
+                entry = self._embedding_vector_cache.get(uri)
+
+            if entry is not None and self._embedding_vector_cache.is_fresh(entry):
+                embedding_vectors[i] = entry.vector
+            else:
+                to_fetch.append(i)
+                if entry is not None:
+                    stale[i] = entry
+
+        if len(to_fetch) == 0:
+            return embedding_vectors
+
+        # Fetch the remaining vectors (and lastRevised dates) in one request
+        sources: List[dict] = await self.mget_sources([uris[i] for i in to_fetch],
+                                                      source_include=[self.EMBEDDING_VECTOR.name,
+                                                                      self.LAST_REVISED.name])
+
+        for i, source in zip(to_fetch, sources):
+            uri = uris[i]
+            if source is None:
+                embedding_vectors[i] = DocumentNotFoundException(uri, self._get_document_index())
+                if i in stale:
+                    self._embedding_vector_cache.invalidate(uri)
+                continue
+
+            last_revised = self._last_revised(source)
+            if i in stale and self._embedding_vector_cache.revalidate(uri, stale[i], last_revised):
+                embedding_vectors[i] = stale[i].vector
+                continue
+
+            try:
+                embedding_vector: ndarray = self._embedding_vector(uri, source)
+            except Exception as e:
+                embedding_vectors[i] = e
+                continue
+
+            if self._embedding_vector_cache is not None:
+                self._embedding_vector_cache.set(uri, embedding_vector, last_revised)
+            embedding_vectors[i] = embedding_vector
+
+        return embedding_vectors
+
+    async def similar_by_uris_queries(self, uris: List[str], num_labels: int, page: int, page_size: int,
+                                      sort_by: SortField = SortField.relevance,
+                                      highlight: bool=True,
+                                      **kwargs) -> List[Union['RecommendationSearchEngine', Exception]]:
+        """
+        Builds a query for content similar to (but excluding) each of the given uris. All embedding vectors are
+        fetched in one request, and keywords (or nearest neighbours) for all uris are found with one batched call. Uris
+        for which a query couldn't be built are returned as an exception in place of the query.
+        :param uris:
+        :param num_labels:
+        :param page:
+        :param page_size:
+        :param sort_by:
+        :param highlight:
+        :return:
+        """
+        embedding_vectors = await self.embedding_vectors_for_uris(uris)
+
+        queries: List[Union[RecommendationSearchEngine, Exception]] = list(embedding_vectors)
+        found = [i for i, embedding_vector in enumerate(embedding_vectors)
+                 if not isinstance(embedding_vector, Exception)]
+
+        if len(found) == 0:
+            return queries
+
+        if self._ann_index is not None:
+            k = self.num_nearest_neighbours(page, page_size)
+            # Search the ANN index for all uris at once
+            similar_lists: List[List[Tuple[str, float]]] = await self.nearest_neighbours_batch(
+                [uris[i] for i in found], [embedding_vectors[i] for i in found], k
+            )
+
+            for i, similar in zip(found, similar_lists):
+                queries[i] = self._similarity_search(similar_by_ids(uris[i], similar), page, page_size, sort_by,
+                                                     highlight)
+        else:
+            # Generate the keywords for all uris at once
+            context: str = kwargs.get("context", str(uuid4()))
+            keywords_lists: List[List[str]] = await self._fasttext.similar_by_vectors(
+                [embedding_vectors[i] for i in found], num_labels, context
+            )
+
+            for i, keywords in zip(found, keywords_lists):
+                vector_script: VectorScriptScore = self.vector_script_score(embedding_vectors[i])
+                queries[i] = self._similarity_search(similar_to_uri(uris[i], keywords, vector_script), page,
+                                                     page_size, sort_by, highlight)
+
+        return queries
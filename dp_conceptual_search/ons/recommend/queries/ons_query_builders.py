@@ -1,7 +1,7 @@
 """
 This file contains methods to build recommendation queries
 """
-from typing import List
+from typing import List, Tuple
 from elasticsearch_dsl import query as Q
 
 from dp_conceptual_search.search.boost_mode import BoostMode
@@ -42,3 +42,20 @@ def similar_to_uri(uri: str, labels: List[str], vector_script_score: VectorScrip
     )
 
     return query
+
+
+def similar_by_ids(uri: str, similar: List[Tuple[str, float]]) -> Q.Query:
+    """
+    Builds a query to fetch the given (approximate nearest neighbour) documents, excluding the given uri. Documents
+    are scored by their similarity, so that they're returned most similar first.
+    :param uri:
+    :param similar: List of (document id, cosine similarity)
+    :return:
+    """
+    # First, build a uri match query
+    match_query: Q.Query = match_by_uri(uri)
+
+    # Score each document by its similarity (shifted to be non-negative)
+    should = [Q.ConstantScore(filter=Q.Ids(values=[doc_id]), boost=1.0 + similarity) for doc_id, similarity in similar]
+
+    return Q.Bool(must_not=[match_query], should=should, minimum_should_match=1)
@@ -3,6 +3,7 @@ import logging as logger
 from typing import List
 
 from dp_conceptual_search.search.query_helper import match_by_uri
+from dp_conceptual_search.search.search_type import SearchType
 from dp_conceptual_search.search.client.search_client import SearchClient
 
 from dp_conceptual_search.ons.search.sort_fields import query_sort
@@ -19,6 +20,38 @@ class AbstractSearchEngine(SearchClient, abc.ABC):
     def __init__(self, **kwargs):
         super(AbstractSearchEngine, self).__init__(response_class=ONSResponse, **kwargs)
 
+        # When True, chained calls modify this instance in place instead of returning a modified copy
+        self._in_place = False
+
+    def _clone(self):
+        """
+        Clones the search engine, unless in builder mode (in which case all changes are applied in place)
+        :return:
+        """
+        if self._in_place:
+            return self
+        return super(AbstractSearchEngine, self)._clone()
+
+    def builder(self):
+        """
+        Returns a private copy of this search engine in builder mode, so that a chain of calls (query, paginate,
+        sort_by, filters etc.) modifies a single instance instead of copying the search at every step. Call build()
+        once the query is complete.
+        :return:
+        """
+        s: AbstractSearchEngine = self._clone()
+        s._in_place = True
+
+        return s
+
+    def build(self):
+        """
+        Exits builder mode, returning the built search engine
+        :return:
+        """
+        self._in_place = False
+        return self
+
     def match_by_uri(self, uri: str):
         """
         Builds a simple match by uri query
@@ -88,13 +121,12 @@ class AbstractSearchEngine(SearchClient, abc.ABC):
         :param size:
         :return:
         """
-        s: AbstractSearchEngine = self._clone()
-
         # Calculate from_start param
         from_start = 0 if current_page <= 1 else (current_page - 1) * size
         end = from_start + size
 
-        return s[from_start:end]
+        # NB: slicing returns a copy
+        return self[from_start:end]
 
     @abc.abstractmethod
     def departments_query(
@@ -117,6 +149,8 @@ class AbstractSearchEngine(SearchClient, abc.ABC):
                       highlight: bool=True,
                       filter_functions: List[ContentType]=None,
                       type_filters: List[ContentType]=None,
+                      search_type: SearchType=None,
+                      request_cache: bool=None,
                       **kwargs):
         """
         Builds the ONS content query, responsible for populating the SERP
@@ -127,6 +161,8 @@ class AbstractSearchEngine(SearchClient, abc.ABC):
         :param highlight:
         :param filter_functions: content types to generate filter scores for (content type boosting)
         :param type_filters: content types to filter in query
+        :param search_type: Elasticsearch search_type (defaults to SEARCH_CONTENT_SEARCH_TYPE)
+        :param request_cache: Use the shard request cache (defaults to SEARCH_CONTENT_REQUEST_CACHE)
         :param kwargs:
         :return:
         """
@@ -143,6 +179,28 @@ class AbstractSearchEngine(SearchClient, abc.ABC):
         """
         pass
 
+    @abc.abstractmethod
+    def content_and_type_counts_query(self, search_term: str, current_page: int, size: int,
+                                      sort_by: SortField=SortField.relevance,
+                                      highlight: bool=True,
+                                      filter_functions: List[ContentType]=None,
+                                      type_filters: List[ContentType]=None,
+                                      **kwargs):
+        """
+        Builds the ONS content query with the type counts aggregation attached, so that a single search populates both
+        the SERP and the counts by content type
+        :param search_term:
+        :param current_page:
+        :param size:
+        :param sort_by:
+        :param highlight:
+        :param filter_functions: content types to generate filter scores for (content type boosting)
+        :param type_filters: content types to filter in query
+        :param kwargs:
+        :return:
+        """
+        pass
+
     @abc.abstractmethod
     def featured_result_query(self, search_term):
         """
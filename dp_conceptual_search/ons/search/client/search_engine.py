@@ -1,6 +1,7 @@
 from typing import List
 
-from dp_conceptual_search.search.query_helper import match_by_uri
+from dp_conceptual_search.config.config import SEARCH_CONFIG
+from dp_conceptual_search.search.query_helper import match_by_uri, query_preference
 from dp_conceptual_search.search.search_type import SearchType
 from dp_conceptual_search.ons.search.client.abstract_search_engine import AbstractSearchEngine
 from dp_conceptual_search.ons.search import SortField, AvailableTypeFilters, ContentType
@@ -25,6 +26,24 @@ class SearchEngine(AbstractSearchEngine):
         query = match_by_uri(uri)
         return self.query(query)
 
+    @staticmethod
+    def apply_cache_hints(s: 'SearchEngine', search_term: str, request_cache: bool) -> 'SearchEngine':
+        """
+        Applies the shard request cache hint and (if enabled) a sticky preference derived from the search term, so
+        that repeated queries hit the same (warm) shard copies
+        :param s:
+        :param search_term:
+        :param request_cache:
+        :return:
+        """
+        if request_cache:
+            s: SearchEngine = s.request_cache(True)
+
+        if SEARCH_CONFIG.sticky_preference_enabled:
+            s: SearchEngine = s.preference(query_preference(search_term))
+
+        return s
+
     def departments_query(self, search_term: str, current_page: int, size: int):
         """
         Builds the ONS departments query with pagination
@@ -33,18 +52,23 @@ class SearchEngine(AbstractSearchEngine):
         :param size:
         :return:
         """
-        s: SearchEngine = self._clone() \
+        s: SearchEngine = self.builder() \
             .query(build_departments_query(search_term)) \
             .paginate(current_page, size) \
-            .search_type(SearchType.DFS_QUERY_THEN_FETCH)
+            .search_type(SearchType(SEARCH_CONFIG.departments_search_type))
 
-        return s
+        if SEARCH_CONFIG.sticky_preference_enabled:
+            s: SearchEngine = s.preference(query_preference(search_term))
+
+        return s.build()
 
     def content_query(self, search_term: str, current_page: int, size: int,
                       sort_by: SortField=SortField.relevance,
                       highlight: bool=True,
                       filter_functions: List[ContentType]=None,
                       type_filters: List[ContentType]=None,
+                      search_type: SearchType=None,
+                      request_cache: bool=None,
                       **kwargs):
         """
         Builds the ONS content query, responsible for populating the SERP
@@ -55,6 +79,8 @@ class SearchEngine(AbstractSearchEngine):
         :param highlight:
         :param filter_functions: content types to generate filter scores for (content type boosting)
         :param type_filters: content types to filter in query
+        :param search_type: Elasticsearch search_type (defaults to SEARCH_CONTENT_SEARCH_TYPE)
+        :param request_cache: Use the shard request cache (defaults to SEARCH_CONTENT_REQUEST_CACHE)
         :param kwargs:
         :return:
         """
@@ -65,20 +91,27 @@ class SearchEngine(AbstractSearchEngine):
         if filter_functions is not None:
             query = build_function_score_content_query(query, filter_functions)
 
-        # Build the content query
-        s: SearchEngine = self._clone() \
+        if search_type is None:
+            search_type = SearchType(SEARCH_CONFIG.content_search_type)
+        if request_cache is None:
+            request_cache = SEARCH_CONFIG.content_request_cache
+
+        # Build the content query (on a single copy of the search engine)
+        s: SearchEngine = self.builder() \
             .query(query) \
             .paginate(current_page, size) \
             .sort_by(sort_by) \
-            .search_type(SearchType.DFS_QUERY_THEN_FETCH)
+            .search_type(search_type)
 
         if type_filters is not None:
             s: SearchEngine = s.type_filter(type_filters)
 
+        s: SearchEngine = self.apply_cache_hints(s, search_term, request_cache)
+
         if highlight:
             s: SearchEngine = s.apply_highlight_fields()
 
-        return s
+        return s.build()
 
     def type_counts_query(self, search_term, type_filters: List[ContentType]=None, **kwargs):
         """
@@ -92,7 +125,9 @@ class SearchEngine(AbstractSearchEngine):
         s: SearchEngine = self.content_query(search_term,
                                              0,  # hard code page number to 0, as it does not impact the aggregations
                                              0,  # hard code page number to 0, as it does not impact the aggregations
-                                             type_filters=type_filters, highlight=False)
+                                             type_filters=type_filters, highlight=False,
+                                             search_type=SearchType(SEARCH_CONFIG.type_counts_search_type),
+                                             request_cache=SEARCH_CONFIG.type_counts_request_cache)
 
         # Build the aggregations
         aggregations = build_type_counts_query()
@@ -102,6 +137,34 @@ class SearchEngine(AbstractSearchEngine):
 
         return s
 
+    def content_and_type_counts_query(self, search_term: str, current_page: int, size: int,
+                                      sort_by: SortField=SortField.relevance,
+                                      highlight: bool=True,
+                                      filter_functions: List[ContentType]=None,
+                                      type_filters: List[ContentType]=None,
+                                      **kwargs):
+        """
+        Builds the ONS content query with the type counts aggregation attached. Type filters are applied in the query
+        filter context (as for the type counts query), so the aggregation counts the same documents as the standalone
+        type counts query. Function scores, sorting and pagination don't affect which documents match.
+        :param search_term:
+        :param current_page:
+        :param size:
+        :param sort_by:
+        :param highlight:
+        :param filter_functions: content types to generate filter scores for (content type boosting)
+        :param type_filters: content types to filter in query
+        :param kwargs:
+        :return:
+        """
+        s: SearchEngine = self.content_query(search_term, current_page, size, sort_by=sort_by, highlight=highlight,
+                                             filter_functions=filter_functions, type_filters=type_filters, **kwargs)
+
+        # Setup the aggregations bucket
+        s.aggs.bucket(self.agg_bucket, build_type_counts_query())
+
+        return s
+
     def featured_result_query(self, search_term):
         """
         Builds the ONS featured result query (content query with specific type filters)
@@ -117,4 +180,6 @@ class SearchEngine(AbstractSearchEngine):
                                   page_size,
                                   filter_functions=None,
                                   type_filters=type_filters,
-                                  highlight=False)
+                                  highlight=False,
+                                  search_type=SearchType(SEARCH_CONFIG.featured_search_type),
+                                  request_cache=SEARCH_CONFIG.featured_request_cache)
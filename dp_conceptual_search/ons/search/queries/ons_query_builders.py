@@ -9,6 +9,8 @@ from elasticsearch_dsl.aggs import A as Aggregation
 from dp_conceptual_search.ons.search.fields import AvailableFields
 from dp_conceptual_search.ons.search.content_type import ContentType
 from dp_conceptual_search.search.query_helper import match, multi_match
+from dp_conceptual_search.search.dsl.raw_query import RawQuery
+from dp_conceptual_search.search.dsl.query_template import QueryTemplate, Placeholder
 
 
 def build_type_counts_query() -> Aggregation:
@@ -28,10 +30,9 @@ def build_departments_query(search_term: str) -> Q.Query:
     return Q.Match(**{"terms": {"query": search_term, "type": "boolean"}})
 
 
-def build_content_query(search_term: str, **kwargs) -> Q.DisMax:
+def _build_content_query(search_term, **kwargs) -> Q.DisMax:
     """
-    Returns the default ONS content query
-
+    Builds the default ONS content query DSL
     :param search_term:
     :return:
     """
@@ -59,6 +60,24 @@ def build_content_query(search_term: str, **kwargs) -> Q.DisMax:
     return q
 
 
+# Precompile the default ONS content query, so that only the search term is substituted per request
+content_query_template = QueryTemplate(_build_content_query(Placeholder("search_term")).to_dict())
+
+
+def build_content_query(search_term: str, **kwargs) -> Q.Query:
+    """
+    Returns the default ONS content query
+
+    :param search_term:
+    :return:
+    """
+    if len(kwargs) > 0:
+        # Additional DisMax params aren't part of the template
+        return _build_content_query(search_term, **kwargs)
+
+    return RawQuery(content_query_template.render(search_term=search_term))
+
+
 def build_function_score_content_query(query: Q.Query, content_types: List[ContentType], boost: float=1.0) -> Q.Query:
     """
     Generate a function score query using ContentType weights
@@ -67,10 +86,15 @@ def build_function_score_content_query(query: Q.Query, content_types: List[Conte
     :param boost:
     :return:
     """
-    function_scores = []
+    function_score = {
+        "query": query.to_dict(),
+        "boost": boost
+    }
 
-    content_type: ContentType
-    for content_type in content_types:
-        function_scores.append(content_type.filter_function())
+    # Build the (serialised) function scores directly, as parsing them into the DSL (and re-parsing on every copy of
+    # the query) is expensive
+    function_scores = [content_type.filter_function() for content_type in content_types]
+    if len(function_scores) > 0:
+        function_score["functions"] = function_scores
 
-    return Q.FunctionScore(query=query, functions=function_scores, boost=boost)
+    return RawQuery({"function_score": function_score})
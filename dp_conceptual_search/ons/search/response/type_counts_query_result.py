@@ -1,6 +1,8 @@
 """
 Class to define the structure of an ONS type counts query search result
 """
+from typing import Optional
+
 from elasticsearch_dsl.response import AggResponse
 
 from dp_conceptual_search.ons.search.response import SearchResult
@@ -8,7 +10,7 @@ from dp_conceptual_search.ons.search.response import SearchResult
 
 class TypeCountsQueryResult(SearchResult):
 
-    def __init__(self, aggregations: AggResponse):
+    def __init__(self, aggregations: Optional[AggResponse]):
 
         self.aggregations = aggregations
         self._aggs_json = None
@@ -1 +1,2 @@
 from dp_conceptual_search.search.client.search_client import SearchClient
+from dp_conceptual_search.search.client.multi_search_client import MultiSearchClient
@@ -1 +1,2 @@
 from .request_size_exceeded_exception import RequestSizeExceededException
+from .document_not_found_exception import DocumentNotFoundException
@@ -0,0 +1,7 @@
+class DocumentNotFoundException(Exception):
+    def __init__(self, doc_id: str, index: str):
+        super(DocumentNotFoundException, self).__init__("Document '{doc_id}' not found in index '{index}'"
+                                                        .format(doc_id=doc_id, index=index))
+
+        self.doc_id = doc_id
+        self.index = index
@@ -0,0 +1,72 @@
+from inspect import isawaitable
+from typing import List, Union
+
+from elasticsearch import TransportError
+from elasticsearch_dsl import MultiSearch
+from elasticsearch_dsl.response import Response
+from elasticsearch_dsl.connections import connections
+
+from dp4py_logging.time import timeit
+
+
+class MultiSearchClient(MultiSearch):
+    """
+    Executes many searches in a single _msearch request, supporting both the synchronous and asynchronous
+    Elasticsearch clients
+    """
+
+    def _get_elasticsearch_client(self):
+        """
+        Return a living connection to the underlying Elasticsearch client
+        :return:
+        """
+        es = connections.get_connection(self._using)
+
+        return es
+
+    async def _msearch(self, body: list=None) -> dict:
+        """
+        Execute the multi search request and return the raw response
+        If the response is a co-routine, then await it
+        :param body: The serialised searches (if already computed)
+        :return:
+        """
+        es = self._get_elasticsearch_client()
+
+        response = es.msearch(
+            index=self._index,
+            doc_type=self._get_doc_type(),
+            body=body if body is not None else self.to_dict(),
+            **self._params
+        )
+
+        if isawaitable(response):
+            response = await response
+        return response
+
+    @timeit
+    async def execute(self, ignore_cache=False, body: list=None) -> List[Union[Response, Exception]]:
+        """
+        Executes the searches, wrapping each response in the response class of its search. Searches which failed
+        are returned as a TransportError (in place of the response) rather than raised, so that callers can decide
+        how to handle partial failures.
+        :param ignore_cache:
+        :param body: The serialised searches, if already computed (i.e for logging)
+        :return:
+        """
+        if ignore_cache or not hasattr(self, '_response') or self._response is None:
+            responses = await self._msearch(body=body)
+
+            out = []
+            for s, r in zip(self._searches, responses['responses']):
+                error = r.get('error', False)
+                if error:
+                    error_type = error.get('type') if isinstance(error, dict) else error
+                    out.append(TransportError(r.get('status', 'N/A'), error_type, error))
+                else:
+                    response_class = getattr(s, '_response_class', Response)
+                    out.append(response_class(s, r))
+
+            self._response = out
+
+        return self._response
@@ -1,4 +1,5 @@
 from inspect import isawaitable
+from typing import List, Optional
 
 from elasticsearch_dsl import Search
 from elasticsearch_dsl.response import Response
@@ -59,10 +60,11 @@ class SearchClient(Search):
 
         return es
 
-    async def _search(self):
+    async def _search(self, body: dict=None):
         """
         Execute the search request and return the raw response
         If the response is a co-routine, then await it
+        :param body: The serialised query (if already computed)
         :return:
         """
         es = self._get_elasticsearch_client()
@@ -70,7 +72,7 @@ class SearchClient(Search):
         response = es.search(
             index=self._index,
             doc_type=self._get_doc_type(),
-            body=self.to_dict(),
+            body=body if body is not None else self.to_dict(),
             **self._params
         )
 
@@ -78,6 +80,71 @@ class SearchClient(Search):
             response = await response
         return response
 
+    def _get_document_index(self) -> str:
+        """
+        Returns the index to fetch documents from (document lookups require exactly one index)
+        :return:
+        """
+        if self._index is None or len(self._index) != 1:
+            raise ValueError("Document lookups require exactly one index, got {0}".format(self._index))
+        return self._index[0]
+
+    async def get_source(self, doc_id: str, source_include: List[str]=None) -> Optional[dict]:
+        """
+        Fetches the _source of a single document by id, using a (realtime) document GET. Unlike a search, this is a
+        single shard request.
+        :param doc_id:
+        :param source_include: Fields to include in the _source (defaults to all fields)
+        :return: The _source, or None if the document doesn't exist
+        """
+        es = self._get_elasticsearch_client()
+
+        params = {}
+        if source_include is not None:
+            params["_source_include"] = source_include
+
+        response = es.get(
+            index=self._get_document_index(),
+            doc_type="_all",
+            id=doc_id,
+            ignore=404,
+            **params
+        )
+
+        if isawaitable(response):
+            response = await response
+
+        if not response.get("found", False):
+            return None
+        return response.get("_source", {})
+
+    async def mget_sources(self, doc_ids: List[str], source_include: List[str]=None) -> List[Optional[dict]]:
+        """
+        Fetches the _source of many documents by id in a single multi-get request
+        :param doc_ids:
+        :param source_include: Fields to include in the _source (defaults to all fields)
+        :return: List of _source (or None for documents which don't exist), in the same order as doc_ids
+        """
+        if len(doc_ids) == 0:
+            return []
+
+        es = self._get_elasticsearch_client()
+
+        params = {}
+        if source_include is not None:
+            params["_source_include"] = source_include
+
+        response = es.mget(
+            body={"docs": [{"_id": doc_id} for doc_id in doc_ids]},
+            index=self._get_document_index(),
+            **params
+        )
+
+        if isawaitable(response):
+            response = await response
+
+        return [doc.get("_source", {}) if doc.get("found", False) else None for doc in response["docs"]]
+
     def search_type(self, search_type: SearchType):
         """
         Adds search_type param to Elasticsearch query
@@ -86,15 +153,32 @@ class SearchClient(Search):
         """
         return self.params(search_type=search_type.value)
 
+    def request_cache(self, enabled: bool=True):
+        """
+        Adds request_cache param to Elasticsearch query, to enable (or disable) the shard request cache
+        :param enabled:
+        :return:
+        """
+        return self.params(request_cache=enabled)
+
+    def preference(self, preference: str):
+        """
+        Adds preference param to Elasticsearch query, to control which shard copies execute the search
+        :param preference:
+        :return:
+        """
+        return self.params(preference=preference)
+
     @timeit
-    async def execute(self, ignore_cache=False):
+    async def execute(self, ignore_cache=False, body: dict=None):
         """
         Wraps the Elasticsearch response in the given response class
         :param ignore_cache:
+        :param body: The serialised query, if already computed (i.e for logging), to avoid serialising it twice
         :return:
         """
         if ignore_cache or not hasattr(self, '_response') or self._response is None:
-            search_response = await self._search()
+            search_response = await self._search(body=body)
 
             self._response = self._response_class(self, search_response)
 
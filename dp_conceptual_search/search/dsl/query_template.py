@@ -0,0 +1,73 @@
+"""
+Precompiled query templates. The static skeleton of a query is built (and serialised) once, and only the placeholder
+values are substituted per request.
+"""
+from typing import Any, Callable, Dict, Optional
+
+
+class Placeholder(object):
+    """
+    Marks a value to be substituted when a QueryTemplate is rendered
+    """
+    def __init__(self, name: str):
+        self.name = name
+
+    def __repr__(self):
+        return "Placeholder({0})".format(self.name)
+
+
+# Renders a (sub-)tree of the template given the placeholder values
+Renderer = Callable[[Dict[str, Any]], Any]
+
+
+def _compile(node: Any) -> Optional[Renderer]:
+    """
+    Compiles a template node into a render function, or returns None if the node contains no placeholders (and so can
+    be shared between all rendered queries)
+    :param node:
+    :return:
+    """
+    if isinstance(node, Placeholder):
+        name = node.name
+        return lambda values: values[name]
+
+    if isinstance(node, dict):
+        renderers = {key: _compile(value) for key, value in node.items()}
+        if all(renderer is None for renderer in renderers.values()):
+            return None
+
+        items = [(key, value, renderers[key]) for key, value in node.items()]
+        return lambda values: {key: value if renderer is None else renderer(values)
+                               for key, value, renderer in items}
+
+    if isinstance(node, list):
+        renderers = [_compile(value) for value in node]
+        if all(renderer is None for renderer in renderers):
+            return None
+
+        items = list(zip(node, renderers))
+        return lambda values: [value if renderer is None else renderer(values) for value, renderer in items]
+
+    return None
+
+
+class QueryTemplate(object):
+
+    def __init__(self, skeleton: dict):
+        """
+        Compiles a query skeleton (the dict form of a query, with Placeholder values). Rendered queries share all
+        sub-trees which contain no placeholders with the skeleton, so must be treated as read-only.
+        :param skeleton:
+        """
+        self.skeleton = skeleton
+
+        renderer = _compile(skeleton)
+        self._renderer: Renderer = renderer if renderer is not None else lambda values: skeleton
+
+    def render(self, **values) -> dict:
+        """
+        Renders the query, substituting the given placeholder values
+        :param values:
+        :return:
+        """
+        return self._renderer(values)
@@ -0,0 +1,22 @@
+"""
+Defines a query object which wraps an already serialised (i.e rendered) query dict
+"""
+from elasticsearch_dsl import query as Q
+
+
+class RawQuery(Q.Query):
+    name = "raw_query"
+
+    def __init__(self, query: dict=None):
+        """
+        Wraps a query dict, so it can be combined with other elasticsearch_dsl queries without being re-parsed
+        :param query:
+        """
+        super(RawQuery, self).__init__()
+        self._query = query if query is not None else {}
+
+    def to_dict(self) -> dict:
+        return self._query
+
+    def _clone(self):
+        return RawQuery(self._query)
@@ -3,25 +3,37 @@ Defines a vector score query object
 """
 from numpy import ndarray
 
+from dp_conceptual_search.config.config import SEARCH_CONFIG
+
 from dp_conceptual_search.search.dsl.scripts import Scripts
+from dp_conceptual_search.search.vector_encoding import encode_vector
 from dp_conceptual_search.search.dsl.script_score import ScriptScore
 from dp_conceptual_search.search.dsl.script_language import ScriptLanguage
 
 
 class VectorScriptScore(ScriptScore):
-    def __init__(self, field: str, vector: ndarray, cosine: bool=True):
+    def __init__(self, field: str, vector: ndarray, cosine: bool=True, encoded: bool=False,
+                 dtype: str=SEARCH_CONFIG.embedding_vector_dtype):
         """
         Defines a vector score function to be used with the binary-vector-scoring Elasticsearch plugin
         :param field:
         :param vector:
         :param cosine:
+        :param encoded: Send the vector base64 encoded, rather than as a list of floats
+        :param dtype: dtype of the encoded vector
         """
+        params = {
+            "cosine": cosine,
+            "field": field
+        }
+
+        if encoded:
+            params["encoded_vector"] = encode_vector(vector, dtype=dtype)
+        else:
+            params["vector"] = vector.tolist()
+
         super(VectorScriptScore, self).__init__(**{
             "lang": ScriptLanguage.K_NEAREST_NEIGHBOURS.value,
-            "params": {
-                "cosine": cosine,
-                "field": field,
-                "vector": vector.tolist()
-            },
+            "params": params,
             "script": Scripts.BINARY_VECTOR_SCORE.value
         })
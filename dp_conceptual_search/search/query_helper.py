@@ -1,3 +1,4 @@
+import hashlib
 from typing import List
 
 from elasticsearch_dsl import query as Q
@@ -5,15 +6,43 @@ from elasticsearch_dsl import query as Q
 from dp_conceptual_search.search.dsl.script_score import ScriptScore
 
 
-def match_by_uri(uri: str) -> Q.Query:
+def normalise_uri(uri: str) -> str:
     """
-    Match a document by its uri
+    Returns the uri with a leading slash, as used for document ids
     :param uri:
     :return:
     """
     if not uri.startswith("/"):
         uri = "/" + uri
-    return Q.Match(_id=uri)
+    return uri
+
+
+def normalise_search_term(search_term: str) -> str:
+    """
+    Collapses runs of whitespace in the search term
+    :param search_term:
+    :return:
+    """
+    return " ".join(search_term.split())
+
+
+def query_preference(search_term: str) -> str:
+    """
+    Returns a custom Elasticsearch preference string derived from a hash of the normalised search term, so that
+    repeated queries (and all pages of a query) are routed to the same shard copies
+    :param search_term:
+    :return:
+    """
+    return "q_" + hashlib.sha1(normalise_search_term(search_term).encode("utf-8")).hexdigest()[:16]
+
+
+def match_by_uri(uri: str) -> Q.Query:
+    """
+    Match a document by its uri
+    :param uri:
+    :return:
+    """
+    return Q.Match(_id=normalise_uri(uri))
 
 
 def match(field: str, search_term: str, **kwargs) -> Q.Query:
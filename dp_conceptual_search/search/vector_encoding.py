@@ -0,0 +1,30 @@
+"""
+Encoding and decoding of (base64 encoded) binary embedding vectors, as stored by the binary-vector-scoring
+Elasticsearch plugin
+"""
+import base64
+import numpy as np
+from numpy import ndarray
+
+from dp_conceptual_search.config.config import SEARCH_CONFIG
+
+
+def decode_vector(encoded_vector: str, dtype: str=SEARCH_CONFIG.embedding_vector_dtype) -> ndarray:
+    """
+    Decodes a base64 encoded vector. The returned array is a read-only view over the decoded bytes, so no
+    intermediate lists or copies are created.
+    :param encoded_vector:
+    :param dtype: numpy dtype of the stored vector (the plugin stores big-endian float64)
+    :return:
+    """
+    return np.frombuffer(base64.b64decode(encoded_vector), dtype=dtype)
+
+
+def encode_vector(vector: ndarray, dtype: str=SEARCH_CONFIG.embedding_vector_dtype) -> str:
+    """
+    Base64 encodes a vector. The vector is only copied if it isn't already contiguous with the given dtype.
+    :param vector:
+    :param dtype: numpy dtype of the encoded vector
+    :return:
+    """
+    return base64.b64encode(np.ascontiguousarray(vector, dtype=dtype)).decode("ascii")
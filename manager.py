@@ -35,9 +35,21 @@ def run(app_host: str='0.0.0.0', app_port: int=5000, app_workers: int=1):
     app.run(host=app_host, port=app_port, workers=app_workers, protocol=ONSHttpProtocol)
 
 
+def build_spellcheck_index(args: list):
+    """
+    Builds the spellcheck index file loaded at startup (see SPELLCHECK_INDEX_FILENAME)
+    :param args: Command line arguments for scripts/build_spellcheck_index.py
+    :return:
+    """
+    from scripts.build_spellcheck_index import main
+    main(args)
+
+
 if __name__ == "__main__":
     if len(sys.argv) > 1 and sys.argv[1] == "test":
         test()
+    elif len(sys.argv) > 1 and sys.argv[1] == "build_spellcheck_index":
+        build_spellcheck_index(sys.argv[2:])
     else:
         host = os.getenv("BIND_HOST", '0.0.0.0')
         port = int(os.getenv("BIND_PORT", 5000))
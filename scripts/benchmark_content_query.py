@@ -0,0 +1,72 @@
+#!/usr/bin/env python
+"""
+Micro-benchmark for building the ONS content query. Compares the number of Search copies and the time taken to build
+(and serialise) the query using builder mode against the previous chain of copies.
+
+Usage: python scripts/benchmark_content_query.py [iterations]
+"""
+import sys
+import timeit
+from unittest import mock
+
+from elasticsearch_dsl import Search
+
+from dp_conceptual_search.search.search_type import SearchType
+from dp_conceptual_search.ons.search import SortField
+from dp_conceptual_search.ons.search.client.search_engine import SearchEngine
+from dp_conceptual_search.ons.search.content_type import AvailableContentTypes
+from dp_conceptual_search.ons.search.queries.ons_query_builders import (
+    build_content_query, build_function_score_content_query
+)
+
+SEARCH_TERM = "consumer price inflation"
+CONTENT_TYPES = AvailableContentTypes.available_content_types()
+
+
+def chained_content_query(engine: SearchEngine) -> SearchEngine:
+    """
+    Builds the content query with a copy at every step (as before builder mode)
+    :param engine:
+    :return:
+    """
+    query = build_function_score_content_query(build_content_query(SEARCH_TERM), CONTENT_TYPES)
+
+    return engine._clone() \
+        ._clone()[10:20] \
+        .query(query) \
+        .sort_by(SortField.relevance) \
+        .search_type(SearchType.DFS_QUERY_THEN_FETCH) \
+        .type_filter(CONTENT_TYPES) \
+        .apply_highlight_fields()
+
+
+def builder_content_query(engine: SearchEngine) -> SearchEngine:
+    """
+    Builds the content query using builder mode
+    :param engine:
+    :return:
+    """
+    return engine.content_query(SEARCH_TERM, 2, 10, filter_functions=CONTENT_TYPES, type_filters=CONTENT_TYPES)
+
+
+def count_copies(fn, engine: SearchEngine) -> int:
+    with mock.patch.object(Search, '_clone', autospec=True, side_effect=Search._clone) as clone:
+        fn(engine)
+        return clone.call_count
+
+
+def main(iterations: int):
+    engine = SearchEngine(index="ons")
+
+    assert chained_content_query(engine).to_dict() == builder_content_query(engine).to_dict()
+
+    for name, fn in [("chained", chained_content_query), ("builder", builder_content_query)]:
+        copies = count_copies(fn, engine)
+        seconds = timeit.timeit(lambda: fn(engine).to_dict(), number=iterations)
+
+        print("{name}: {copies} copies, {us:.1f}us per query (build + to_dict, {iterations} iterations)".format(
+            name=name, copies=copies, us=seconds / iterations * 1e6, iterations=iterations))
+
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 10000)
@@ -0,0 +1,104 @@
+#!/usr/bin/env python
+"""
+Benchmarks the ONS content query against a live Elasticsearch cluster with each search_type, comparing the latency of
+query_then_fetch against dfs_query_then_fetch, and how much the top k ranking drifts between the two.
+
+Usage: python scripts/benchmark_search_type.py [options] [search terms file]
+"""
+import time
+import argparse
+import statistics
+from typing import List
+
+from elasticsearch import Elasticsearch
+
+from dp_conceptual_search.config import CONFIG
+from dp_conceptual_search.search.search_type import SearchType
+from dp_conceptual_search.ons.search.client.search_engine import SearchEngine
+from dp_conceptual_search.ons.search.content_type import AvailableContentTypes
+
+DEFAULT_SEARCH_TERMS = [
+    "inflation", "consumer price inflation", "gdp", "unemployment", "population estimates", "wages",
+    "house prices", "migration", "retail sales", "life expectancy", "crime", "trade"
+]
+
+
+def search(client: Elasticsearch, index: str, body: dict, search_type: SearchType) -> (float, float, List[str]):
+    """
+    Executes a search, returning the wall clock and server (took) latencies in ms and the ranked hit ids
+    :param client:
+    :param index:
+    :param body:
+    :param search_type:
+    :return:
+    """
+    start = time.perf_counter()
+    response = client.search(index=index, body=body, search_type=search_type.value, request_cache=False)
+    wall = (time.perf_counter() - start) * 1000.0
+
+    return wall, float(response["took"]), [hit["_id"] for hit in response["hits"]["hits"]]
+
+
+def overlap(a: List[str], b: List[str]) -> float:
+    """
+    Fraction of the top k hits shared by both rankings
+    :param a:
+    :param b:
+    :return:
+    """
+    k = max(len(a), len(b))
+    return len(set(a) & set(b)) / k if k > 0 else 1.0
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Compare query_then_fetch and dfs_query_then_fetch content queries")
+    parser.add_argument("terms", nargs="?", default=None, help="File of search terms (one per line)")
+    parser.add_argument("--server", default=CONFIG.ELASTIC_SEARCH.server, help="Elasticsearch server")
+    parser.add_argument("--index", default=CONFIG.SEARCH.search_index, help="Elasticsearch index")
+    parser.add_argument("--size", type=int, default=10, help="Number of hits to compare (k)")
+    parser.add_argument("--repeats", type=int, default=5, help="Number of timed runs per search term and mode")
+    args = parser.parse_args()
+
+    search_terms = DEFAULT_SEARCH_TERMS
+    if args.terms is not None:
+        with open(args.terms) as f:
+            search_terms = [line.strip() for line in f if len(line.strip()) > 0]
+
+    client = Elasticsearch(args.server, timeout=CONFIG.ELASTIC_SEARCH.timeout)
+    content_types = AvailableContentTypes.available_content_types()
+    modes = [SearchType.QUERY_THEN_FETCH, SearchType.DFS_QUERY_THEN_FETCH]
+
+    latencies = {mode: [] for mode in modes}
+    took = {mode: [] for mode in modes}
+    overlaps = []
+    identical = 0
+
+    for search_term in search_terms:
+        body = SearchEngine(index=args.index).content_query(search_term, 1, args.size, filter_functions=content_types,
+                                                            type_filters=content_types, highlight=False).to_dict()
+
+        rankings = {}
+        for mode in modes:
+            # Warm up, then time
+            search(client, args.index, body, mode)
+            for _ in range(args.repeats):
+                wall, server, rankings[mode] = search(client, args.index, body, mode)
+                latencies[mode].append(wall)
+                took[mode].append(server)
+
+        a, b = rankings[SearchType.QUERY_THEN_FETCH], rankings[SearchType.DFS_QUERY_THEN_FETCH]
+        overlaps.append(overlap(a, b))
+        identical += int(a == b)
+
+    for mode in modes:
+        wall = sorted(latencies[mode])
+        print("{mode}: median {median:.1f}ms, p95 {p95:.1f}ms (wall), median took {took:.1f}ms".format(
+            mode=mode.value, median=statistics.median(wall), p95=wall[int(0.95 * (len(wall) - 1))],
+            took=statistics.median(took[mode])))
+
+    print("ranking drift over {n} search terms: mean top {k} overlap {overlap:.3f}, {identical} identical rankings"
+          .format(n=len(search_terms), k=args.size, overlap=statistics.mean(overlaps), identical=identical))
+
+
+if __name__ == "__main__":
+    main()
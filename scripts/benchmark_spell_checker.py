@@ -0,0 +1,50 @@
+#!/usr/bin/env python
+"""
+Benchmarks spelling correction with the symmetric delete index against generating every single and double edit of
+each word, using the unsupervised fastText model vocabulary.
+
+Usage: python scripts/benchmark_spell_checker.py [options]
+"""
+import time
+import timeit
+import argparse
+
+from dp_conceptual_search.config import CONFIG
+from dp_conceptual_search.ml.spelling.spell_checker import SpellChecker
+from dp_conceptual_search.ml.word_embedding.fastText.unsupervised import UnsupervisedModel
+
+DEFAULT_WORDS = ["inflation", "infltion", "rpo", "cpl", "economi", "unemploymnet", "populaton", "migratoin",
+                 "constructoin", "manufacturnig", "househlods", "ifnlaton", "xqzvbn"]
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Compare spell checker candidate generation strategies")
+    parser.add_argument("words", nargs="*", default=DEFAULT_WORDS, help="Words to correct")
+    parser.add_argument("--model", default=CONFIG.ML.unsupervised_model_filename, help="Unsupervised model filename")
+    parser.add_argument("--iterations", type=int, default=10, help="Number of timed corrections per word")
+    args = parser.parse_args()
+
+    model = UnsupervisedModel(args.model)
+
+    start = time.perf_counter()
+    indexed = SpellChecker(model)
+    print("built symmetric delete index over {n} words in {s:.2f}s ({mb:.1f}MB)".format(
+        n=len(indexed.index), s=time.perf_counter() - start,
+        mb=(indexed.index.keys.nbytes + indexed.index.word_ids.nbytes) / 1e6))
+
+    brute_force = SpellChecker(model, use_index=False)
+
+    print("{word:>16} {edits:>12} {index:>12} {speedup:>8}  corrections".format(
+        word="word", edits="edits (us)", index="index (us)", speedup="speedup"))
+
+    for word in args.words:
+        edits = timeit.timeit(lambda: brute_force.correction(word), number=args.iterations) / args.iterations * 1e6
+        index = timeit.timeit(lambda: indexed.correction(word), number=args.iterations) / args.iterations * 1e6
+
+        print("{word:>16} {edits:>12.1f} {index:>12.1f} {speedup:>7.0f}x  {a} / {b}".format(
+            word=word, edits=edits, index=index, speedup=edits / index,
+            a=brute_force.correction(word), b=indexed.correction(word)))
+
+
+if __name__ == "__main__":
+    main()
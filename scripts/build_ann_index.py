@@ -0,0 +1,75 @@
+#!/usr/bin/env python
+"""
+Builds the approximate nearest neighbours index used by the recommendation API, from a scroll export of the document
+embedding vectors in Elasticsearch.
+
+Usage: python scripts/build_ann_index.py [options] <output directory>
+"""
+import math
+import logging
+import argparse
+import numpy as np
+
+from elasticsearch import Elasticsearch
+from elasticsearch.helpers import scan
+
+from dp_conceptual_search.config import CONFIG
+from dp_conceptual_search.ons.search.fields import AvailableFields
+from dp_conceptual_search.search.vector_encoding import decode_vector
+from dp_conceptual_search.ml.nearest_neighbours import IVFIndex
+
+
+def export_embedding_vectors(client: Elasticsearch, index: str, scroll_size: int):
+    """
+    Scrolls through all documents with an embedding vector, returning their ids and (decoded) vectors
+    :param client:
+    :param index:
+    :param scroll_size:
+    :return:
+    """
+    field = AvailableFields.EMBEDDING_VECTOR.value.name
+    query = {
+        "query": {"exists": {"field": field}},
+        "_source": [field]
+    }
+
+    ids = []
+    vectors = []
+    for hit in scan(client, query=query, index=index, size=scroll_size):
+        ids.append(hit["_id"])
+        vectors.append(decode_vector(hit["_source"][field]))
+
+    return ids, np.vstack(vectors)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Build the approximate nearest neighbours index of embedding vectors")
+    parser.add_argument("directory", help="Output directory")
+    parser.add_argument("--server", default=CONFIG.ELASTIC_SEARCH.server, help="Elasticsearch server")
+    parser.add_argument("--index", default=CONFIG.SEARCH.search_index, help="Elasticsearch index")
+    parser.add_argument("--num-lists", type=int, default=None,
+                        help="Number of index partitions (defaults to 4 * sqrt(number of documents))")
+    parser.add_argument("--iterations", type=int, default=20, help="Number of k-means iterations")
+    parser.add_argument("--sample-size", type=int, default=None, help="Max number of vectors to train k-means on")
+    parser.add_argument("--scroll-size", type=int, default=1000, help="Number of documents per scroll request")
+    parser.add_argument("--seed", type=int, default=None, help="Random seed")
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.INFO)
+
+    client = Elasticsearch(args.server, timeout=CONFIG.ELASTIC_SEARCH.timeout)
+    ids, vectors = export_embedding_vectors(client, args.index, args.scroll_size)
+    logging.info("Exported %d embedding vectors from index '%s'", len(ids), args.index)
+
+    num_lists = args.num_lists
+    if num_lists is None:
+        num_lists = min(len(ids), int(4 * math.sqrt(len(ids))))
+
+    index = IVFIndex.build(vectors, ids, num_lists, num_iterations=args.iterations, sample_size=args.sample_size,
+                           seed=args.seed)
+    index.save(args.directory)
+    logging.info("Saved index of %d vectors (%d lists) to '%s'", len(index), index.num_lists, args.directory)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,42 @@
+#!/usr/bin/env python
+"""
+Builds the spellcheck (symmetric delete) index over the unsupervised fastText model vocabulary, and writes it to a
+binary file which the app memory maps at startup (instead of building the index in every worker).
+
+Usage: python scripts/build_spellcheck_index.py [options] <output file>
+"""
+import time
+import logging
+import argparse
+
+from typing import List
+
+from dp_conceptual_search.config import CONFIG
+from dp_conceptual_search.ml.spelling.spell_checker import SpellChecker
+from dp_conceptual_search.ml.spelling.symmetric_delete_index import SymmetricDeleteIndex
+from dp_conceptual_search.ml.word_embedding.fastText.unsupervised import UnsupervisedModel
+
+
+def main(argv: List[str]=None):
+    parser = argparse.ArgumentParser(description="Build the spellcheck index of the unsupervised model vocabulary")
+    parser.add_argument("filename", help="Output file")
+    parser.add_argument("--model", default=CONFIG.ML.unsupervised_model_filename, help="Unsupervised model filename")
+    parser.add_argument("--max-distance", type=int, default=2, help="Max edit distance of corrections")
+    parser.add_argument("--prefix-length", type=int, default=7, help="Number of leading characters indexed per word")
+    args = parser.parse_args(argv)
+
+    logging.basicConfig(level=logging.INFO)
+
+    model = UnsupervisedModel(args.model)
+    vocabulary = SpellChecker(model, use_index=False).vocabulary()
+    logging.info("Loaded vocabulary of %d words from '%s'", len(vocabulary), args.model)
+
+    start = time.perf_counter()
+    index = SymmetricDeleteIndex.build(vocabulary, max_distance=args.max_distance, prefix_length=args.prefix_length)
+    index.save(args.filename)
+    logging.info("Saved index of %d words (%d deletion keys) to '%s' in %.2fs", len(index), len(index.keys),
+                 args.filename, time.perf_counter() - start)
+
+
+if __name__ == "__main__":
+    main()
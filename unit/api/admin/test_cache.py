@@ -0,0 +1,63 @@
+"""
+Tests the admin cache API
+"""
+from json import dumps
+from numpy import zeros
+
+from unittest import mock
+
+from unit.utils.search_test_app import SearchTestApp
+from unit.elasticsearch.elasticsearch_test_utils import mock_search_client
+
+from dp_conceptual_search.app.search_app import SearchApp
+from dp_conceptual_search.app.elasticsearch.elasticsearch_client_service import ElasticsearchClientService
+
+
+class AdminCacheApiTestCase(SearchTestApp):
+
+    @mock.patch.object(ElasticsearchClientService, '_init_client', mock_search_client)
+    def test_purge_search_result_cache(self):
+        """
+        Tests that the search result cache can be purged, and stats are returned
+        :return:
+        """
+        target = "/search/content?{q}".format(q=self.url_encode({"q": "Zuul"}))
+        data = dumps({"sort_by": "relevance"})
+
+        self.post(target, 200, data=data)
+        request, response = self.post(target, 200, data=data)
+        self.assertEqual(response.headers.get(SearchApp.CACHE_STATUS_HEADER), SearchApp.CACHE_HIT)
+
+        # Check the cache stats
+        request, response = self.get("/admin/cache", 200)
+        stats = response.json["search_results"]
+        self.assertEqual(stats["size"], 1)
+        self.assertEqual(stats["hits"], 1)
+        self.assertEqual(stats["misses"], 1)
+
+        # Purge the cache
+        request, response = self.app.test_client.delete("/admin/cache/search")
+        self.assertEqual(response.status, 200)
+        self.assertEqual(response.json["search_results"]["size"], 0)
+
+        # The next request should miss
+        request, response = self.post(target, 200, data=data)
+        self.assertEqual(response.headers.get(SearchApp.CACHE_STATUS_HEADER), SearchApp.CACHE_MISS)
+        self.assertEqual(self.mock_client.search.call_count, 2)
+
+    @mock.patch.object(ElasticsearchClientService, '_init_client', mock_search_client)
+    def test_purge_embedding_vector_cache(self):
+        """
+        Tests that the embedding vector cache can be purged
+        :return:
+        """
+        self.app.embedding_vector_cache.set("/uri", zeros(10), "2018-01-01")
+
+        request, response = self.get("/admin/cache", 200)
+        self.assertEqual(response.json["embedding_vectors"]["size"], 1)
+
+        # Purge the cache
+        request, response = self.app.test_client.delete("/admin/cache/vectors")
+        self.assertEqual(response.status, 200)
+        self.assertEqual(response.json["embedding_vectors"]["size"], 0)
+        self.assertIsNone(self.app.embedding_vector_cache.get("/uri"))
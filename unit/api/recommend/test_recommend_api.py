@@ -147,4 +147,50 @@ class RecommendApiTestCase(SearchTestApp):
         results = data['results']
 
         expected_hits_highlighted = mock_hits_highlighted()
-        self.assertEqual(results, expected_hits_highlighted, "returned hits should match expected")
\ No newline at end of file
+        self.assertEqual(results, expected_hits_highlighted, "returned hits should match expected")
+    @mock.patch.object(ElasticsearchClientService, '_init_client', mock_recommend_search_client)
+    @mock.patch.object(FastTextClientService, 'get_fasttext_client', mock_fasttext_client)
+    def test_similar_by_uris_batch_api(self):
+        """
+        Tests the /recommend/similar/batch API returns results (or errors) for each uri with a single msearch
+        :return:
+        """
+        params = {
+            "page": 1,
+            "size": 10
+        }
+
+        data = {
+            "uris": [TEST_URI[1:], "/not/a/uri"],
+            "sort_by": SortField.relevance.name
+        }
+
+        target = "/recommend/similar/batch?{q}".format(q=self.url_encode(params))
+
+        # Make the request
+        request, response = self.post(target, 200, data=dumps(data))
+
+        # All vectors should be fetched with one mget, and all queries executed with one msearch
+        self.assertEqual(self.mock_client.mget.call_count, 1)
+        self.assertEqual(self.mock_client.msearch.call_count, 1)
+        self.mock_client.search.assert_not_called()
+
+        results = response.json["results"]
+        self.assertEqual(len(results), 2)
+
+        self.assertEqual(results[0]["uri"], TEST_URI[1:])
+        self.assertEqual(results[0]["status"], 200)
+        self.assertEqual(results[0]["results"]["results"], mock_hits_highlighted())
+
+        self.assertEqual(results[1]["uri"], "/not/a/uri")
+        self.assertEqual(results[1]["status"], 404)
+        self.assertIn("error", results[1])
+
+    @mock.patch.object(ElasticsearchClientService, '_init_client', mock_recommend_search_client)
+    def test_similar_by_uris_batch_api_invalid_uris(self):
+        """
+        Tests the /recommend/similar/batch API rejects requests without a list of uris
+        :return:
+        """
+        self.post("/recommend/similar/batch", 400, data=dumps({"uris": []}))
+        self.post("/recommend/similar/batch", 400, data=dumps({"uri": TEST_URI}))
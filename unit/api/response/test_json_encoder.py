@@ -0,0 +1,65 @@
+"""
+Tests the incremental JSON encoder used for streamed responses
+"""
+import json
+from unittest import TestCase
+
+from dp_conceptual_search.api.response.json_encoder import iter_json, iter_json_chunks
+
+
+class JsonEncoderTestCase(TestCase):
+
+    @property
+    def body(self) -> dict:
+        """
+        Mock combined search response body
+        :return:
+        """
+        return {
+            "content": {
+                "numberOfResults": 3,
+                "took": 10,
+                "results": [{"uri": "/page/{0}".format(i), "description": {"title": "<strong>Zuul</strong>"}}
+                            for i in range(3)],
+                "paginator": {"currentPage": 1, "pages": [1]},
+                "sortBy": "relevance"
+            },
+            "counts": {"numberOfResults": 3, "docCounts": {"bulletin": 3}},
+            "featured": {"numberOfResults": 0, "results": []},
+            "empty": {},
+            "text": "quote \" and unicode é"
+        }
+
+    def test_iter_json(self):
+        """
+        Tests that the incremental encoding decodes to the original body
+        :return:
+        """
+        self.assertEqual(json.loads("".join(iter_json(self.body))), self.body)
+
+        for value in [None, 1, 1.5, "Zuul", [], [1, 2], {}]:
+            self.assertEqual(json.loads("".join(iter_json(value))), value)
+
+    def test_iter_json_encodes_list_items_whole(self):
+        """
+        Tests that each list item (i.e search hit) is encoded in one piece
+        :return:
+        """
+        parts = list(iter_json(self.body))
+
+        for hit in self.body["content"]["results"]:
+            self.assertIn(json.dumps(hit, separators=(",", ":")), parts)
+
+    def test_iter_json_chunks(self):
+        """
+        Tests that chunks are at least chunk_size characters (except the last), and decode to the original body
+        :return:
+        """
+        chunk_size = 32
+        chunks = list(iter_json_chunks(self.body, chunk_size))
+
+        self.assertGreater(len(chunks), 1)
+        for chunk in chunks[:-1]:
+            self.assertGreaterEqual(len(chunk), chunk_size)
+
+        self.assertEqual(json.loads("".join(chunks)), self.body)
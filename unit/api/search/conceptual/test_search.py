@@ -0,0 +1,86 @@
+"""
+Tests the combined ONS conceptual search API
+"""
+from json import dumps
+from numpy.random import rand
+
+from unittest import mock
+
+from unit.utils.search_test_app import SearchTestApp
+from unit.elasticsearch.elasticsearch_test_utils import mock_search_client
+
+from dp_conceptual_search.ons.conceptual.client import ConceptualSearchEngine
+from dp_conceptual_search.app.elasticsearch.elasticsearch_client_service import ElasticsearchClientService
+
+
+class SearchApiTestCase(SearchTestApp):
+
+    @property
+    def search_term(self):
+        """
+        Mock search term to be used for testing
+        :return:
+        """
+        return "Zuul"
+
+    @mock.patch.object(ElasticsearchClientService, '_init_client', mock_search_client)
+    def test_conceptual_search_params_resolved_once(self):
+        """
+        Tests that the labels and search vector are only resolved once per request, and shared by all sub-queries
+        :return:
+        """
+        calls = []
+
+        async def mock_conceptual_search_params(engine, search_term, num_labels, threshold, **kwargs):
+            calls.append(search_term)
+            return ["these", "are", "a", "test"], rand(10)
+
+        params = {
+            "q": self.search_term
+        }
+        url_encoded_params = self.url_encode(params)
+
+        target = "/search/conceptual?{q}".format(q=url_encoded_params)
+
+        # Make the request
+        with mock.patch.object(ConceptualSearchEngine, 'conceptual_search_params', mock_conceptual_search_params):
+            request, response = self.get(target, 200)
+
+        self.assertEqual(calls, [self.search_term], "expected conceptual search params to be resolved exactly once")
+
+        # Content and type counts queries should both have been executed
+        data = response.json
+        self.assertIn("content", data, "response should contain key 'content'")
+        self.assertIn("counts", data, "response should contain key 'counts'")
+
+    @mock.patch.object(ElasticsearchClientService, '_init_client', mock_search_client)
+    def test_type_counts_not_folded_when_not_sorted_by_relevance(self):
+        """
+        Tests that the type counts aren't computed by the content query when it isn't sorted by relevance, as the
+        content query then falls back to the keyword query (and would return keyword only counts)
+        :return:
+        """
+        async def mock_conceptual_search_params(engine, search_term, num_labels, threshold, **kwargs):
+            return ["these", "are", "a", "test"], rand(10)
+
+        params = {
+            "q": self.search_term
+        }
+        url_encoded_params = self.url_encode(params)
+
+        target = "/search/conceptual?{q}".format(q=url_encoded_params)
+        data = dumps({"sort_by": "release_date"})
+
+        # Make the request
+        with mock.patch.object(ConceptualSearchEngine, 'conceptual_search_params', mock_conceptual_search_params):
+            request, response = self.post(target, 200, data=data)
+
+        body = self.mock_client.msearch.call_args[1]["body"]
+        self.assertEqual(len(body), 6, "expected separate content, type counts and featured result queries")
+
+        # The content query shouldn't compute the type counts
+        self.assertNotIn("aggs", body[1], "expected no type counts aggregation on the content query")
+        self.assertIn("aggs", body[3], "expected type counts aggregation on the type counts query")
+        self.assertEqual(body[3]["size"], 0, "expected type counts query to return no hits")
+
+        self.assertIn("counts", response.json, "response should contain key 'counts'")
@@ -11,6 +11,7 @@ from unit.elasticsearch.elasticsearch_test_utils import mock_search_client, mock
 from dp_fasttext.client.testing.mock_client import mock_labels_api, mock_sentence_vector, mock_fasttext_client
 
 from dp_conceptual_search.search.search_type import SearchType
+from dp_conceptual_search.search.query_helper import query_preference
 from dp_conceptual_search.app.elasticsearch.elasticsearch_client_service import ElasticsearchClientService
 
 from dp_conceptual_search.ons.search.index import Index
@@ -130,7 +131,8 @@ class SearchContentApiTestCase(SearchTestApp):
 
         # Assert search was called with correct arguments
         self.mock_client.search.assert_called_with(index=[Index.ONS.value], doc_type=[], body=expected,
-                                                   search_type=SearchType.DFS_QUERY_THEN_FETCH.value)
+                                                   search_type=SearchType.DFS_QUERY_THEN_FETCH.value,
+                                                   preference=query_preference(self.search_term))
 
         data = response.json
         results = data['results']
@@ -14,6 +14,7 @@ from dp_conceptual_search.config import SEARCH_CONFIG
 from dp_conceptual_search.app.elasticsearch.elasticsearch_client_service import ElasticsearchClientService
 
 from dp_conceptual_search.search.search_type import SearchType
+from dp_conceptual_search.search.query_helper import query_preference
 
 from dp_conceptual_search.ons.search.index import Index
 from dp_conceptual_search.ons.search.content_type import ContentType, AvailableContentTypes
@@ -108,4 +109,5 @@ class SearchTypeCountsApiTestCase(SearchTestApp):
 
         # Assert search was called with correct arguments
         self.mock_client.search.assert_called_with(index=[Index.ONS.value], doc_type=[], body=expected,
-                                                   search_type=SearchType.DFS_QUERY_THEN_FETCH.value)
+                                                   search_type=SearchType.QUERY_THEN_FETCH.value,
+                                                   request_cache=True, preference=query_preference(self.search_term))
@@ -0,0 +1,132 @@
+"""
+Tests the combined ONS search API
+"""
+from functools import partial
+from unittest import mock
+from unittest.mock import MagicMock
+
+from unit.utils.search_test_app import SearchTestApp
+from unit.elasticsearch.elasticsearch_test_utils import MockElasticsearchClient, mock_search, mock_msearch, \
+    mock_hits_highlighted
+
+from dp_conceptual_search.config.config import SEARCH_CONFIG
+from dp_conceptual_search.app.elasticsearch.elasticsearch_client_service import ElasticsearchClientService
+
+
+def mock_featured_failure_search(index=None, doc_type=None, body=None, params=None, **kwargs) -> dict:
+    """
+    Mock search method which fails for featured result queries (the only queries with a page size of 1)
+    :param index:
+    :param doc_type:
+    :param body:
+    :param params:
+    :param kwargs:
+    :return:
+    """
+    if body is not None and body.get("size") == 1:
+        raise Exception("Mock featured result query failure")
+    return mock_search(index=index, doc_type=doc_type, body=body, params=params, **kwargs)
+
+
+def mock_featured_failure_client(*args) -> MockElasticsearchClient:
+    """
+    Returns a mock Elasticsearch client which fails for featured result queries
+    :param args:
+    :return:
+    """
+    mock_client = MockElasticsearchClient()
+    mock_client.search = MagicMock()
+    mock_client.search.side_effect = mock_featured_failure_search
+
+    mock_client.msearch = MagicMock()
+    mock_client.msearch.side_effect = partial(mock_msearch, search=mock_featured_failure_search)
+
+    return mock_client
+
+
+class SearchApiTestCase(SearchTestApp):
+
+    @property
+    def search_term(self):
+        """
+        Mock search term to be used for testing
+        :return:
+        """
+        return "Zuul"
+
+    def assert_partial_results(self, data: dict):
+        """
+        Asserts that the combined search response contains content and type counts results, and an empty featured
+        result
+        :param data:
+        :return:
+        """
+        for key in ["content", "counts", "featured"]:
+            self.assertIn(key, data, "response should contain key '{0}'".format(key))
+
+        self.assertEqual(data["content"]["results"], mock_hits_highlighted(), "returned hits should match expected")
+        self.assertEqual(data["counts"]["numberOfResults"], 3, "expected type counts to be returned")
+
+        # Featured result query failed, so expect an empty result
+        self.assertEqual(data["featured"]["numberOfResults"], 0, "expected empty featured result")
+        self.assertEqual(data["featured"]["results"], [], "expected empty featured result")
+
+    @mock.patch.object(ElasticsearchClientService, '_init_client', mock_featured_failure_client)
+    def test_search_partial_results(self):
+        """
+        Tests that the combined search API sends all sub-queries in a single multi search request, and returns content
+        and type counts results when the featured result query fails
+        :return:
+        """
+        params = {
+            "q": self.search_term
+        }
+        url_encoded_params = self.url_encode(params)
+
+        target = "/search?{q}".format(q=url_encoded_params)
+
+        # Make the request
+        request, response = self.get(target, 200)
+
+        # Assert all three sub-queries were sent in one request
+        self.assertEqual(self.mock_client.msearch.call_count, 1, "expected a single multi search request")
+        self.assertEqual(self.mock_client.search.call_count, 0, "expected no individual search requests")
+
+        body = self.mock_client.msearch.call_args[1]["body"]
+        self.assertEqual(len(body), 4, "expected two sub-queries (header and body each) to be executed")
+
+        # Type counts should be computed by the content query
+        self.assertIn("aggs", body[1], "expected type counts aggregation on the content query")
+        self.assertGreater(body[1]["size"], 0, "expected content query to return hits")
+
+        # Only the optional featured result query should carry its own timeout
+        self.assertNotIn("timeout", body[1], "expected no timeout on the content query")
+        self.assertEqual(body[3]["timeout"], "{0}ms".format(int(SEARCH_CONFIG.featured_result_query_timeout * 1000)),
+                         "expected featured result query timeout in the search body")
+
+        self.assert_partial_results(response.json)
+
+    @mock.patch.object(SEARCH_CONFIG, 'multi_search_enabled', False)
+    @mock.patch.object(SEARCH_CONFIG, 'combined_type_counts_enabled', False)
+    @mock.patch.object(ElasticsearchClientService, '_init_client', mock_featured_failure_client)
+    def test_search_partial_results_fan_out(self):
+        """
+        Tests that the combined search API returns content and type counts results when the featured result query fails,
+        with multi search and combined type counts disabled
+        :return:
+        """
+        params = {
+            "q": self.search_term
+        }
+        url_encoded_params = self.url_encode(params)
+
+        target = "/search?{q}".format(q=url_encoded_params)
+
+        # Make the request
+        request, response = self.get(target, 200)
+
+        # Assert all three sub-queries were sent
+        self.assertEqual(self.mock_client.search.call_count, 3, "expected three sub-queries to be executed")
+        self.assertEqual(self.mock_client.msearch.call_count, 0, "expected no multi search requests")
+
+        self.assert_partial_results(response.json)
@@ -12,6 +12,7 @@ from unit.elasticsearch.elasticsearch_test_utils import mock_search_client, mock
 from dp_conceptual_search.config import CONFIG
 from dp_conceptual_search.ons.search.index import Index
 from dp_conceptual_search.search.search_type import SearchType
+from dp_conceptual_search.search.query_helper import query_preference
 from dp_conceptual_search.ons.search.sort_fields import query_sort, SortField
 from dp_conceptual_search.ons.search.fields import get_highlighted_fields, Field
 from dp_conceptual_search.ons.search.content_type import AvailableContentTypes, ContentType
@@ -136,7 +137,8 @@ class SearchContentApiTestCase(SearchTestApp):
 
         # Assert search was called with correct arguments
         self.mock_client.search.assert_called_with(index=[Index.ONS.value], doc_type=[], body=expected,
-                                                   search_type=SearchType.DFS_QUERY_THEN_FETCH.value)
+                                                   search_type=SearchType.DFS_QUERY_THEN_FETCH.value,
+                                                   preference=query_preference(self.search_term))
 
         data = response.json
         results = data['results']
@@ -144,6 +146,31 @@ class SearchContentApiTestCase(SearchTestApp):
         expected_hits_highlighted = mock_hits_highlighted()
         self.assertEqual(results, expected_hits_highlighted, "returned hits should match expected")
 
+    @mock.patch.object(ElasticsearchClientService, '_init_client', mock_search_client)
+    def test_content_query_streamed(self):
+        """
+        Tests that content query responses for large page sizes are streamed, and match the non-streamed response
+        :return:
+        """
+        params = {
+            "q": self.search_term,
+            "page": 1,
+            "size": CONFIG.SEARCH.streaming_response_min_page_size
+        }
+
+        target = "/search/content?{q}".format(q=self.url_encode(params))
+
+        # Make the request
+        request, response = self.get(target, 200)
+
+        self.assertEqual(response.headers.get("Transfer-Encoding"), "chunked", "expected a streamed response")
+        self.assertEqual(response.headers.get("Content-Type"), "application/json")
+        self.assertIn("X-Request-Id", response.headers)
+
+        data = response.json
+        self.assertEqual(data['results'], mock_hits_highlighted(), "returned hits should match expected")
+        self.assertEqual(data['numberOfResults'], len(mock_hits_highlighted()))
+
     def test_max_request_size_400(self):
         """
         Test that making a request where the page size if greater than the max allowed raises a 400 BAD_REQUEST
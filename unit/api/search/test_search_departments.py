@@ -8,6 +8,7 @@ from unit.elasticsearch.elasticsearch_test_utils import mock_search_client, mock
 
 from dp_conceptual_search.ons.search.index import Index
 from dp_conceptual_search.search.search_type import SearchType
+from dp_conceptual_search.search.query_helper import query_preference
 from dp_conceptual_search.app.elasticsearch.elasticsearch_client_service import ElasticsearchClientService
 
 
@@ -83,7 +84,8 @@ class SearchDepartmentsApiTestCase(SearchTestApp):
 
         # Assert search was called with correct arguments
         self.mock_client.search.assert_called_with(index=[Index.DEPARTMENTS.value], doc_type=[], body=expected,
-                                                   search_type=SearchType.DFS_QUERY_THEN_FETCH.value)
+                                                   search_type=SearchType.DFS_QUERY_THEN_FETCH.value,
+                                                   preference=query_preference(self.search_term))
 
         data = response.json
         results = data['results']
@@ -0,0 +1,112 @@
+"""
+Tests the search result cache
+"""
+from json import dumps
+from functools import partial
+
+from unittest import mock
+from unittest.mock import MagicMock
+
+from unit.utils.search_test_app import SearchTestApp
+from unit.mocks.mock_es_client import MockElasticsearchClient
+from unit.elasticsearch.elasticsearch_test_utils import mock_search_client, mock_search, mock_msearch
+
+from dp_conceptual_search.app.search_app import SearchApp
+from dp_conceptual_search.app.elasticsearch.elasticsearch_client_service import ElasticsearchClientService
+
+
+def mock_featured_timeout_search(index=None, doc_type=None, body=None, params=None, **kwargs) -> dict:
+    """
+    Mock search method which reports a timeout for featured result queries (the only queries with a page size of 1)
+    :param index:
+    :param doc_type:
+    :param body:
+    :param params:
+    :param kwargs:
+    :return:
+    """
+    response = mock_search(index=index, doc_type=doc_type, body=body, params=params, **kwargs)
+    if body is not None and body.get("size") == 1:
+        response = dict(response, timed_out=True)
+    return response
+
+
+def mock_featured_timeout_client(*args) -> MockElasticsearchClient:
+    """
+    Returns a mock Elasticsearch client which reports a timeout for featured result queries
+    :param args:
+    :return:
+    """
+    mock_client = MockElasticsearchClient()
+    mock_client.search = MagicMock()
+    mock_client.search.side_effect = mock_featured_timeout_search
+
+    mock_client.msearch = MagicMock()
+    mock_client.msearch.side_effect = partial(mock_msearch, search=mock_featured_timeout_search)
+
+    return mock_client
+
+
+class SearchResultCacheTestCase(SearchTestApp):
+
+    @property
+    def search_term(self):
+        """
+        Mock search term to be used for testing
+        :return:
+        """
+        return "Zuul"
+
+    def content_query_target(self, search_term: str) -> str:
+        params = {
+            "q": search_term,
+            "page": 1,
+            "size": 10
+        }
+
+        return "/search/content?{q}".format(q=self.url_encode(params))
+
+    @mock.patch.object(ElasticsearchClientService, '_init_client', mock_search_client)
+    def test_repeated_content_query_cached(self):
+        """
+        Tests that a repeated content query is served from the cache without querying Elasticsearch
+        :return:
+        """
+        data = dumps({"sort_by": "relevance"})
+
+        request, response = self.post(self.content_query_target(self.search_term), 200, data=data)
+        self.assertEqual(response.headers.get(SearchApp.CACHE_STATUS_HEADER), SearchApp.CACHE_MISS)
+        self.assertEqual(self.mock_client.search.call_count, 1)
+
+        # Whitespace differences shouldn't affect the cache key
+        request, cached_response = self.post(self.content_query_target(" {0}  ".format(self.search_term)), 200,
+                                             data=data)
+        self.assertEqual(cached_response.headers.get(SearchApp.CACHE_STATUS_HEADER), SearchApp.CACHE_HIT)
+        self.assertEqual(self.mock_client.search.call_count, 1)
+
+        self.assertEqual(cached_response.json, response.json)
+
+        # A different sort order should miss
+        request, response = self.post(self.content_query_target(self.search_term), 200,
+                                      data=dumps({"sort_by": "release_date"}))
+        self.assertEqual(response.headers.get(SearchApp.CACHE_STATUS_HEADER), SearchApp.CACHE_MISS)
+        self.assertEqual(self.mock_client.search.call_count, 2)
+
+    @mock.patch.object(ElasticsearchClientService, '_init_client', mock_featured_timeout_client)
+    def test_timed_out_sub_query_not_cached(self):
+        """
+        Tests that the partial results of a timed out sub-query are returned, but not cached
+        :return:
+        """
+        target = "/search?{q}".format(q=self.url_encode({"q": self.search_term}))
+
+        self.get(target, 200)
+        self.assertEqual(self.mock_client.msearch.call_count, 1)
+
+        # Content and type counts should be cached, but the timed out featured result query should be executed again
+        self.get(target, 200)
+        self.assertEqual(self.mock_client.msearch.call_count, 2)
+
+        body = self.mock_client.msearch.call_args[1]["body"]
+        self.assertEqual(len(body), 2, "expected only the featured result query to be executed")
+        self.assertEqual(body[1]["size"], 1, "expected only the featured result query to be executed")
@@ -11,6 +11,7 @@ from unit.elasticsearch.elasticsearch_test_utils import mock_search_client
 
 from dp_conceptual_search.ons.search.index import Index
 from dp_conceptual_search.search.search_type import SearchType
+from dp_conceptual_search.search.query_helper import query_preference
 from dp_conceptual_search.ons.search.sort_fields import query_sort, SortField
 from dp_conceptual_search.ons.search.content_type import AvailableContentTypes, ContentType
 from dp_conceptual_search.app.elasticsearch.elasticsearch_client_service import ElasticsearchClientService
@@ -119,4 +120,5 @@ class SearchTypeCountsApiTestCase(SearchTestApp):
 
         # Assert search was called with correct arguments
         self.mock_client.search.assert_called_with(index=[Index.ONS.value], doc_type=[], body=expected,
-                                                   search_type=SearchType.DFS_QUERY_THEN_FETCH.value)
+                                                   search_type=SearchType.QUERY_THEN_FETCH.value,
+                                                   request_cache=True, preference=query_preference(self.search_term))
@@ -1,8 +1,13 @@
 """
 Tests the spellcheck spell checker API
 """
+from json import dumps
+from unittest import mock
+
 from unit.utils.search_test_app import SearchTestApp
 
+from dp_conceptual_search.config import ML_CONFIG
+
 
 class SpellCheckTestCase(SearchTestApp):
 
@@ -89,3 +94,63 @@ class SpellCheckTestCase(SearchTestApp):
 
         # Make the request and assert a 400 BAD_REQUEST response
         request, response = self.get(target, 400)
+
+    def test_spell_check_batch(self):
+        """
+        Tests the /spellcheck/batch API returns suggestions for each query
+        :return:
+        """
+        sample_words = self.sample_words
+
+        queries = ["rpo cpl", "infltion", "rpo", "inflation", " "]
+        data = {
+            "queries": queries
+        }
+
+        # Make the request
+        request, response = self.post("/spellcheck/batch", 200, data=dumps(data))
+
+        results = response.json["results"]
+        self.assertEqual(len(results), len(queries), "expected one result per query")
+
+        for query, result in zip(queries, results):
+            self.assertEqual(result["query"], query)
+
+            expected = sorted(token for token in set(query.split()) if token in sample_words)
+            self.assertEqual([suggestion["input_token"] for suggestion in result["results"]], expected,
+                             "unexpected suggestions for query '{0}'".format(query))
+
+            for suggestion in result["results"]:
+                self.assertEqual(suggestion["correction"], sample_words[suggestion["input_token"]])
+                self.assertGreater(suggestion["probability"], 0.0)
+
+    def test_spell_check_batch_pool(self):
+        """
+        Tests that the /spellcheck/batch API returns the same suggestions when corrected in the process pool
+        :return:
+        """
+        sample_words = self.sample_words
+        data = {
+            "queries": list(sample_words.keys())
+        }
+
+        with mock.patch.object(ML_CONFIG, 'spellcheck_pool_min_tokens', 1):
+            request, response = self.post("/spellcheck/batch", 200, data=dumps(data))
+
+        results = response.json["results"]
+        self.assertEqual(len(results), len(sample_words))
+        for result in results:
+            self.assertEqual(len(result["results"]), 1)
+            self.assertEqual(result["results"][0]["correction"], sample_words[result["query"]])
+
+    def test_spell_check_batch_invalid_queries(self):
+        """
+        Tests that the /spellcheck/batch API rejects requests without a valid list of queries
+        :return:
+        """
+        self.post("/spellcheck/batch", 400, data=dumps({"queries": []}))
+        self.post("/spellcheck/batch", 400, data=dumps({"queries": ["rpo", 1]}))
+        self.post("/spellcheck/batch", 400, data=dumps({"q": "rpo"}))
+
+        with mock.patch.object(ML_CONFIG, 'spellcheck_max_batch_size', 1):
+            self.post("/spellcheck/batch", 400, data=dumps({"queries": ["rpo", "cpl"]}))
@@ -0,0 +1,80 @@
+"""
+Tests the bounded executor used to run CPU bound model calls off the ioloop
+"""
+import time
+import asyncio
+from threading import Event
+from unittest import TestCase
+from unit.utils.async_test import AsyncTestCase
+
+from dp_conceptual_search.app.executor import BoundedExecutor, ExecutorRejectedException, ExecutorTimeoutException
+
+
+class BoundedExecutorTestCase(AsyncTestCase, TestCase):
+
+    def test_run(self):
+        """
+        Tests that calls return their result, and are counted as complete
+        :return:
+        """
+        executor = BoundedExecutor("test", max_workers=2, max_pending=2, timeout=1.0)
+
+        async def async_test_function():
+            try:
+                self.assertEqual(await executor.run(sum, [1, 2, 3]), 6)
+
+                # Let the done callback run on the ioloop
+                await asyncio.sleep(0.01)
+                self.assertEqual(executor.pending, 0)
+                self.assertEqual(executor.to_dict()["completed"], 1)
+            finally:
+                executor.shutdown()
+
+        self.run_async(async_test_function)
+
+    def test_reject(self):
+        """
+        Tests that calls beyond max_pending are rejected immediately
+        :return:
+        """
+        executor = BoundedExecutor("test", max_workers=1, max_pending=1, timeout=1.0)
+        event = Event()
+
+        async def async_test_function():
+            try:
+                blocked = asyncio.ensure_future(executor.run(event.wait))
+                await asyncio.sleep(0.01)
+                self.assertEqual(executor.pending, 1)
+
+                with self.assertRaises(ExecutorRejectedException):
+                    await executor.run(sum, [1, 2, 3])
+                self.assertEqual(executor.to_dict()["rejected"], 1)
+
+                event.set()
+                self.assertTrue(await blocked)
+            finally:
+                event.set()
+                executor.shutdown()
+
+        self.run_async(async_test_function)
+
+    def test_timeout(self):
+        """
+        Tests that slow calls time out, but still count as pending until their thread finishes
+        :return:
+        """
+        executor = BoundedExecutor("test", max_workers=1, max_pending=2, timeout=0.05)
+
+        async def async_test_function():
+            try:
+                with self.assertRaises(ExecutorTimeoutException):
+                    await executor.run(time.sleep, 0.2)
+                self.assertEqual(executor.to_dict()["timeouts"], 1)
+                self.assertEqual(executor.pending, 1)
+
+                await asyncio.sleep(0.3)
+                self.assertEqual(executor.pending, 0)
+            finally:
+                executor.shutdown()
+
+        self.run_async(async_test_function)
@@ -0,0 +1,87 @@
+"""
+Tests the LRU cache implementation
+"""
+from unittest import TestCase
+
+from dp_conceptual_search.cache import LRUCache
+
+
+class MockTimer(object):
+    def __init__(self):
+        self.time = 0.0
+
+    def __call__(self) -> float:
+        return self.time
+
+
+class LRUCacheTestCase(TestCase):
+
+    def test_get_set(self):
+        """
+        Tests cached values are returned, and hits/misses are counted
+        :return:
+        """
+        cache = LRUCache(2)
+
+        self.assertIsNone(cache.get("a"))
+        cache.set("a", 1)
+        self.assertEqual(cache.get("a"), 1)
+        self.assertIn("a", cache)
+
+        self.assertEqual(cache.stats.hits, 1)
+        self.assertEqual(cache.stats.misses, 1)
+        self.assertEqual(cache.stats.hit_rate, 0.5)
+
+    def test_lru_eviction(self):
+        """
+        Tests the least recently used entry is evicted when the cache is full
+        :return:
+        """
+        cache = LRUCache(2)
+
+        cache.set("a", 1)
+        cache.set("b", 2)
+
+        # Touch 'a', so 'b' becomes the least recently used entry
+        cache.get("a")
+        cache.set("c", 3)
+
+        self.assertEqual(len(cache), 2)
+        self.assertNotIn("b", cache)
+        self.assertEqual(cache.get("a"), 1)
+        self.assertEqual(cache.get("c"), 3)
+        self.assertEqual(cache.stats.evictions, 1)
+
+    def test_ttl(self):
+        """
+        Tests entries expire after the configured TTL
+        :return:
+        """
+        timer = MockTimer()
+        cache = LRUCache(2, ttl=10.0, timer=timer)
+
+        cache.set("a", 1)
+        timer.time = 9.0
+        self.assertEqual(cache.get("a"), 1)
+
+        timer.time = 10.0
+        self.assertIsNone(cache.get("a"))
+        self.assertEqual(len(cache), 0)
+        self.assertEqual(cache.stats.expirations, 1)
+
+    def test_invalidate(self):
+        """
+        Tests entries can be invalidated individually and cleared
+        :return:
+        """
+        cache = LRUCache(4)
+
+        cache.set("a", 1)
+        cache.set("b", 2)
+
+        self.assertTrue(cache.invalidate("a"))
+        self.assertFalse(cache.invalidate("a"))
+        self.assertNotIn("a", cache)
+
+        cache.clear()
+        self.assertEqual(len(cache), 0)
@@ -0,0 +1,54 @@
+"""
+Tests the LRU cache which is cleared across processes using a shared generation counter
+"""
+import os
+import tempfile
+from unittest import TestCase
+
+from dp_conceptual_search.cache import SharedGenerationLRUCache
+
+
+class SharedGenerationLRUCacheTestCase(TestCase):
+
+    def setUp(self):
+        fd, self.filename = tempfile.mkstemp()
+        os.close(fd)
+
+    def tearDown(self):
+        os.remove(self.filename)
+
+    def get_cache(self) -> SharedGenerationLRUCache:
+        return SharedGenerationLRUCache(16, self.filename)
+
+    def test_entries_are_local(self):
+        """
+        Tests entries are only cached in the instance (i.e the worker) which set them
+        :return:
+        """
+        worker1 = self.get_cache()
+        worker2 = self.get_cache()
+
+        worker1.set("a", 1)
+        self.assertEqual(worker1.get("a"), 1)
+        self.assertIsNone(worker2.get("a"))
+
+    def test_clear_all_workers(self):
+        """
+        Tests clearing the cache in one instance clears it in every instance sharing the generation file
+        :return:
+        """
+        worker1 = self.get_cache()
+        worker2 = self.get_cache()
+
+        worker1.set("a", 1)
+        worker2.set("a", 2)
+
+        worker1.clear()
+        self.assertEqual(len(worker1), 0)
+        self.assertIsNone(worker2.get("a"))
+        self.assertNotIn("a", worker2)
+
+        # Entries cached after the purge are kept
+        worker2.set("a", 3)
+        self.assertEqual(worker2.get("a"), 3)
+        self.assertEqual(worker1.to_dict()["generation"], worker2.to_dict()["generation"])
@@ -0,0 +1,129 @@
+"""
+Tests the shared memory cache implementation
+"""
+import os
+import tempfile
+from unittest import TestCase
+
+from numpy.random import rand
+
+from dp_conceptual_search.cache import SharedMemoryCache
+from dp_conceptual_search.ons.conceptual.client.conceptual_search_params_cache import ConceptualSearchParamsCache
+
+from unit.cache.test_lru_cache import MockTimer
+
+
+class SharedMemoryCacheTestCase(TestCase):
+
+    def setUp(self):
+        fd, self.filename = tempfile.mkstemp()
+        os.close(fd)
+
+    def tearDown(self):
+        os.remove(self.filename)
+
+    def get_cache(self, **kwargs) -> SharedMemoryCache:
+        kwargs.setdefault("slot_size", 256)
+        return SharedMemoryCache(self.filename, 16, **kwargs)
+
+    def test_shared_between_instances(self):
+        """
+        Tests values written by one cache instance (i.e a worker) are visible to another
+        :return:
+        """
+        worker1 = self.get_cache()
+        worker2 = self.get_cache()
+
+        key = ("1", "inflation", 5, 0.0)
+        self.assertTrue(worker1.set(key, {"labels": ["cpi"]}))
+
+        self.assertEqual(worker2.get(key), {"labels": ["cpi"]})
+        self.assertIsNone(worker2.get(("1", "gdp", 5, 0.0)))
+
+        self.assertEqual(worker2.stats.hits, 1)
+        self.assertEqual(worker2.stats.misses, 1)
+        self.assertEqual(len(worker2), 1)
+
+        worker2.clear()
+        self.assertNotIn(key, worker1)
+
+    def test_ttl(self):
+        """
+        Tests entries expire after the configured TTL
+        :return:
+        """
+        timer = MockTimer()
+        cache = self.get_cache(ttl=10.0, timer=timer)
+
+        cache.set("a", 1)
+        timer.time = 9.0
+        self.assertEqual(cache.get("a"), 1)
+
+        timer.time = 10.0
+        self.assertIsNone(cache.get("a"))
+        self.assertEqual(cache.stats.expirations, 1)
+
+    def test_torn_write(self):
+        """
+        Tests a corrupt (partially written) entry is treated as a miss
+        :return:
+        """
+        cache = self.get_cache()
+        cache.set("a", "value")
+
+        # Corrupt the last byte of the entry
+        with open(self.filename, "r+b") as f:
+            data = bytearray(f.read())
+            index = data.index(b'"value"') + len(b'"value"') - 1
+            f.seek(index)
+            f.write(b"X")
+
+        self.assertIsNone(self.get_cache().get("a"))
+
+    def test_entry_too_large(self):
+        """
+        Tests entries which don't fit in a slot are not cached
+        :return:
+        """
+        cache = self.get_cache()
+
+        self.assertFalse(cache.set("a", "x" * 1024))
+        self.assertNotIn("a", cache)
+
+    def test_conceptual_search_params(self):
+        """
+        Tests conceptual search params round trip through the shared memory backend
+        :return:
+        """
+        worker1 = ConceptualSearchParamsCache(max_size=16, ttl=60.0, model_version="1", backend="shared",
+                                              filename=self.filename)
+        worker2 = ConceptualSearchParamsCache(max_size=16, ttl=60.0, model_version="1", backend="shared",
+                                              filename=self.filename)
+
+        vector = rand(100)
+        worker1.set("inflation", 5, 0.0, ["cpi", "inflation"], vector)
+
+        labels, search_vector = worker2.get("inflation", 5, 0.0)
+        self.assertEqual(labels, ["cpi", "inflation"])
+        self.assertTrue((search_vector == vector).all())
+
+        # Keys include the model version
+        worker2.model_version = "2"
+        self.assertIsNone(worker2.get("inflation", 5, 0.0))
+
+    def test_conceptual_search_params_model_version_set_on_start(self):
+        """
+        Tests that a worker setting the model version on start doesn't clear entries cached by other workers
+        :return:
+        """
+        worker1 = ConceptualSearchParamsCache(max_size=16, ttl=60.0, model_version="1", backend="shared",
+                                              filename=self.filename)
+        worker1.set("inflation", 5, 0.0, ["cpi", "inflation"], rand(100))
+
+        # A restarted worker starts with the configured (empty) version, then sets the model version
+        worker2 = ConceptualSearchParamsCache(max_size=16, ttl=60.0, model_version="", backend="shared",
+                                              filename=self.filename)
+        worker2.model_version = "1"
+
+        labels, _ = worker2.get("inflation", 5, 0.0)
+        self.assertEqual(labels, ["cpi", "inflation"])
@@ -32,6 +32,37 @@ def mock_search(index=None, doc_type=None, body=None, params=None, **kwargs) ->
     return mock_search_response()
 
 
+def mock_msearch(index=None, doc_type=None, body=None, params=None, search=mock_search, **kwargs) -> dict:
+    """
+    Mock multi search method, which executes each search with the given mock search method. Searches which raise are
+    returned as errors in the multi search response.
+    :param index:
+    :param doc_type:
+    :param body: Alternating search headers and bodies
+    :param params:
+    :param search: Mock search method
+    :param kwargs:
+    :return:
+    """
+    responses = []
+    for header, query in zip(body[::2], body[1::2]):
+        try:
+            response = search(index=header.get("index", index), doc_type=header.get("type", doc_type), body=query)
+        except Exception as e:
+            response = {
+                "error": {
+                    "type": "exception",
+                    "reason": str(e)
+                },
+                "status": 500
+            }
+        responses.append(response)
+
+    return {
+        "responses": responses
+    }
+
+
 def mock_search_client(*args) -> MockElasticsearchClient:
     """
     Returns a mock Elasticsearch client for search
@@ -44,6 +75,9 @@ def mock_search_client(*args) -> MockElasticsearchClient:
     # Set side effect to call custom mock_search
     mock_client.search.side_effect = mock_search
 
+    mock_client.msearch = MagicMock()
+    mock_client.msearch.side_effect = mock_msearch
+
     return mock_client
 
 
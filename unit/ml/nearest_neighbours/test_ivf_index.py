@@ -0,0 +1,96 @@
+"""
+Tests the IVF approximate nearest neighbours index
+"""
+import shutil
+import tempfile
+import numpy as np
+from unittest import TestCase
+
+from dp_conceptual_search.ml.nearest_neighbours import IVFIndex
+
+
+class IVFIndexTestCase(TestCase):
+
+    def setUp(self):
+        """
+        Builds an index over clustered random vectors
+        :return:
+        """
+        random_state = np.random.RandomState(42)
+
+        centres = random_state.randn(20, 50)
+        self.vectors = np.repeat(centres, 50, axis=0) + 0.1 * random_state.randn(1000, 50)
+        self.ids = ["/doc/{0}".format(i) for i in range(len(self.vectors))]
+
+        self.index = IVFIndex.build(self.vectors, self.ids, 16, seed=42)
+
+    def exact_search(self, vector: np.ndarray, k: int) -> list:
+        """
+        Returns the ids of the k most similar vectors by brute force
+        :param vector:
+        :param k:
+        :return:
+        """
+        vectors = self.vectors / np.linalg.norm(self.vectors, axis=1, keepdims=True)
+        similarities = vectors @ (vector / np.linalg.norm(vector))
+
+        return [self.ids[i] for i in np.argsort(-similarities)[:k]]
+
+    def test_build(self):
+        """
+        Tests every vector is assigned to exactly one list
+        :return:
+        """
+        self.assertEqual(len(self.index), len(self.vectors))
+        self.assertEqual(self.index.num_lists, 16)
+        self.assertEqual(self.index.dimension, 50)
+        self.assertEqual(sorted(self.index.ids.tolist()), sorted(self.ids))
+        self.assertEqual(self.index.offsets[-1], len(self.vectors))
+        self.assertTrue(np.allclose(np.linalg.norm(self.index.vectors, axis=1), 1.0, atol=1e-5))
+
+    def test_search(self):
+        """
+        Tests search results are ordered by similarity, and agree with a brute force search
+        :return:
+        """
+        vector = self.vectors[123]
+        results = self.index.search(vector, 10, num_probes=4)
+
+        self.assertEqual(len(results), 10)
+        self.assertEqual(results[0][0], "/doc/123")
+        self.assertAlmostEqual(results[0][1], 1.0, places=5)
+
+        similarities = [similarity for _, similarity in results]
+        self.assertEqual(similarities, sorted(similarities, reverse=True))
+
+        # Probing every list is an exact search
+        exhaustive = self.index.search(vector, 10, num_probes=self.index.num_lists)
+        self.assertEqual([doc_id for doc_id, _ in exhaustive], self.exact_search(vector, 10))
+
+        recall = len(set(doc_id for doc_id, _ in results) & set(self.exact_search(vector, 10))) / 10.0
+        self.assertGreaterEqual(recall, 0.9)
+
+    def test_search_exclude(self):
+        """
+        Tests excluded ids are omitted from search results
+        :return:
+        """
+        results = self.index.search(self.vectors[123], 10, exclude=["/doc/123"])
+
+        self.assertEqual(len(results), 10)
+        self.assertNotIn("/doc/123", [doc_id for doc_id, _ in results])
+
+    def test_save_load(self):
+        """
+        Tests the index can be saved and memory mapped
+        :return:
+        """
+        directory = tempfile.mkdtemp()
+        try:
+            self.index.save(directory)
+            index = IVFIndex.load(directory)
+
+            self.assertIsInstance(index.vectors, np.memmap)
+            self.assertEqual(index.search(self.vectors[7], 5), self.index.search(self.vectors[7], 5))
+        finally:
+            shutil.rmtree(directory)
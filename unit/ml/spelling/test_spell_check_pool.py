@@ -0,0 +1,162 @@
+"""
+Tests the process pool used to correct batches of tokens
+"""
+import random
+import asyncio
+import multiprocessing
+from unittest import TestCase, mock
+from unit.utils.async_test import AsyncTestCase
+from unit.ml.spelling.test_symmetric_delete_index import MockModel
+
+from dp_conceptual_search.ml.spelling.spell_checker import SpellChecker, LETTERS
+from dp_conceptual_search.ml.spelling.spell_check_pool import SpellCheckPool
+from dp_conceptual_search.app.executor.bounded_executor import ExecutorRejectedException, ExecutorTimeoutException
+
+
+class SpellCheckPoolTestCase(AsyncTestCase, TestCase):
+
+    def setUp(self):
+        random_state = random.Random(3)
+        vocabulary = sorted({"".join(random_state.choice(LETTERS[:8]) for _ in range(random_state.randint(3, 9)))
+                             for _ in range(300)})
+        self.spell_checker = SpellChecker(MockModel(vocabulary))
+
+        words = [random_state.choice(vocabulary) for _ in range(50)]
+        self.tokens = words + [word[1:] + random_state.choice(LETTERS[:8]) for word in words]
+
+        self.expected = self.spell_checker.correct_tokens(self.tokens)
+        self.assertGreater(len(self.expected), 0)
+
+    def assert_corrections(self, corrections: dict):
+        self.assertEqual(set(corrections.keys()), set(self.expected.keys()))
+        for token, suggestion in corrections.items():
+            self.assertEqual(suggestion.to_dict(), self.expected[token].to_dict())
+
+    def test_correct_tokens_in_process(self):
+        """
+        Tests that batches smaller than min_tokens are corrected without starting the pool
+        :return:
+        """
+        pool = SpellCheckPool(self.spell_checker, processes=2, min_tokens=len(self.tokens) + 1)
+
+        async def async_test_function():
+            self.assert_corrections(await pool.correct_tokens(self.tokens))
+            self.assertIsNone(pool._pool)
+
+        self.run_async(async_test_function)
+
+    def test_correct_tokens_in_pool(self):
+        """
+        Tests that large batches corrected in worker processes match the in-process corrections
+        :return:
+        """
+        pool = SpellCheckPool(self.spell_checker, processes=2, min_tokens=1)
+
+        async def async_test_function():
+            try:
+                self.assert_corrections(await pool.correct_tokens(self.tokens))
+                self.assertIsNotNone(pool._pool)
+                self.assertEqual(pool.pending, 0)
+            finally:
+                pool.close()
+            self.assertIsNone(pool._pool)
+
+        self.run_async(async_test_function)
+
+    def test_start(self):
+        """
+        Tests that the worker processes are forked on start (and not at all if the pool is disabled)
+        :return:
+        """
+        disabled = SpellCheckPool(self.spell_checker, processes=0)
+        disabled.start()
+        self.assertIsNone(disabled._pool)
+
+        pool = SpellCheckPool(self.spell_checker, processes=2, min_tokens=1)
+        try:
+            pool.start()
+            self.assertIsNotNone(pool._pool)
+        finally:
+            pool.close()
+
+    def test_start_in_daemonic_process(self):
+        """
+        Tests that the pool is disabled (rather than failing to start) in daemonic processes, such as Sanic workers, and
+        that batches are then corrected in-process
+        :return:
+        """
+        context = multiprocessing.get_context("fork")
+        receiver, sender = context.Pipe(duplex=False)
+
+        def target():
+            try:
+                pool = SpellCheckPool(self.spell_checker, processes=2, min_tokens=1)
+                pool.start()
+
+                loop = asyncio.new_event_loop()
+                corrections = loop.run_until_complete(pool.correct_tokens(self.tokens))
+                loop.close()
+
+                sender.send((pool._pool is None, pool.processes, sorted(corrections.keys())))
+            except Exception as e:
+                sender.send(e)
+
+        process = context.Process(target=target, daemon=True)
+        process.start()
+        self.assertTrue(receiver.poll(10.0))
+        result = receiver.recv()
+        process.join()
+
+        self.assertNotIsInstance(result, Exception)
+        self.assertEqual(result, (True, 0, sorted(self.expected.keys())))
+
+    def test_correct_tokens_timeout(self):
+        """
+        Tests that batches which aren't corrected in time raise a timeout exception
+        :return:
+        """
+        pool = SpellCheckPool(self.spell_checker, processes=2, min_tokens=1, timeout=0.05)
+
+        def mock_apply(*args):
+            # The pool never returns
+            return asyncio.get_event_loop().create_future()
+
+        async def async_test_function():
+            try:
+                with mock.patch.object(SpellCheckPool, '_apply', side_effect=mock_apply):
+                    with self.assertRaises(ExecutorTimeoutException):
+                        await pool.correct_tokens(self.tokens)
+            finally:
+                pool.close()
+
+        self.run_async(async_test_function)
+
+    def test_correct_tokens_rejected(self):
+        """
+        Tests that batches beyond max_pending are rejected immediately
+        :return:
+        """
+        pool = SpellCheckPool(self.spell_checker, processes=2, min_tokens=1, timeout=1.0, max_pending=1)
+
+        def mock_apply(*args):
+            # The pool never returns
+            return asyncio.get_event_loop().create_future()
+
+        async def async_test_function():
+            try:
+                with mock.patch.object(SpellCheckPool, '_apply', side_effect=mock_apply):
+                    blocked = asyncio.ensure_future(pool.correct_tokens(self.tokens))
+                    await asyncio.sleep(0.01)
+                    self.assertEqual(pool.pending, 1)
+
+                    with self.assertRaises(ExecutorRejectedException):
+                        await pool.correct_tokens(self.tokens)
+                    self.assertEqual(pool.to_dict()["rejected"], 1)
+
+                    blocked.cancel()
+                    with self.assertRaises(asyncio.CancelledError):
+                        await blocked
+            finally:
+                pool.close()
+
+        self.run_async(async_test_function)
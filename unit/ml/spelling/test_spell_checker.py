@@ -1,7 +1,8 @@
 """
 Tests the custom spell checker class
 """
-from unittest import TestCase
+from unittest import TestCase, mock
+from unit.ml.spelling.test_symmetric_delete_index import MockModel
 
 from dp_conceptual_search.config import CONFIG
 from dp_conceptual_search.ml.spelling.spell_checker import SpellChecker
@@ -64,3 +65,48 @@ class SpellCheckerTestCase(TestCase):
                                  key=correction.input_token,
                                  actual=correction.correction
                              ))
+
+
+class SpellCheckerCacheTestCase(TestCase):
+
+    def setUp(self):
+        self.spell_checker: SpellChecker = SpellChecker(MockModel(["inflation", "unemployment", "economy"]),
+                                                        cache_size=10)
+
+    def test_cache_corrections(self):
+        """
+        Tests that repeated corrections (and tokens without a correction) are served from the cache
+        :return:
+        """
+        with mock.patch.object(SpellChecker, '_correction', wraps=self.spell_checker._correction) as correction:
+            for _ in range(3):
+                self.assertEqual(self.spell_checker.correction("inflaton"), "inflation")
+                self.assertEqual(self.spell_checker.correction("zzzzzz"), "zzzzzz")
+
+            self.assertEqual(correction.call_count, 2)
+
+        stats = self.spell_checker.cache.to_dict()
+        self.assertEqual(stats["size"], 2)
+        self.assertEqual(stats["hits"], 4)
+        self.assertEqual(stats["misses"], 2)
+
+    def test_reload_invalidates_cache(self):
+        """
+        Tests that reloading the model clears cached corrections
+        :return:
+        """
+        self.assertEqual(self.spell_checker.correction("economi"), "economy")
+
+        self.spell_checker.reload(MockModel(["economic", "economy"]))
+        self.assertEqual(len(self.spell_checker.cache), 0)
+        self.assertEqual(self.spell_checker.correction("economi"), "economic")
+
+    def test_cache_disabled(self):
+        """
+        Tests that corrections aren't cached if the cache size is zero
+        :return:
+        """
+        spell_checker = SpellChecker(MockModel(["inflation"]), cache_size=0)
+
+        self.assertIsNone(spell_checker.cache)
+        self.assertEqual(spell_checker.correction("inflaton"), "inflation")
@@ -0,0 +1,160 @@
+"""
+Tests the symmetric delete index used for spelling correction
+"""
+import os
+import random
+import tempfile
+from unittest import TestCase
+
+from dp_conceptual_search.ml.spelling.spell_checker import SpellChecker, LETTERS
+from dp_conceptual_search.ml.spelling.symmetric_delete_index import SymmetricDeleteIndex, osa_distance, deletes
+
+
+class MockModel(object):
+    """
+    Minimal stand-in for the UnsupervisedModel, exposing only the ranked vocabulary
+    """
+    def __init__(self, words):
+        self.words = {word: rank for rank, word in enumerate(words)}
+
+
+class SymmetricDeleteIndexTestCase(TestCase):
+
+    @property
+    def vocabulary(self) -> list:
+        """
+        Ranked vocabulary used for testing
+        :return:
+        """
+        return ["the", "inflation", "economic", "economy", "rpi", "cpi", "gdp", "population", "unemployment",
+                "employment", "migration", "consumer", "prices", "index", "cpih", "retail", "sales"]
+
+    @staticmethod
+    def random_vocabulary(random_state: random.Random, size: int) -> list:
+        words = set()
+        while len(words) < size:
+            words.add("".join(random_state.choice(LETTERS[:8]) for _ in range(random_state.randint(2, 11))))
+        return sorted(words)
+
+    def test_deletes(self):
+        """
+        Tests that deletes returns all strings up to max_distance deletions away
+        :return:
+        """
+        self.assertEqual(deletes("abc", 1), {"abc", "ab", "ac", "bc"})
+        self.assertEqual(deletes("abc", 2), {"abc", "ab", "ac", "bc", "a", "b", "c"})
+
+    def test_osa_distance(self):
+        """
+        Tests the optimal string alignment distance
+        :return:
+        """
+        self.assertEqual(osa_distance("inflation", "inflation", 2), 0)
+        self.assertEqual(osa_distance("infltion", "inflation", 2), 1)
+        self.assertEqual(osa_distance("infaltion", "inflation", 2), 1)
+        self.assertEqual(osa_distance("ifnlaton", "inflation", 2), 2)
+        self.assertEqual(osa_distance("cpl", "economy", 2), 3)
+        self.assertEqual(osa_distance("", "ab", 2), 2)
+
+    def test_correction(self):
+        """
+        Tests that the index returns the closest, most frequent correction
+        :return:
+        """
+        index = SymmetricDeleteIndex.build(self.vocabulary)
+
+        self.assertEqual(index.correction("inflation"), "inflation")
+        self.assertEqual(index.correction("infltion"), "inflation")
+        self.assertEqual(index.correction("unemploymnet"), "unemployment")
+        self.assertEqual(index.correction("economi"), "economic")
+        self.assertEqual(index.correction("cpl"), "cpi")
+        self.assertEqual(index.correction("zzzzzz"), "zzzzzz")
+
+        self.assertEqual(index.lookup("cpl")[0], ("cpi", 1))
+
+    def test_lookup_matches_brute_force(self):
+        """
+        Tests that lookups (with prefix truncation) find exactly the vocabulary words within max_distance
+        :return:
+        """
+        random_state = random.Random(42)
+        vocabulary = self.random_vocabulary(random_state, 1000)
+        index = SymmetricDeleteIndex.build(vocabulary)
+
+        for _ in range(100):
+            word = random_state.choice(vocabulary)
+            # Apply up to two random edits
+            for _ in range(random_state.randint(1, 2)):
+                i = random_state.randint(0, len(word))
+                word = random_state.choice([
+                    word[:i] + word[i + 1:],
+                    word[:i] + random_state.choice(LETTERS[:8]) + word[i:],
+                    word[:i] + random_state.choice(LETTERS[:8]) + word[i + 1:]
+                ])
+
+            expected = {w for w in vocabulary if osa_distance(word, w, 2) <= 2}
+            actual = {w for w, _ in index.lookup(word)}
+            self.assertEqual(actual, expected, "lookup mismatch for '{0}'".format(word))
+
+    def test_spell_checker_matches_edit_candidates(self):
+        """
+        Tests that the spell checker returns the same corrections with and without the index
+        :return:
+        """
+        random_state = random.Random(7)
+        model = MockModel(self.random_vocabulary(random_state, 500))
+
+        indexed = SpellChecker(model)
+        brute_force = SpellChecker(model, use_index=False)
+        self.assertIsNone(brute_force.index)
+
+        for word in [random_state.choice(list(model.words)) for _ in range(20)]:
+            misspelt = word[:1] + word[2:] + random_state.choice(LETTERS[:8])
+            self.assertEqual(indexed.correction(misspelt), brute_force.correction(misspelt))
+
+    def test_save_and_load(self):
+        """
+        Tests that an index loaded (memory mapped) from file returns the same corrections as the index it was saved from
+        :return:
+        """
+        random_state = random.Random(11)
+        vocabulary = self.random_vocabulary(random_state, 500) + ["économie", "naïve"]
+        index = SymmetricDeleteIndex.build(vocabulary, max_distance=1, prefix_length=5)
+
+        fd, filename = tempfile.mkstemp()
+        os.close(fd)
+        try:
+            index.save(filename)
+            loaded = SymmetricDeleteIndex.load(filename)
+
+            self.assertEqual(len(loaded), len(index))
+            self.assertEqual(loaded.max_distance, 1)
+            self.assertEqual(loaded.prefix_length, 5)
+            self.assertEqual(list(loaded.words), vocabulary)
+            self.assertFalse(loaded.keys.flags.writeable)
+
+            for word in vocabulary[::10] + ["economie", "naive", "zzz"]:
+                self.assertEqual(loaded.lookup(word), index.lookup(word))
+
+            model = MockModel(vocabulary)
+            self.assertTrue(loaded.matches_vocabulary(model.words))
+            self.assertFalse(loaded.matches_vocabulary(MockModel(vocabulary[:-1]).words))
+            self.assertFalse(loaded.matches_vocabulary(MockModel(list(reversed(vocabulary))).words))
+
+            self.assertEqual(SpellChecker(model, index=loaded).correction("économi"), "économie")
+        finally:
+            os.remove(filename)
+
+    def test_load_invalid_file(self):
+        """
+        Tests that loading a file which isn't a spellcheck index raises a ValueError
+        :return:
+        """
+        fd, filename = tempfile.mkstemp()
+        os.write(fd, b"not a spellcheck index" * 4)
+        os.close(fd)
+        try:
+            with self.assertRaises(ValueError):
+                SymmetricDeleteIndex.load(filename)
+        finally:
+            os.remove(filename)
@@ -52,3 +52,36 @@ class MockElasticsearchClient(Elasticsearch):
         :return:
         """
         raise NotImplementedError("search not implemented, must be mocked!")
+
+    def get(self, index, doc_type, id, params=None):
+        """
+        Mocks the document GET API
+        :param index:
+        :param doc_type:
+        :param id:
+        :param params:
+        :return:
+        """
+        raise NotImplementedError("get not implemented, must be mocked!")
+
+    def mget(self, body, index=None, doc_type=None, params=None):
+        """
+        Mocks the multi-get API
+        :param body:
+        :param index:
+        :param doc_type:
+        :param params:
+        :return:
+        """
+        raise NotImplementedError("mget not implemented, must be mocked!")
+
+    def msearch(self, body, index=None, doc_type=None, params=None):
+        """
+        Mocks the multi search API
+        :param body:
+        :param index:
+        :param doc_type:
+        :param params:
+        :return:
+        """
+        raise NotImplementedError("msearch not implemented, must be mocked!")
@@ -1,6 +1,7 @@
 """
 Tests the ONS conceptual search engine functionality
 """
+import asyncio
 from typing import List
 from numpy.random import rand
 
@@ -10,6 +11,7 @@ from unit.utils.async_test import AsyncTestCase
 from unit.elasticsearch.elasticsearch_test_utils import mock_search_client
 
 from dp_conceptual_search.search.search_type import SearchType
+from dp_conceptual_search.search.query_helper import query_preference
 
 from dp_conceptual_search.config import SEARCH_CONFIG
 from dp_conceptual_search.search.dsl.vector_script_score import VectorScriptScore
@@ -18,7 +20,53 @@ from dp_conceptual_search.ons.search.content_type import AvailableContentTypes,
 from dp_conceptual_search.ons.conceptual.queries.ons_query_builders import build_content_query
 from dp_conceptual_search.ons.search.queries.ons_query_builders import build_type_counts_query
 from dp_conceptual_search.ons.search.fields import get_highlighted_fields, Field, AvailableFields
+from dp_conceptual_search.ons.conceptual.client.fasttext_client import FastTextClientService
 from dp_conceptual_search.ons.conceptual.client.conceptual_search_engine import ConceptualSearchEngine
+from dp_conceptual_search.ons.conceptual.client.conceptual_search_params_cache import ConceptualSearchParamsCache
+
+
+class MockSupervisedClient(object):
+    """
+    Mock supervised dp-fasttext client which records how many requests are in flight at once
+    """
+    def __init__(self):
+        self.in_flight = 0
+        self.max_in_flight = 0
+        self.num_requests = 0
+
+    async def _request(self, result):
+        self.num_requests += 1
+        self.in_flight += 1
+        self.max_in_flight = max(self.max_in_flight, self.in_flight)
+        await asyncio.sleep(0.01)
+        self.in_flight -= 1
+        return result
+
+    async def get_sentence_vector(self, query: str, headers: dict=None):
+        return await self._request(rand(10))
+
+    async def predict(self, query: str, num_labels: int, threshold: float, headers: dict=None):
+        return await self._request((["these", "are", "a", "test"], [1.0, 1.0, 1.0, 1.0]))
+
+
+class MockFastTextClient(object):
+    def __init__(self):
+        self.supervised = MockSupervisedClient()
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, exc_type, exc_val, exc_tb):
+        pass
+
+
+class MockFastTextClientService(FastTextClientService):
+    def __init__(self):
+        super(MockFastTextClientService, self).__init__()
+        self.client = MockFastTextClient()
+
+    def acquire(self):
+        return self.client
 
 
 class ConceptualSearchEngineTestCase(AsyncTestCase, TestCase):
@@ -149,7 +197,8 @@ class ConceptualSearchEngineTestCase(AsyncTestCase, TestCase):
             response = await engine.execute(ignore_cache=True)
 
             self.mock_client.search.assert_called_with(index=[self.index], doc_type=[], body=expected,
-                                                       search_type=SearchType.DFS_QUERY_THEN_FETCH.value)
+                                                       search_type=SearchType.DFS_QUERY_THEN_FETCH.value,
+                                                       preference=query_preference(self.search_term))
 
         # Run the above function in a dedicated event loop
         self.run_async(async_test_function)
@@ -216,7 +265,69 @@ class ConceptualSearchEngineTestCase(AsyncTestCase, TestCase):
             response = await engine.execute(ignore_cache=True)
 
             self.mock_client.search.assert_called_with(index=[self.index], doc_type=[], body=expected,
-                                                       search_type=SearchType.DFS_QUERY_THEN_FETCH.value)
+                                                       search_type=SearchType.QUERY_THEN_FETCH.value,
+                                                       request_cache=True, preference=query_preference(self.search_term))
+
+        # Run the above function in a dedicated event loop
+        self.run_async(async_test_function)
+
+    def test_conceptual_search_params_concurrent(self):
+        """
+        Tests that the search vector and keyword labels are requested from dp-fasttext concurrently
+        :return:
+        """
+        fasttext = MockFastTextClientService()
+
+        # Define the async function to be ran
+        async def async_test_function():
+            engine = ConceptualSearchEngine(using=self.mock_client, index=self.index, fasttext=fasttext)
+
+            labels, search_vector = await engine.conceptual_search_params(self.search_term, 10, 0.0)
+
+            self.assertEqual(labels, ["these", "are", "a", "test"])
+            self.assertEqual(len(search_vector), 10)
+
+            # Both requests should have been in flight at the same time
+            self.assertEqual(fasttext.client.supervised.max_in_flight, 2)
+
+        # Run the above function in a dedicated event loop
+        self.run_async(async_test_function)
+
+    def test_conceptual_search_params_cache(self):
+        """
+        Tests that cached conceptual search params are served without querying dp-fasttext, and are invalidated
+        when the model version changes
+        :return:
+        """
+        fasttext = MockFastTextClientService()
+        cache = ConceptualSearchParamsCache(max_size=10, ttl=60.0, model_version="1")
+
+        # Define the async function to be ran
+        async def async_test_function():
+            engine = ConceptualSearchEngine(using=self.mock_client, index=self.index, fasttext=fasttext, cache=cache)
+
+            labels, search_vector = await engine.conceptual_search_params(self.search_term, 10, 0.0)
+            self.assertEqual(fasttext.client.supervised.num_requests, 2)
+
+            # Same search term should hit the cache
+            cached_labels, cached_search_vector = await engine.conceptual_search_params(self.search_term, 10, 0.0)
+            self.assertEqual(fasttext.client.supervised.num_requests, 2)
+            self.assertEqual(cached_labels, labels)
+            self.assertTrue((cached_search_vector == search_vector).all())
+
+            # Different num_labels should miss
+            await engine.conceptual_search_params(self.search_term, 5, 0.0)
+            self.assertEqual(fasttext.client.supervised.num_requests, 4)
+
+            self.assertEqual(cache.stats.hits, 1)
+            self.assertEqual(cache.stats.misses, 2)
+
+            # Changing the model version should invalidate the cache
+            cache.model_version = "2"
+            self.assertEqual(len(cache), 0)
+
+            await engine.conceptual_search_params(self.search_term, 10, 0.0)
+            self.assertEqual(fasttext.client.supervised.num_requests, 6)
 
         # Run the above function in a dedicated event loop
         self.run_async(async_test_function)
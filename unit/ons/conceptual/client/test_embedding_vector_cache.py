@@ -0,0 +1,77 @@
+"""
+Tests the cache of document embedding vectors
+"""
+import os
+import shutil
+import tempfile
+import numpy as np
+from unittest import TestCase
+
+from unit.cache.test_lru_cache import MockTimer
+
+from dp_conceptual_search.ons.conceptual.client.embedding_vector_cache import EmbeddingVectorCache
+
+
+class EmbeddingVectorCacheTestCase(TestCase):
+
+    def setUp(self):
+        self.timer = MockTimer()
+        self.vector = np.random.rand(10)
+
+        self.directory = tempfile.mkdtemp()
+        self.filename = os.path.join(self.directory, "vectors.cache")
+
+    def tearDown(self):
+        shutil.rmtree(self.directory)
+
+    def test_revalidation(self):
+        """
+        Tests entries are fresh until revalidate_after, and are revalidated against the lastRevised date
+        :return:
+        """
+        cache = EmbeddingVectorCache(max_size=10, revalidate_after=60.0, shared_store_size=0, timer=self.timer)
+
+        self.assertIsNone(cache.get("/uri"))
+        cache.set("/uri", self.vector, "2018-01-01")
+
+        entry = cache.get("/uri")
+        self.assertTrue(np.array_equal(entry.vector, self.vector))
+        self.assertFalse(entry.vector.flags.writeable, "cached vectors should be read-only")
+        self.assertTrue(cache.is_fresh(entry))
+
+        self.timer.time = 61.0
+        self.assertFalse(cache.is_fresh(entry))
+
+        # Unchanged documents are revalidated
+        self.assertTrue(cache.revalidate("/uri", entry, "2018-01-01"))
+        self.assertTrue(cache.is_fresh(cache.get("/uri")))
+        self.assertEqual(cache.revalidations, 1)
+
+        # Revised documents are invalidated
+        self.timer.time = 200.0
+        self.assertFalse(cache.revalidate("/uri", cache.get("/uri"), "2018-06-01"))
+        self.assertIsNone(cache.get("/uri"))
+        self.assertEqual(cache.invalidations, 1)
+
+    def test_shared_store(self):
+        """
+        Tests vectors are shared between caches via the shared memory store
+        :return:
+        """
+        cache = EmbeddingVectorCache(max_size=10, revalidate_after=60.0, shared_store_size=10,
+                                     filename=self.filename, timer=self.timer)
+        cache.set("/uri", self.vector, "2018-01-01")
+
+        # A cache in another worker should find the vector in the shared store
+        other = EmbeddingVectorCache(max_size=10, revalidate_after=60.0, shared_store_size=10,
+                                     filename=self.filename, timer=self.timer)
+        entry = other.get("/uri")
+
+        self.assertIsNotNone(entry)
+        self.assertTrue(np.array_equal(entry.vector, self.vector))
+        self.assertEqual(entry.last_revised, "2018-01-01")
+        self.assertTrue(other.is_fresh(entry))
+        self.assertEqual(len(other), 1)
+
+        other.clear()
+        self.assertIsNone(cache._shared_store.get("/uri"))
@@ -0,0 +1,90 @@
+"""
+Tests the pooled dp-fasttext client service
+"""
+from unittest import mock, TestCase
+from unit.utils.async_test import AsyncTestCase
+
+from dp_conceptual_search.ons.conceptual.client.fasttext_client import FastTextClientService
+from dp_conceptual_search.ons.conceptual.client.exceptions import FastTextPoolTimeoutException
+
+
+class MockPooledClient(object):
+    """
+    Mock client which records entering/exiting its context
+    """
+    def __init__(self):
+        self.entered = 0
+        self.exited = 0
+
+    async def __aenter__(self):
+        self.entered += 1
+        return self
+
+    async def __aexit__(self, exc_type, exc_val, exc_tb):
+        self.exited += 1
+
+
+class FastTextClientServiceTestCase(AsyncTestCase, TestCase):
+
+    @mock.patch.object(FastTextClientService, 'get_fasttext_client', MockPooledClient)
+    def test_pooled_clients_reused(self):
+        """
+        Tests that clients are created once, reused across acquisitions and closed on shutdown
+        :return:
+        """
+        async def async_test_function():
+            service = FastTextClientService(pool_size=2, pool_timeout=1.0)
+            await service.initialise()
+
+            self.assertTrue(service.initialised, "service should be initialised")
+
+            seen = set()
+            for i in range(5):
+                async with service.acquire() as client:
+                    seen.add(client)
+                    self.assertEqual(service.metrics["in_use"], 1, "expected one client in use")
+
+            # Only pooled clients should be handed out, each entered exactly once
+            self.assertLessEqual(len(seen), 2, "expected at most two distinct clients")
+            for client in seen:
+                self.assertEqual(client.entered, 1, "pooled client should be entered exactly once")
+
+            metrics = service.metrics
+            self.assertEqual(metrics["acquired"], 5, "expected five acquisitions")
+            self.assertEqual(metrics["available"], 2, "expected all clients to be available")
+            self.assertEqual(metrics["waited"], 0, "expected no waits")
+
+            clients = [entered for client, entered in service._clients]
+            await service.shutdown()
+
+            for client in clients:
+                self.assertEqual(client.exited, 1, "pooled client should be exited on shutdown")
+
+        self.run_async(async_test_function)
+
+    @mock.patch.object(FastTextClientService, 'get_fasttext_client', MockPooledClient)
+    def test_pool_timeout(self):
+        """
+        Tests that waiting for a client from an exhausted pool times out
+        :return:
+        """
+        async def async_test_function():
+            service = FastTextClientService(pool_size=1, pool_timeout=0.01)
+            await service.initialise()
+
+            async with service.acquire():
+                with self.assertRaises(FastTextPoolTimeoutException) as context:
+                    async with service.acquire():
+                        pass
+
+            # Pool exhaustion is overload, so should return a 503 rather than a 500
+            self.assertEqual(context.exception.status_code, 503)
+
+            metrics = service.metrics
+            self.assertEqual(metrics["waited"], 1, "expected one wait")
+            self.assertEqual(metrics["timeouts"], 1, "expected one timeout")
+            self.assertEqual(metrics["available"], 1, "client should be returned to the pool")
+
+            await service.shutdown()
+
+        self.run_async(async_test_function)
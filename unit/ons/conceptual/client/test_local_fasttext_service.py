@@ -0,0 +1,113 @@
+"""
+Tests in-process fastText inference
+"""
+import os
+import tempfile
+import numpy as np
+from unittest import TestCase
+
+from unit.utils.async_test import AsyncTestCase
+
+from dp_conceptual_search.ml.word_embedding.fastText import UnsupervisedModel
+from dp_conceptual_search.ons.conceptual.client import LocalFastTextService, FastTextInferenceMode
+
+
+class LocalFastTextServiceTestCase(AsyncTestCase, TestCase):
+
+    # Small word2vec model for testing
+    WORD_VECTORS = {
+        "inflation": [1.0, 0.0, 0.0],
+        "prices": [0.9, 0.1, 0.0],
+        "population": [0.0, 1.0, 0.0],
+        "census": [0.0, 0.9, 0.1],
+        "gdp": [0.0, 0.0, 1.0]
+    }
+
+    def setUp(self):
+        super(LocalFastTextServiceTestCase, self).setUp()
+
+        fd, self.filename = tempfile.mkstemp(suffix=".vec")
+        with os.fdopen(fd, "w") as f:
+            f.write("{0} 3\n".format(len(self.WORD_VECTORS)))
+            for word, vector in self.WORD_VECTORS.items():
+                f.write("{0} {1}\n".format(word, " ".join(str(v) for v in vector)))
+
+        self.service = LocalFastTextService(UnsupervisedModel(self.filename))
+
+    def tearDown(self):
+        os.remove(self.filename)
+
+    def test_mode(self):
+        """
+        Tests the service reports local inference mode
+        :return:
+        """
+        self.assertEqual(self.service.mode, FastTextInferenceMode.LOCAL)
+        self.assertIsNone(self.service.metrics["supervised_model"])
+
+    def test_model_version(self):
+        """
+        Tests the model version is a fingerprint of the model file, which changes with the model
+        :return:
+        """
+        async def async_test_function():
+            await self.service.initialise()
+            model_version = self.service.model_version
+            self.assertIsNotNone(model_version)
+
+            with open(self.filename, "a") as f:
+                f.write("cpi 0.5 0.5 0.0\n")
+
+            await self.service.initialise()
+            self.assertNotEqual(self.service.model_version, model_version)
+
+        self.run_async(async_test_function)
+
+    def test_sentence_vector_and_labels(self):
+        """
+        Tests sentence vectors are averaged word vectors, and labels are the most similar words
+        :return:
+        """
+        async def async_test_function():
+            search_vector, labels = await self.service.sentence_vector_and_labels("inflation prices unknown",
+                                                                                  "Inflation prices unknown",
+                                                                                  2, 0.0, "test")
+
+            expected = np.mean([self.WORD_VECTORS["inflation"], self.WORD_VECTORS["prices"]], axis=0)
+            self.assertTrue(np.allclose(search_vector, expected))
+            self.assertEqual(sorted(labels), ["inflation", "prices"])
+
+            # No words in vocabulary
+            search_vector, labels = await self.service.sentence_vector_and_labels("unknown", "unknown", 2, 0.0,
+                                                                                  "test")
+            self.assertIsNone(search_vector)
+            self.assertEqual(labels, [])
+
+        self.run_async(async_test_function)
+
+    def test_similar_by_vector(self):
+        """
+        Tests similar words are returned for a vector
+        :return:
+        """
+        async def async_test_function():
+            similar_words = await self.service.similar_by_vector(np.array([0.0, 1.0, 0.05]), 2, "test")
+
+            self.assertEqual(sorted(similar_words), ["census", "population"])
+
+        self.run_async(async_test_function)
+
+    def test_similar_by_vectors(self):
+        """
+        Tests similar words are returned for each of a batch of vectors
+        :return:
+        """
+        async def async_test_function():
+            vector = np.array([0.0, 1.0, 0.05])
+            similar_words = await self.service.similar_by_vectors([vector, vector], 2, "test")
+
+            self.assertEqual(len(similar_words), 2)
+            for words in similar_words:
+                self.assertEqual(sorted(words), ["census", "population"])
+
+        self.run_async(async_test_function)
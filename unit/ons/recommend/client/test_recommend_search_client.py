@@ -1,6 +1,7 @@
 """
 Tests the ONS recommendation search engine functionality
 """
+import numpy as np
 from typing import List
 from numpy import ndarray
 
@@ -8,18 +9,25 @@ from unittest import mock, TestCase
 from unittest.mock import MagicMock
 
 from unit.utils.async_test import AsyncTestCase
+from unit.cache.test_lru_cache import MockTimer
 from unit.elasticsearch.elasticsearch_test_utils import MockElasticsearchClient, mock_hits, mock_single_hit, mock_search_response
 
 from dp_fasttext.ml.utils import decode_float_list
 from dp_fasttext.client.testing.mock_client import mock_similar_vector, mock_fasttext_client
 
 from dp_conceptual_search.search.search_type import SearchType
-from dp_conceptual_search.search.query_helper import match_by_uri
+from dp_conceptual_search.search.client.exceptions import DocumentNotFoundException
 from dp_conceptual_search.search.dsl.vector_script_score import VectorScriptScore
 
+from dp_conceptual_search.config import CONFIG
+from dp_conceptual_search.ml.nearest_neighbours import IVFIndex
+from dp_conceptual_search.app.executor.bounded_executor import BoundedExecutor
+
 from dp_conceptual_search.ons.search.sort_fields import query_sort, SortField
-from dp_conceptual_search.ons.recommend.queries.ons_query_builders import similar_to_uri
+from dp_conceptual_search.ons.recommend.queries.ons_query_builders import similar_to_uri, similar_by_ids
 from dp_conceptual_search.ons.conceptual.client.fasttext_client import FastTextClientService
+from dp_conceptual_search.ons.conceptual.client.fasttext_service import FastTextService, FastTextInferenceMode
+from dp_conceptual_search.ons.conceptual.client.embedding_vector_cache import EmbeddingVectorCache
 from dp_conceptual_search.ons.search.fields import get_highlighted_fields, Field, AvailableFields
 from dp_conceptual_search.ons.recommend.client.recommend_search_engine import RecommendationSearchEngine
 
@@ -29,7 +37,49 @@ TEST_URI = "/this/is/a/test/uri"
 TEST_HIT_FOR_URI = mock_single_hit()
 
 
-# Need a custom mock here to handle match by uri query
+def mock_document(doc_id: str, source_include: list=None) -> dict:
+    """
+    Mocks a document GET response, where only TEST_URI exists
+    :param doc_id:
+    :param source_include:
+    :return:
+    """
+    if doc_id != TEST_URI:
+        return {"_id": doc_id, "found": False}
+
+    source = TEST_HIT_FOR_URI[0].get("_source")
+    if source_include is not None:
+        source = {key: value for key, value in source.items() if key in source_include}
+
+    return {"_id": doc_id, "found": True, "_source": source}
+
+
+def mock_get(index=None, doc_type=None, id=None, params=None, **kwargs) -> dict:
+    """
+    Mocks the Elasticsearch client get method
+    :param index:
+    :param doc_type:
+    :param id:
+    :param params:
+    :return:
+    """
+    return mock_document(id, kwargs.get("_source_include"))
+
+
+def mock_mget(body=None, index=None, doc_type=None, params=None, **kwargs) -> dict:
+    """
+    Mocks the Elasticsearch client mget method
+    :param body:
+    :param index:
+    :param doc_type:
+    :param params:
+    :return:
+    """
+    return {
+        "docs": [mock_document(doc["_id"], kwargs.get("_source_include")) for doc in body["docs"]]
+    }
+
+
 def mock_search(index=None, doc_type=None, body=None, params=None, **kwargs):
     """
     Mocks the Elasticsearch client search method
@@ -39,31 +89,67 @@ def mock_search(index=None, doc_type=None, body=None, params=None, **kwargs):
     :param params:
     :return:
     """
-    match_query = {
-        "query": match_by_uri(TEST_URI).to_dict()
-    }
+    return mock_search_response(mock_hits())
 
-    if body == match_query:
-        return mock_search_response(TEST_HIT_FOR_URI)
-    else:
-        return mock_search_response(mock_hits())
+
+def mock_msearch(body=None, index=None, doc_type=None, params=None, **kwargs) -> dict:
+    """
+    Mocks the Elasticsearch client msearch method (body alternates between headers and search bodies)
+    :param body:
+    :param index:
+    :param doc_type:
+    :param params:
+    :return:
+    """
+    return {
+        "responses": [mock_search(body=search_body) for search_body in body[1::2]]
+    }
 
 
 def mock_recommend_search_client(*args):
     """
-    Returns a mock client capable of handling match by uri queries
+    Returns a mock client capable of handling document GET requests for TEST_URI
     :return:
     """
     # Mock the search client
     mock_client = MockElasticsearchClient()
     mock_client.search = MagicMock()
+    mock_client.get = MagicMock()
+    mock_client.mget = MagicMock()
+    mock_client.msearch = MagicMock()
 
-    # Set side effect to call mock search method
+    # Set side effects to call mock methods
     mock_client.search.side_effect = mock_search
+    mock_client.get.side_effect = mock_get
+    mock_client.mget.side_effect = mock_mget
+    mock_client.msearch.side_effect = mock_msearch
 
     return mock_client
 
 
+class MockBatchFastTextService(FastTextService):
+    """
+    Mock fastText service which records batched similar_by_vectors calls
+    """
+    def __init__(self):
+        self.batches = []
+
+    @property
+    def mode(self) -> FastTextInferenceMode:
+        return FastTextInferenceMode.REMOTE
+
+    async def sentence_vector_and_labels(self, clean_search_term: str, search_term: str, num_labels: int,
+                                         threshold: float, context: str):
+        raise NotImplementedError("sentence_vector_and_labels not implemented")
+
+    async def similar_by_vector(self, vector: ndarray, num_labels: int, context: str) -> List[str]:
+        raise NotImplementedError("similar_by_vector should not be called for batches")
+
+    async def similar_by_vectors(self, vectors: List[ndarray], num_labels: int, context: str) -> List[List[str]]:
+        self.batches.append(vectors)
+        return [mock_similar_vector().get("words") for _ in vectors]
+
+
 # Define the test case
 class RecommendationSearchEngineTestCase(AsyncTestCase, TestCase):
 
@@ -182,4 +268,214 @@ class RecommendationSearchEngineTestCase(AsyncTestCase, TestCase):
                                                        search_type=SearchType.DFS_QUERY_THEN_FETCH.value)
 
         # Run the above function in a dedicated event loop
-        self.run_async(async_test_function)
\ No newline at end of file
+        self.run_async(async_test_function)
+    def test_similar_by_uri_query_ann_index(self):
+        """
+        Tests the similar_by_uri query fetches the nearest neighbours from the ANN index by id
+        :return:
+        """
+        # Calculate correct start page number
+        from_start, current_page, size = self.paginate()
+
+        embedding_field: Field = AvailableFields.EMBEDDING_VECTOR.value
+
+        # Get test vector
+        test_hit_vector_encoded = TEST_HIT_FOR_URI[0].get("_source").get(embedding_field.name)
+        test_hit_vector_decoded: ndarray = decode_float_list(test_hit_vector_encoded)
+
+        # Build an index which includes the test uri
+        vectors = np.vstack([test_hit_vector_decoded, np.random.rand(499, len(test_hit_vector_decoded))])
+        ids = [TEST_URI] + ["/doc/{0}".format(i) for i in range(499)]
+        ann_index = IVFIndex.build(vectors, ids, 8, seed=42)
+
+        k = min(current_page * size, CONFIG.ML.ann_max_results)
+        similar = ann_index.search(test_hit_vector_decoded, k, num_probes=CONFIG.ML.ann_num_probes, exclude=[TEST_URI])
+        self.assertNotIn(TEST_URI, [doc_id for doc_id, _ in similar])
+
+        expected = {
+            "query": similar_by_ids(TEST_URI, similar).to_dict(),
+            "from": from_start,
+            "size": size,
+            "highlight": self.highlight_dict,
+            "sort": query_sort(SortField.relevance)
+        }
+
+        # Define the async function to be ran
+        async def async_test_function():
+            # Create an instance of the SearchEngine with the ANN index
+            engine = RecommendationSearchEngine(using=self.mock_client, index=self.index, ann_index=ann_index)
+
+            engine: RecommendationSearchEngine = await engine.similar_by_uri_query(TEST_URI, 10, current_page, size)
+
+            # Ensure search method on SearchClient is called correctly on execute
+            response = await engine.execute(ignore_cache=True)
+
+            self.mock_client.search.assert_called_with(index=[self.index], doc_type=[], body=expected,
+                                                       search_type=SearchType.DFS_QUERY_THEN_FETCH.value)
+
+        # Run the above function in a dedicated event loop
+        self.run_async(async_test_function)
+
+    @mock.patch.object(FastTextClientService, 'get_fasttext_client', mock_fasttext_client)
+    def test_embedding_vector_cache(self):
+        """
+        Tests embedding vectors are cached by uri, and only the lastRevised date is fetched to revalidate them
+        :return:
+        """
+        timer = MockTimer()
+        cache = EmbeddingVectorCache(max_size=10, revalidate_after=60.0, shared_store_size=0, timer=timer)
+
+        embedding_field: Field = AvailableFields.EMBEDDING_VECTOR.value
+        last_revised_field: Field = AvailableFields.LAST_REVISED.value
+
+        def uri_requests() -> list:
+            return [kwargs["_source_include"] for args, kwargs in self.mock_client.get.call_args_list
+                    if kwargs["id"] == TEST_URI]
+
+        # Define the async function to be ran
+        async def async_test_function():
+            engine = RecommendationSearchEngine(using=self.mock_client, index=self.index,
+                                                embedding_vector_cache=cache)
+
+            # The first request should fetch the vector (and lastRevised date) only
+            vector: ndarray = await engine.embedding_vector_for_uri(TEST_URI)
+            self.assertEqual(uri_requests(), [[embedding_field.name, last_revised_field.name]])
+
+            # Subsequent requests should be served from the cache
+            await engine.similar_by_uri_query(TEST_URI, 10, 1, 10)
+            self.assertTrue(np.array_equal(await engine.embedding_vector_for_uri(TEST_URI), vector))
+            self.assertEqual(len(uri_requests()), 1)
+
+            # Stale entries should be revalidated, fetching only the lastRevised date
+            timer.time = 61.0
+            self.assertTrue(np.array_equal(await engine.embedding_vector_for_uri(TEST_URI), vector))
+            self.assertEqual(len(uri_requests()), 2)
+            self.assertEqual(uri_requests()[1], [last_revised_field.name])
+            self.assertEqual(cache.revalidations, 1)
+
+        # Run the above function in a dedicated event loop
+        self.run_async(async_test_function)
+
+    def test_embedding_vector_for_uri(self):
+        """
+        Tests embedding vectors are fetched with a document GET, limiting the _source to the required fields
+        :return:
+        """
+        embedding_field: Field = AvailableFields.EMBEDDING_VECTOR.value
+        last_revised_field: Field = AvailableFields.LAST_REVISED.value
+
+        expected_vector = decode_float_list(TEST_HIT_FOR_URI[0].get("_source").get(embedding_field.name))
+
+        # Define the async function to be ran
+        async def async_test_function():
+            engine = self.get_search_engine()
+
+            # Uris are normalised to document ids
+            vector: ndarray = await engine.embedding_vector_for_uri(TEST_URI.lstrip("/"))
+            self.assertTrue(np.array_equal(vector, expected_vector))
+
+            self.mock_client.get.assert_called_once_with(index=self.index, doc_type="_all", id=TEST_URI, ignore=404,
+                                                         _source_include=[embedding_field.name,
+                                                                          last_revised_field.name])
+            self.mock_client.search.assert_not_called()
+
+            # Missing documents should raise an exception
+            with self.assertRaises(DocumentNotFoundException):
+                await engine.embedding_vector_for_uri("/not/a/uri")
+
+        # Run the above function in a dedicated event loop
+        self.run_async(async_test_function)
+
+    def test_similar_by_uris_queries(self):
+        """
+        Tests similarity queries for many uris are built with one multi-get and one batched similar_by_vectors call
+        :return:
+        """
+        embedding_field: Field = AvailableFields.EMBEDDING_VECTOR.value
+        last_revised_field: Field = AvailableFields.LAST_REVISED.value
+
+        test_hit_vector_decoded = decode_float_list(TEST_HIT_FOR_URI[0].get("_source").get(embedding_field.name))
+        vector_script_score = VectorScriptScore(embedding_field.name, test_hit_vector_decoded)
+
+        fasttext = MockBatchFastTextService()
+        uris = [TEST_URI, "/not/a/uri", TEST_URI.lstrip("/")]
+
+        expected = {
+            "query": similar_to_uri(TEST_URI, mock_similar_vector().get("words"), vector_script_score).to_dict(),
+            "from": 0,
+            "size": 10,
+            "highlight": self.highlight_dict,
+            "sort": query_sort(SortField.relevance)
+        }
+
+        # Define the async function to be ran
+        async def async_test_function():
+            engine = RecommendationSearchEngine(using=self.mock_client, index=self.index, fasttext=fasttext)
+
+            queries = await engine.similar_by_uris_queries(uris, 10, 1, 10)
+            self.assertEqual(len(queries), len(uris))
+
+            # Vectors should be fetched with a single multi-get
+            self.mock_client.mget.assert_called_once_with(
+                body={"docs": [{"_id": TEST_URI}, {"_id": "/not/a/uri"}, {"_id": TEST_URI}]},
+                index=self.index,
+                _source_include=[embedding_field.name, last_revised_field.name]
+            )
+            self.mock_client.get.assert_not_called()
+
+            # Keywords should be generated with a single batch
+            self.assertEqual(len(fasttext.batches), 1)
+            self.assertEqual(len(fasttext.batches[0]), 2)
+
+            self.assertEqual(queries[0].to_dict(), expected)
+            self.assertIsInstance(queries[1], DocumentNotFoundException)
+            self.assertEqual(queries[2].to_dict(), expected)
+
+        # Run the above function in a dedicated event loop
+        self.run_async(async_test_function)
+
+    def test_similar_by_uris_queries_ann_index(self):
+        """
+        Tests the nearest neighbours for a batch larger than the executor's max_pending are found in a single executor
+        call
+        :return:
+        """
+        embedding_field: Field = AvailableFields.EMBEDDING_VECTOR.value
+        test_hit_vector_decoded = decode_float_list(TEST_HIT_FOR_URI[0].get("_source").get(embedding_field.name))
+
+        vectors = np.vstack([test_hit_vector_decoded, np.random.rand(499, len(test_hit_vector_decoded))])
+        ids = [TEST_URI] + ["/doc/{0}".format(i) for i in range(499)]
+        ann_index = IVFIndex.build(vectors, ids, 8, seed=42)
+
+        similar = ann_index.search(test_hit_vector_decoded, 10, num_probes=CONFIG.ML.ann_num_probes, exclude=[TEST_URI])
+
+        expected = {
+            "query": similar_by_ids(TEST_URI, similar).to_dict(),
+            "from": 0,
+            "size": 10,
+            "highlight": self.highlight_dict,
+            "sort": query_sort(SortField.relevance)
+        }
+
+        executor = BoundedExecutor("test", max_workers=1, max_pending=2, timeout=10.0)
+        uris = [TEST_URI] * (executor.max_pending + 3)
+
+        # Define the async function to be ran
+        async def async_test_function():
+            engine = RecommendationSearchEngine(using=self.mock_client, index=self.index, ann_index=ann_index,
+                                                executor=executor)
+
+            try:
+                queries = await engine.similar_by_uris_queries(uris, 10, 1, 10)
+            finally:
+                executor.shutdown()
+
+            self.assertEqual(executor.to_dict()["completed"], 1)
+            self.assertEqual(executor.to_dict()["rejected"], 0)
+
+            self.assertEqual(len(queries), len(uris))
+            for query in queries:
+                self.assertEqual(query.to_dict(), expected)
+
+        # Run the above function in a dedicated event loop
+        self.run_async(async_test_function)
@@ -2,14 +2,16 @@
 Tests the ONS search engine functionality
 """
 from typing import List
-from unittest import TestCase
+from unittest import TestCase, mock
+
+from elasticsearch_dsl import Search
 
 from unit.utils.async_test import AsyncTestCase
 from unit.elasticsearch.elasticsearch_test_utils import mock_search_client
 
 from dp_conceptual_search.config import SEARCH_CONFIG
 from dp_conceptual_search.search.search_type import SearchType
-from dp_conceptual_search.search.query_helper import match_by_uri
+from dp_conceptual_search.search.query_helper import match_by_uri, query_preference
 
 from dp_conceptual_search.ons.search.client.search_engine import SearchEngine
 from dp_conceptual_search.ons.search.sort_fields import query_sort, SortField
@@ -207,7 +209,8 @@ class SearchEngineTestCase(AsyncTestCase, TestCase):
             response = await engine.execute(ignore_cache=True)
 
             self.mock_client.search.assert_called_with(index=[self.index], doc_type=[], body=expected,
-                                                       search_type=SearchType.DFS_QUERY_THEN_FETCH.value)
+                                                       search_type=SearchType.DFS_QUERY_THEN_FETCH.value,
+                                                       preference=query_preference(self.search_term))
 
         # Run the above function in a dedicated event loop
         self.run_async(async_test_function)
@@ -261,11 +264,84 @@ class SearchEngineTestCase(AsyncTestCase, TestCase):
             response = await engine.execute(ignore_cache=True)
 
             self.mock_client.search.assert_called_with(index=[self.index], doc_type=[], body=expected,
-                                                       search_type=SearchType.DFS_QUERY_THEN_FETCH.value)
+                                                       search_type=SearchType.DFS_QUERY_THEN_FETCH.value,
+                                                       preference=query_preference(self.search_term))
 
         # Run the above function in a dedicated event loop
         self.run_async(async_test_function)
 
+    def test_configured_search_types(self):
+        """
+        Tests that the search_type of each query kind is read from config
+        :return:
+        """
+        engine = self.get_search_engine()
+        content_types: List[ContentType] = AvailableContentTypes.available_content_types()
+
+        with mock.patch.object(SEARCH_CONFIG, 'content_search_type', SearchType.QUERY_THEN_FETCH.value), \
+                mock.patch.object(SEARCH_CONFIG, 'type_counts_search_type', SearchType.DFS_QUERY_THEN_FETCH.value):
+            content_query: SearchEngine = engine.content_query(self.search_term, 1, 10, type_filters=content_types)
+            type_counts_query: SearchEngine = engine.type_counts_query(self.search_term, type_filters=content_types)
+
+        self.assertEqual(content_query._params["search_type"], SearchType.QUERY_THEN_FETCH.value)
+        self.assertEqual(type_counts_query._params["search_type"], SearchType.DFS_QUERY_THEN_FETCH.value)
+
+        # An explicit search_type takes precedence
+        content_query: SearchEngine = engine.content_query(self.search_term, 1, 10,
+                                                           search_type=SearchType.QUERY_THEN_FETCH)
+        self.assertEqual(content_query._params["search_type"], SearchType.QUERY_THEN_FETCH.value)
+
+    def test_cache_hints(self):
+        """
+        Tests that the shard request cache hint is only applied to cacheable query kinds, and that the sticky preference
+        only depends on the normalised search term
+        :return:
+        """
+        engine = self.get_search_engine()
+        content_types: List[ContentType] = AvailableContentTypes.available_content_types()
+
+        content_query: SearchEngine = engine.content_query(self.search_term, 2, 10, type_filters=content_types)
+        type_counts_query: SearchEngine = engine.type_counts_query(" {0}  ".format(self.search_term),
+                                                                   type_filters=content_types)
+
+        self.assertNotIn("request_cache", content_query._params)
+        self.assertTrue(type_counts_query._params["request_cache"])
+
+        # All queries for the same search term share a preference
+        preference = query_preference(self.search_term)
+        self.assertFalse(preference.startswith("_"), "custom preference strings must not start with '_'")
+        self.assertEqual(content_query._params["preference"], preference)
+        self.assertEqual(type_counts_query._params["preference"], preference)
+        self.assertNotEqual(query_preference("a different search term"), preference)
+
+        with mock.patch.object(SEARCH_CONFIG, 'sticky_preference_enabled', False):
+            content_query: SearchEngine = engine.content_query(self.search_term, 2, 10, type_filters=content_types)
+
+        self.assertNotIn("preference", content_query._params)
+
+    def test_content_query_builder_mode(self):
+        """
+        Tests that building the content query copies the search engine exactly once, and leaves the original
+        search engine unmodified
+        :return:
+        """
+        engine = self.get_search_engine()
+        content_types: List[ContentType] = AvailableContentTypes.available_content_types()
+
+        with mock.patch.object(Search, '_clone', autospec=True, side_effect=Search._clone) as clone:
+            s: SearchEngine = engine.content_query(self.search_term, 2, 10, filter_functions=content_types,
+                                                   type_filters=content_types)
+
+            self.assertEqual(clone.call_count, 1)
+
+        self.assertIsNot(s, engine)
+        self.assertEqual(engine.to_dict(), self.get_search_engine().to_dict())
+
+        # The built search engine is no longer in builder mode
+        paginated: SearchEngine = s.paginate(1, 10)
+        self.assertIsNot(paginated, s)
+        self.assertEqual(s.to_dict()["from"], 10)
+
     def test_type_counts_query(self):
         """
         Tests the type counts query method correctly calls the underlying Elasticsearch client
@@ -323,11 +399,40 @@ class SearchEngineTestCase(AsyncTestCase, TestCase):
             response = await engine.execute(ignore_cache=True)
 
             self.mock_client.search.assert_called_with(index=[self.index], doc_type=[], body=expected,
-                                                       search_type=SearchType.DFS_QUERY_THEN_FETCH.value)
+                                                       search_type=SearchType.QUERY_THEN_FETCH.value,
+                                                       request_cache=True, preference=query_preference(self.search_term))
 
         # Run the above function in a dedicated event loop
         self.run_async(async_test_function)
 
+    def test_content_and_type_counts_query(self):
+        """
+        Tests that the content and type counts query is the content query with the type counts aggregation attached
+        :return:
+        """
+        engine = self.get_search_engine()
+
+        from_start, current_page, size = self.paginate()
+        content_types: List[ContentType] = AvailableContentTypes.available_content_types()
+
+        # Build the expected query dict - the content query plus aggregations
+        expected = engine.content_query(self.search_term, current_page, size, filter_functions=content_types,
+                                        type_filters=content_types).to_dict()
+        expected["aggs"] = {
+            "docCounts": build_type_counts_query().to_dict()
+        }
+
+        engine: SearchEngine = engine.content_and_type_counts_query(self.search_term, current_page, size,
+                                                                    filter_functions=content_types,
+                                                                    type_filters=content_types)
+
+        # Type filters should remain in the query filter context, so they also apply to the aggregation
+        actual = engine.to_dict()
+        self.assertEqual(actual, expected)
+        self.assertNotIn("post_filter", actual)
+        self.assertEqual(actual["from"], from_start)
+        self.assertEqual(actual["size"], size)
+
     def test_featured_query(self):
         """
         Tests the featured query method correctly calls the underlying Elasticsearch client
@@ -375,7 +480,8 @@ class SearchEngineTestCase(AsyncTestCase, TestCase):
             response = await engine.execute(ignore_cache=True)
 
             self.mock_client.search.assert_called_with(index=[self.index], doc_type=[], body=expected,
-                                                       search_type=SearchType.DFS_QUERY_THEN_FETCH.value)
+                                                       search_type=SearchType.QUERY_THEN_FETCH.value,
+                                                       request_cache=True, preference=query_preference(self.search_term))
 
         # Run the above function in a dedicated event loop
         self.run_async(async_test_function)
@@ -0,0 +1,58 @@
+import asyncio
+from unittest import TestCase
+from unittest.mock import MagicMock
+
+from elasticsearch import TransportError
+
+from unit.mocks.mock_es_client import MockElasticsearchClient
+from unit.elasticsearch.elasticsearch_test_utils import mock_search_response
+
+from dp_conceptual_search.search.search_type import SearchType
+from dp_conceptual_search.search.client import SearchClient, MultiSearchClient
+
+
+class MultiSearchClientTestCase(TestCase):
+
+    def setUp(self):
+        super(MultiSearchClientTestCase, self).setUp()
+
+        self.mock_client = MockElasticsearchClient()
+        self.mock_client.msearch = MagicMock(return_value={
+            "responses": [
+                mock_search_response(),
+                {"error": {"type": "search_phase_execution_exception"}, "status": 400}
+            ]
+        })
+
+    def test_msearch_called(self):
+        """
+        Tests that all searches are sent in a single msearch request, and that failed searches are returned as errors
+        :return:
+        """
+        event_loop = asyncio.new_event_loop()
+        asyncio.set_event_loop(event_loop)
+
+        async def run_async():
+            first = SearchClient(using=self.mock_client, index="test").query("match", name="Randy Marsh") \
+                .search_type(SearchType.DFS_QUERY_THEN_FETCH)
+            second = SearchClient(using=self.mock_client, index="test").query("match", name="Stan Marsh")
+
+            ms = MultiSearchClient(using=self.mock_client).add(first).add(second)
+            responses = await ms.execute()
+
+            self.mock_client.msearch.assert_called_once_with(index=None, doc_type=[], body=[
+                {"index": ["test"], "search_type": SearchType.DFS_QUERY_THEN_FETCH.value},
+                first.to_dict(),
+                {"index": ["test"]},
+                second.to_dict()
+            ])
+
+            self.assertEqual(len(responses), 2)
+            self.assertEqual(len(responses[0]), len(mock_search_response()["hits"]["hits"]))
+            self.assertIsInstance(responses[1], TransportError)
+            self.assertEqual(responses[1].status_code, 400)
+
+        # Run the async test
+        coro = asyncio.coroutine(run_async)
+        event_loop.run_until_complete(coro())
+        event_loop.close()
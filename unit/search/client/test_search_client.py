@@ -1,5 +1,5 @@
 import asyncio
-from unittest import TestCase
+from unittest import TestCase, mock
 
 from unit.elasticsearch.elasticsearch_test_utils import mock_search_client
 
@@ -71,6 +71,60 @@ class SearchClientTestCase(TestCase):
         event_loop.run_until_complete(coro())
         event_loop.close()
 
+    def test_search_called_with_body(self):
+        """
+        Tests that a pre-computed query body is sent as-is, without re-serialising the query
+        :return:
+        """
+        event_loop = asyncio.new_event_loop()
+        asyncio.set_event_loop(event_loop)
+
+        async def run_async():
+            client: SearchClient = self.get_client()
+            client.update_from_dict(self.get_body)
+
+            body = client.to_dict()
+            with mock.patch.object(SearchClient, 'to_dict') as to_dict:
+                response = await client.execute(ignore_cache=True, body=body)
+
+                to_dict.assert_not_called()
+
+            self.mock_client.search.assert_called_with(index=[self.index], doc_type=[], body=self.get_body)
+
+        # Run the async test
+        coro = asyncio.coroutine(run_async)
+        event_loop.run_until_complete(coro())
+        event_loop.close()
+
+    def test_mget_sources(self):
+        """
+        Tests that documents are fetched with a single multi-get, returning None for missing documents
+        :return:
+        """
+        event_loop = asyncio.new_event_loop()
+        asyncio.set_event_loop(event_loop)
+
+        self.mock_client.mget = mock.MagicMock(return_value={
+            "docs": [
+                {"_id": "/a", "found": True, "_source": {"name": "Randy Marsh"}},
+                {"_id": "/b", "found": False}
+            ]
+        })
+
+        async def run_async():
+            client: SearchClient = self.get_client()
+
+            sources = await client.mget_sources(["/a", "/b"], source_include=["name"])
+            self.assertEqual(sources, [{"name": "Randy Marsh"}, None])
+
+            self.mock_client.mget.assert_called_once_with(body={"docs": [{"_id": "/a"}, {"_id": "/b"}]},
+                                                          index=self.index, _source_include=["name"])
+
+        # Run the async test
+        coro = asyncio.coroutine(run_async)
+        event_loop.run_until_complete(coro())
+        event_loop.close()
+
     def test_max_size_error(self):
         """
         Tests that a RequestSizeExceededException is raised when the request size is higher than
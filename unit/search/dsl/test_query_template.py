@@ -0,0 +1,56 @@
+"""
+Tests precompiled query templates
+"""
+from unittest import TestCase
+
+from dp_conceptual_search.search.dsl.raw_query import RawQuery
+from dp_conceptual_search.search.dsl.query_template import QueryTemplate, Placeholder
+from dp_conceptual_search.ons.search.queries.ons_query_builders import _build_content_query, build_content_query
+
+
+class QueryTemplateTestCase(TestCase):
+
+    def test_render(self):
+        """
+        Tests placeholders are substituted, and static sub-trees are shared with the skeleton
+        :return:
+        """
+        static = {"fields": ["title", "summary"]}
+        template = QueryTemplate({
+            "bool": {
+                "should": [
+                    {"match": {"title": {"query": Placeholder("search_term")}}},
+                    {"multi_match": static}
+                ],
+                "filter": Placeholder("filter")
+            }
+        })
+
+        query = template.render(search_term="Zuul", filter=[{"terms": {"type": ["bulletin"]}}])
+
+        expected = {
+            "bool": {
+                "should": [
+                    {"match": {"title": {"query": "Zuul"}}},
+                    {"multi_match": {"fields": ["title", "summary"]}}
+                ],
+                "filter": [{"terms": {"type": ["bulletin"]}}]
+            }
+        }
+        self.assertEqual(query, expected)
+        self.assertIs(query["bool"]["should"][1]["multi_match"], static)
+
+        # Rendering again shouldn't affect previously rendered queries
+        template.render(search_term="Gozer", filter=[])
+        self.assertEqual(query, expected)
+
+    def test_content_query_template(self):
+        """
+        Tests the precompiled content query matches the query built by the DSL
+        :return:
+        """
+        search_term = "Zuul"
+        query = build_content_query(search_term)
+
+        self.assertIsInstance(query, RawQuery)
+        self.assertEqual(query.to_dict(), _build_content_query(search_term).to_dict())
@@ -0,0 +1,68 @@
+"""
+Tests encoding and decoding of binary embedding vectors
+"""
+import numpy as np
+from unittest import TestCase
+
+from dp_fasttext.ml.utils import encode_float_list, decode_float_list
+
+from dp_conceptual_search.search.vector_encoding import encode_vector, decode_vector
+from dp_conceptual_search.search.dsl.vector_script_score import VectorScriptScore
+
+
+class VectorEncodingTestCase(TestCase):
+
+    def setUp(self):
+        self.vector = np.random.rand(300)
+
+    def test_round_trip(self):
+        """
+        Tests vectors survive encoding and decoding
+        :return:
+        """
+        decoded = decode_vector(encode_vector(self.vector))
+        self.assertTrue(np.array_equal(decoded, self.vector), "decoded vector should equal the original")
+
+    def test_decode_is_zero_copy(self):
+        """
+        Tests decoded vectors are read-only views over the decoded bytes
+        :return:
+        """
+        decoded = decode_vector(encode_vector(self.vector))
+
+        self.assertFalse(decoded.flags.owndata, "decoded vector should not own its data")
+        self.assertFalse(decoded.flags.writeable, "decoded vector should be read-only")
+
+    def test_dp_fasttext_compatibility(self):
+        """
+        Tests the default encoding matches the one used by dp-fasttext to index embedding vectors
+        :return:
+        """
+        self.assertEqual(encode_vector(self.vector), encode_float_list(self.vector))
+        self.assertTrue(np.array_equal(decode_vector(encode_float_list(self.vector)),
+                                       decode_float_list(encode_float_list(self.vector))))
+
+    def test_float32(self):
+        """
+        Tests vectors can be encoded with a configurable dtype
+        :return:
+        """
+        encoded = encode_vector(self.vector, dtype="<f4")
+        decoded = decode_vector(encoded, dtype="<f4")
+
+        self.assertEqual(decoded.dtype, np.dtype("<f4"))
+        self.assertLess(len(encoded), len(encode_vector(self.vector)))
+        self.assertTrue(np.allclose(decoded, self.vector))
+
+    def test_vector_script_score(self):
+        """
+        Tests query vectors are sent either as a list of floats, or base64 encoded
+        :return:
+        """
+        params = VectorScriptScore("embedding_vector", self.vector).to_dict()["script_score"]["params"]
+        self.assertEqual(params["vector"], self.vector.tolist())
+        self.assertNotIn("encoded_vector", params)
+
+        params = VectorScriptScore("embedding_vector", self.vector, encoded=True).to_dict()["script_score"]["params"]
+        self.assertEqual(params["encoded_vector"], encode_vector(self.vector))
+        self.assertNotIn("vector", params)